@@ -0,0 +1,152 @@
+# benchmarks/load_scheduler.py
+"""
+asyncio scheduler for load runs: virtual viewers arrive following a ramp
+profile and run a blocking flow (Selenium) on a thread, gated by a cap on how
+many browsers may be busy at once.
+
+Ramp profiles, for a target `rate` (viewers/s) reached after `ramp_seconds`:
+
+    constant    `rate` from the start
+    linear      rate grows linearly from 10% to `rate`
+    step        rate grows in `steps` equal steps
+
+Each viewer returns a ViewerResult; summarize() turns them into throughput,
+step latency percentiles and error rates.
+
+Usage:
+    arrivals = arrival_times(viewers=50, rate=2, ramp="linear", ramp_seconds=20)
+    results = asyncio.run(run_viewers(arrivals, flow, max_concurrent=8))
+    report = summarize(results, wall_clock_s)
+"""
+
+import asyncio
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+RAMPS = ("constant", "linear", "step")
+
+
+class ViewerResult:
+    def __init__(self, viewer_id, arrival_s):
+        self.viewer_id = viewer_id
+        self.arrival_s = arrival_s
+        self.started_s = None
+        self.finished_s = None
+        self.steps = []  # (name, seconds, ok, error)
+
+    @property
+    def ok(self):
+        return bool(self.steps) and all(ok for _, _, ok, _ in self.steps)
+
+    @property
+    def queued_s(self):
+        return (self.started_s - self.arrival_s) if self.started_s is not None else None
+
+    def to_dict(self):
+        return {
+            "viewer": self.viewer_id,
+            "arrival_s": round(self.arrival_s, 3),
+            "queued_s": None if self.queued_s is None else round(self.queued_s, 3),
+            "ok": self.ok,
+            "steps": [{"step": name, "ms": round(seconds * 1000, 1), "ok": ok, "error": error}
+                      for name, seconds, ok, error in self.steps],
+        }
+
+
+def _rate_at(t, rate, ramp, ramp_seconds, steps):
+    if ramp == "constant" or t >= ramp_seconds or ramp_seconds <= 0:
+        return rate
+    if ramp == "linear":
+        return rate * max(0.1, t / ramp_seconds)
+    return rate * math.ceil((t + 1e-9) / ramp_seconds * steps) / steps
+
+
+def arrival_times(viewers, rate, ramp="constant", ramp_seconds=0, steps=4):
+    """Return the arrival offset (seconds from start) of every viewer."""
+    if ramp not in RAMPS:
+        raise ValueError(f"Unknown ramp '{ramp}' (known: {', '.join(RAMPS)})")
+    times = []
+    t = 0.0
+    for _ in range(viewers):
+        times.append(t)
+        t += 1.0 / _rate_at(t, rate, ramp, ramp_seconds, steps)
+    return times
+
+
+async def run_viewers(arrivals, flow, max_concurrent):
+    """
+    Start viewer i at arrivals[i] and run flow(result), with at most
+    `max_concurrent` flows running at once. A blocking flow runs on a worker
+    thread; a coroutine function (the protocol client) runs on the event loop.
+    Returns the ViewerResults.
+    """
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(max_concurrent)
+    start = time.perf_counter()
+    is_async = asyncio.iscoroutinefunction(flow)
+
+    with ThreadPoolExecutor(max_workers=1 if is_async else max_concurrent, thread_name_prefix="viewer") as executor:
+        async def viewer(viewer_id, arrival):
+            await asyncio.sleep(max(0.0, arrival - (time.perf_counter() - start)))
+            result = ViewerResult(viewer_id, time.perf_counter() - start)
+            async with slots:
+                result.started_s = time.perf_counter() - start
+                try:
+                    if is_async:
+                        await flow(result)
+                    else:
+                        await loop.run_in_executor(executor, flow, result)
+                except Exception as e:
+                    result.steps.append(("viewer", 0.0, False, str(e)))
+                result.finished_s = time.perf_counter() - start
+            logger.debug(f"Viewer {viewer_id} {'finished' if result.ok else 'failed'} "
+                         f"after {result.finished_s - result.arrival_s:.1f}s")
+            return result
+
+        return await asyncio.gather(*(viewer(i, arrival) for i, arrival in enumerate(arrivals)))
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(results, wall_clock_s):
+    """Throughput, per-step latency percentiles and error rates of a load run."""
+    steps = {}
+    for result in results:
+        for name, seconds, ok, _ in result.steps:
+            entry = steps.setdefault(name, {"durations": [], "errors": 0})
+            entry["durations"].append(seconds * 1000)
+            entry["errors"] += 0 if ok else 1
+
+    rows = []
+    for name, entry in steps.items():
+        durations = entry["durations"]
+        rows.append({
+            "step": name,
+            "count": len(durations),
+            "p50_ms": round(_percentile(durations, 50), 1),
+            "p95_ms": round(_percentile(durations, 95), 1),
+            "p99_ms": round(_percentile(durations, 99), 1),
+            "max_ms": round(max(durations), 1),
+            "error_rate": round(entry["errors"] / len(durations), 3),
+        })
+
+    completed = sum(1 for r in results if r.ok)
+    queued = [r.queued_s for r in results if r.queued_s is not None]
+    return {
+        "viewers": len(results),
+        "completed": completed,
+        "error_rate": round(1 - completed / len(results), 3) if results else 0.0,
+        "wall_clock_s": round(wall_clock_s, 1),
+        "throughput_viewers_per_min": round(completed / wall_clock_s * 60, 2) if wall_clock_s else 0.0,
+        "throughput_steps_per_s": round(sum(row["count"] for row in rows) / wall_clock_s, 2) if wall_clock_s else 0.0,
+        "queue_p95_s": round(_percentile(queued, 95), 2) if queued else None,
+        "steps": rows,
+    }
@@ -0,0 +1,143 @@
+# benchmarks/run_benchmark.py
+"""
+Offline end-to-end benchmark of the framework against the stand-in FYC site.
+
+Starts stand_in.server on a free local port, runs the feature `--iterations`
+times with FYC_BASE_URL pointing at it, and records wall-clock time per run plus
+the per-operation timing summary from utils/timing.py and the page-load
+metrics (TTFB, DCL, load, LCP) from utils/page_timing.py. Results are written to
+benchmarks/results/<timestamp>.json and compared with benchmarks/baseline.json;
+the exit code is non-zero when any tracked metric regresses beyond --threshold.
+
+Usage:
+    python -m benchmarks.run_benchmark --iterations 3
+    python -m benchmarks.run_benchmark --latency-ms 50 --update-baseline
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from stand_in.server import StandInSettings, start_server
+from utils import config, page_timing
+from utils.logger import get_logger, start_file_logging
+
+logger = get_logger(__name__)
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, "baseline.json")
+FEATURE = os.path.join("features", "fyc_video_playback.feature")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the suite against the local stand-in site.")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed relative slowdown against the baseline (default: 0.2 = 20%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    return parser.parse_args(argv)
+
+
+def run_iteration(base_url, iteration):
+    """Run the feature once; return (wall-clock seconds, exit code, timing rows, page timing records)."""
+    timings_dir = os.path.join(RESULTS_DIR, "timings", f"iteration-{iteration}")
+    page_timing_dir = os.path.join(RESULTS_DIR, "page_timing", f"iteration-{iteration}")
+    env = dict(os.environ, FYC_BASE_URL=base_url, FYC_TIMINGS_DIR=timings_dir, FYC_TIMING="1",
+               FYC_PAGE_TIMING_DIR=page_timing_dir)
+    start = time.perf_counter()
+    exit_code = subprocess.call([sys.executable, "-m", "behave", "-f", "progress", FEATURE], env=env)
+    elapsed = time.perf_counter() - start
+
+    rows = []
+    summary_path = os.path.join(timings_dir, f"timings_worker{config.WORKER_ID}.json")
+    if os.path.exists(summary_path):
+        with open(summary_path, encoding="utf-8") as f:
+            rows = json.load(f)
+    logger.info(f"Iteration {iteration}: {elapsed:.2f}s (exit code {exit_code})")
+    return elapsed, exit_code, rows, page_timing.load_records(page_timing_dir)
+
+
+def aggregate(iterations):
+    """Median wall-clock, per-step p50 and per-page load metrics across iterations."""
+    wall = [elapsed for elapsed, _, _, _ in iterations]
+    steps = {}
+    pages = {}
+    for _, _, rows, records in iterations:
+        for row in rows:
+            if row["kind"] in ("step", "page"):
+                steps.setdefault(f"{row['kind']}:{row['operation']}", []).append(row["p50_ms"])
+        for record in records:
+            for metric in page_timing.METRICS:
+                if record["metrics"].get(metric) is not None:
+                    pages.setdefault(f"{record['page']}:{metric}", []).append(record["metrics"][metric])
+    return {
+        "wall_clock_s": round(statistics.median(wall), 3),
+        "failures": sum(1 for _, exit_code, _, _ in iterations if exit_code != 0),
+        "operations_p50_ms": {name: round(statistics.median(values), 1) for name, values in sorted(steps.items())},
+        "pages_p50_ms": {name: round(statistics.median(values), 1) for name, values in sorted(pages.items())},
+    }
+
+
+def compare(result, baseline, threshold):
+    """Return a list of human-readable regressions against the baseline."""
+    regressions = []
+    if baseline["wall_clock_s"] and result["wall_clock_s"] > baseline["wall_clock_s"] * (1 + threshold):
+        regressions.append(f"wall clock {baseline['wall_clock_s']}s -> {result['wall_clock_s']}s")
+    for section in ("operations_p50_ms", "pages_p50_ms"):
+        for name, value in result.get(section, {}).items():
+            previous = baseline.get(section, {}).get(name)
+            if previous and value > previous * (1 + threshold):
+                regressions.append(f"{name} p50 {previous}ms -> {value}ms")
+    return regressions
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start_file_logging()
+    settings = StandInSettings(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                               failure_rate=args.failure_rate)
+    server, base_url = start_server(settings=settings)
+    try:
+        iterations = [run_iteration(base_url, i) for i in range(1, args.iterations + 1)]
+    finally:
+        server.shutdown()
+
+    result = aggregate(iterations)
+    result.update({
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "iterations": args.iterations,
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "failure_rate": args.failure_rate,
+    })
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    result_path = os.path.join(RESULTS_DIR, datetime.utcnow().strftime("%Y%m%dT%H%M%S") + ".json")
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    logger.info(f"✅ Benchmark result written to {result_path}")
+
+    if args.update_baseline or not os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        logger.info(f"Baseline updated: {BASELINE_PATH}")
+        return 0
+
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        regressions = compare(result, json.load(f), args.threshold)
+    for regression in regressions:
+        logger.error(f"❌ Regression: {regression}")
+    if not regressions:
+        logger.info("✅ No regressions against the baseline.")
+    return 1 if regressions or result["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+# benchmarks/run_load.py
+"""
+Load mode: many concurrent virtual viewers running the
+fyc_video_playback.feature flow against the stand-in FYC site (or --base-url).
+
+Viewers arrive at --arrival-rate viewers/s following --ramp (see
+benchmarks/load_scheduler.py). Each viewer runs the feature's steps through the
+page objects on a warm browser session; at most --max-browsers sessions
+exist, and viewers arriving while all are busy queue for one (the queue time
+is reported). The report covers throughput, step latency percentiles under
+load and error rates, and is written to benchmarks/results/load_<timestamp>.json.
+
+With --protocol, viewers skip the browser and run the login/catalog part of the
+flow with the HTTP client in utils/protocol_client.py, all on one event loop
+over --max-connections keep-alive connections, so thousands fit in one runner.
+
+With --contexts, browser sessions are isolated browser contexts inside shared
+Chrome processes (FYC_SESSION_MODE=context, see utils/browser_contexts.py)
+instead of one Chrome each. On Linux the report includes the peak memory (RSS)
+of the browsers and drivers and the peak per browser session, to compare the
+two modes.
+
+Usage:
+    python -m benchmarks.run_load --viewers 50 --arrival-rate 2 --ramp linear --ramp-seconds 20 --max-browsers 8
+    python -m benchmarks.run_load --viewers 200 --max-browsers 16 --latency-ms 50 --failure-rate 0.01
+    python -m benchmarks.run_load --viewers 200 --max-browsers 32 --contexts
+    python -m benchmarks.run_load --protocol --viewers 5000 --arrival-rate 200 --max-connections 100
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from benchmarks.load_scheduler import RAMPS, arrival_times, run_viewers, summarize
+from stand_in.server import DEFAULT_PIN, StandInSettings, start_server
+from utils import config
+from utils.logger import get_logger, set_log_context, start_file_logging
+from utils.protocol_client import ConnectionPool, ProtocolSession
+
+logger = get_logger(__name__)
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# The steps of features/fyc_video_playback.feature, as page object calls
+VIEWER_FLOW = [
+    ("I launch the FYC application",
+     lambda p, pin: p.home.launch_url(f"{config.BASE_URL}/login", timeout=15)),
+    ("I sign in using PIN",
+     lambda p, pin: (p.automation.click_accept_all_button(timeout=2) or True) and p.login.login(pin, timeout=15)),
+    ("I navigate to the project", lambda p, pin: p.automation.click_automation_project_title()),
+    ("I switch to Details tab", lambda p, pin: p.automation.click_details_section(timeout=15)),
+    ("I return to Videos tab", lambda p, pin: p.automation.click_video_section()),
+    ("I play the video and pause",
+     lambda p, pin: p.automation.play_first_video() and p.automation.pause_html5_video()),
+    ("I resume playback", lambda p, pin: p.automation.play_html5_video()),
+    ("I set video volume to 50 percent", lambda p, pin: p.automation.set_video_volume_to_50()),
+    ("I change video resolution", lambda p, pin: p.automation.change_resolution_480_to_720_via_settings()),
+    ("I pause video and exit project",
+     lambda p, pin: p.automation.pause_html5_video() and p.automation.navigate_back()),
+    ("I logout from the platform", lambda p, pin: p.automation.click_logout_button()),
+]
+
+# The login/catalog steps of the feature, over HTTP (@protocol scenarios)
+PROTOCOL_FLOW = [
+    ("I launch the FYC application", lambda s, pin: s.launch()),
+    ("I sign in using PIN", lambda s, pin: s.login(pin)),
+    ("I navigate to the project", lambda s, pin: s.open_title("Test Automation Project")),
+    ("I logout from the platform", lambda s, pin: s.logout()),
+]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Drive many concurrent virtual viewers through the playback flow.")
+    parser.add_argument("--viewers", type=int, default=50)
+    parser.add_argument("--arrival-rate", type=float, default=1.0, help="Target arrivals per second")
+    parser.add_argument("--ramp", choices=RAMPS, default="constant")
+    parser.add_argument("--ramp-seconds", type=float, default=0)
+    parser.add_argument("--ramp-steps", type=int, default=4)
+    parser.add_argument("--max-browsers", type=int, default=4, help="Cap on concurrent browser sessions")
+    parser.add_argument("--contexts", action="store_true",
+                        help="Sessions are browser contexts in shared Chrome processes (FYC_SESSION_MODE=context)")
+    parser.add_argument("--protocol", action="store_true", help="Run the login/catalog flow over HTTP, no browser")
+    parser.add_argument("--max-connections", type=int, default=None,
+                        help="Keep-alive connections in --protocol mode (default: FYC_PROTOCOL_MAX_CONNECTIONS)")
+    parser.add_argument("--pin", default=DEFAULT_PIN)
+    parser.add_argument("--base-url", default=None, help="Site to load (default: a local stand-in)")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    return parser.parse_args(argv)
+
+
+class ViewerPages:
+    def __init__(self, driver):
+        from pages.automation_page import AutomationPage
+        from pages.home_page import HomePage
+        from pages.login_page import LoginPage
+        self.home = HomePage(driver)
+        self.login = LoginPage(driver)
+        self.automation = AutomationPage(driver)
+
+
+def make_flow(pool, pin):
+    """Return flow(result): one viewer's run of VIEWER_FLOW on a pooled browser session."""
+    from pages.element_cache import ElementCache
+    from utils.video_qoe import VideoQoe
+    from utils.wait_budget import step_budget
+
+    def flow(result):
+        driver = pool.acquire()
+        try:
+            pages = ViewerPages(driver)
+            for name, action in VIEWER_FLOW:
+                set_log_context(scenario=f"viewer {result.viewer_id}", step=name)
+                start = time.perf_counter()
+                error = None
+                with step_budget(config.STEP_BUDGET, name):
+                    try:
+                        ok = bool(action(pages, pin))
+                        error = None if ok else "step returned False"
+                    except Exception as e:
+                        ok, error = False, str(e)
+                result.steps.append((name, time.perf_counter() - start, ok, error))
+                if not ok:
+                    break
+        finally:
+            ElementCache.clear_for(driver)
+            VideoQoe.pop(driver)
+            pool.release(driver)
+
+    return flow
+
+
+def make_protocol_flow(pool, pin):
+    """Return an async flow(result): one viewer's run of PROTOCOL_FLOW over the shared connection pool."""
+    async def flow(result):
+        session = ProtocolSession(pool)
+        for name, action in PROTOCOL_FLOW:
+            # Each viewer task runs in its own copy of the log context
+            set_log_context(scenario=f"viewer {result.viewer_id}", step=name)
+            start = time.perf_counter()
+            try:
+                await action(session, pin)
+                ok, error = True, None
+            except Exception as e:
+                ok, error = False, str(e) or type(e).__name__
+            result.steps.append((name, time.perf_counter() - start, ok, error))
+            if not ok:
+                break
+
+    return flow
+
+
+def run_protocol_load(args):
+    """Run the viewers with the protocol client; returns (results, report)."""
+    async def run(arrivals):
+        pool = ConnectionPool(config.BASE_URL, max_connections=args.max_connections)
+        try:
+            return await run_viewers(arrivals, make_protocol_flow(pool, args.pin), max(1, len(arrivals)))
+        finally:
+            await pool.close()
+
+    arrivals = arrival_times(args.viewers, args.arrival_rate, args.ramp, args.ramp_seconds, args.ramp_steps)
+    logger.info(f"Starting {args.viewers} protocol viewer(s) over {arrivals[-1]:.1f}s...")
+    start = time.perf_counter()
+    results = asyncio.run(run(arrivals))
+    return results, summarize(results, time.perf_counter() - start)
+
+
+def print_report(report):
+    logger.info(f"Viewers: {report['completed']}/{report['viewers']} completed, error rate {report['error_rate']:.1%}, "
+                f"{report['throughput_viewers_per_min']} viewers/min, queue p95 {report['queue_p95_s']}s")
+    if report.get("peak_memory_mb") is not None:
+        logger.info(f"Peak memory: {report['peak_memory_mb']} MB, "
+                    f"{report['peak_memory_mb_per_session']} MB per browser session")
+    logger.info(f"{'step':<36} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for row in report["steps"]:
+        logger.info(f"{row['step']:<36} {row['count']:>6} {row['p50_ms']:>9} {row['p95_ms']:>9} "
+                    f"{row['p99_ms']:>9} {row['error_rate']:>7.1%}")
+
+
+def process_tree_rss_mb():
+    """Resident memory (MB) of this process's descendants (drivers and browsers); None off Linux."""
+    if not os.path.isdir("/proc/self/task"):
+        return None
+    children = {}
+    rss_pages = {}
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{pid}/statm") as f:
+                rss_pages[int(pid)] = int(f.read().split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(pid))
+    total, stack = 0, list(children.get(os.getpid(), []))
+    while stack:
+        pid = stack.pop()
+        total += rss_pages.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class MemorySampler:
+    """Track the peak process_tree_rss_mb() on a background thread."""
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self.peak_mb = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="memory-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss = process_tree_rss_mb()
+            if rss is not None:
+                self.peak_mb = max(self.peak_mb or 0.0, rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_browser_load(args):
+    """Run the viewers on pooled browser sessions; returns (results, report)."""
+    if args.contexts:
+        config.SESSION_MODE = "context"
+    # Imported after BASE_URL is set: the browser factory warms its profile template on that site
+    from features.environment import browser_contexts, create_driver, discard_session
+    from utils.driver_pool import DriverPool
+
+    pool = DriverPool(create_driver, size=args.max_browsers, max_uses=config.DRIVER_MAX_USES,
+                      max_memory_mb=config.DRIVER_MAX_MEMORY_MB, on_quit=discard_session)
+    try:
+        arrivals = arrival_times(args.viewers, args.arrival_rate, args.ramp, args.ramp_seconds, args.ramp_steps)
+        logger.info(f"Starting {args.viewers} viewer(s) over {arrivals[-1]:.1f}s with at most "
+                    f"{args.max_browsers} browser session(s) ({config.SESSION_MODE} mode)...")
+        start = time.perf_counter()
+        with MemorySampler() as memory:
+            results = asyncio.run(run_viewers(arrivals, make_flow(pool, args.pin), args.max_browsers))
+        report = summarize(results, time.perf_counter() - start)
+    finally:
+        pool.close()
+        browser_contexts.close()
+    report["peak_memory_mb"] = None if memory.peak_mb is None else round(memory.peak_mb)
+    report["peak_memory_mb_per_session"] = (None if memory.peak_mb is None
+                                            else round(memory.peak_mb / args.max_browsers, 1))
+    return results, report
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start_file_logging()
+    server = None
+    if args.base_url:
+        config.BASE_URL = args.base_url.rstrip("/")
+    else:
+        settings = StandInSettings(pin=args.pin, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                                   failure_rate=args.failure_rate)
+        server, config.BASE_URL = start_server(settings=settings)
+
+    try:
+        results, report = run_protocol_load(args) if args.protocol else run_browser_load(args)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    report.update({
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "base_url": config.BASE_URL,
+        "arrival_rate": args.arrival_rate,
+        "ramp": args.ramp,
+        "ramp_seconds": args.ramp_seconds,
+        "mode": "protocol" if args.protocol else config.SESSION_MODE,
+        "max_browsers": None if args.protocol else args.max_browsers,
+        "viewer_results": [r.to_dict() for r in results],
+    })
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, "load_" + datetime.utcnow().strftime("%Y%m%dT%H%M%S") + ".json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+    logger.info(f"✅ Load report written to {path}")
+    return 0 if report["completed"] == report["viewers"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,58 +1,228 @@
+import json
+import shutil
 import allure
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
-from utils.logger import get_logger
-import os
-import time
-import tempfile
+from utils.logger import get_logger, set_log_context, start_file_logging
+from utils import config
+from utils.driver_pool import DriverPool
+from utils.driver_resolver import resolve_driver_path
+from utils.screenshots import ScreenshotService
+from utils import timing
+from utils.wait_budget import BudgetedWait, step_budget, tick
+from utils.video_qoe import VideoQoe, evaluate, write_artifact
+from utils.network_emulation import NetworkEmulation, write_record
+from utils.har import HarRecorder
+from utils.launch_profiles import apply_request_blocking, build_options
+from utils.profile_templates import ProfileTemplates
+from utils.browser_contexts import BrowserContexts
+from utils.protocol_client import ProtocolViewer
+from pages.automation_page import AutomationPage
+from pages.base_page import BasePage
+from pages.element_cache import ElementCache
+from pages.home_page import HomePage
+from pages.login_page import LoginPage
 
-logger = get_logger()
+logger = get_logger("environment")
 
-def before_all(context):
+profile_templates = ProfileTemplates()
+
+def launch_chrome(profile_dir):
+    """Start Chrome with the launch profile options on the given user-data-dir."""
+    # Chrome arguments of the launch profile (FYC_LAUNCH_PROFILE: fast / faithful)
+    options = build_options()
+
+    # DevTools network events for the per-scenario HAR
+    if config.HAR_ENABLED:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    return webdriver.Chrome(
+        service=Service(resolve_driver_path()),
+        options=options
+    )
+
+
+def warm_profile(profile_dir):
+    """
+    Build a profile template: load the login page (priming the HTTP cache) and
+    accept the cookie banner, then quit so Chrome flushes the profile to disk.
+    """
+    driver = launch_chrome(profile_dir)
     try:
-        options = Options()
-        options.add_argument("--start-maximized")
+        apply_request_blocking(driver)
+        driver.get(f"{config.BASE_URL}/login")
+        BasePage(driver).wait_for_document_ready(timeout=30)
+        accept_cookies(driver)
+    finally:
+        driver.quit()
 
-        # Headless mode (needed for GitHub Actions)
-        options.add_argument("--headless=new")  # for Chrome 109+ use --headless=new
-        options.add_argument("--window-size=1920,1080")
-        options.add_argument("--no-sandbox")  # required for many CI environments
-        options.add_argument("--disable-dev-shm-usage")  # avoid /dev/shm issues
-        options.add_argument("--disable-gpu")  # for headless stability
 
-        options.add_argument("--force-device-scale-factor=1")  # sets page zoom to 100%
+def launch_browser():
+    """Launch a Chrome on its own clone of the warmed profile template (isolated per worker)."""
+    profile_dir = profile_templates.clone(warm_profile)
+    try:
+        driver = launch_chrome(profile_dir)
+    except Exception:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        raise
+    profile_templates.register(driver, profile_dir)
+    # Read by the first scenario on this session; DriverPool.reset clears the consent afterwards
+    driver.consent_accepted = profile_templates.is_warm(driver)
+    return driver
 
-        # Create a unique temporary directory for Chrome profile
-        temp_profile_dir = tempfile.mkdtemp()
-        options.add_argument(f"--user-data-dir={temp_profile_dir}")
 
-        context.driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=options
-        )
-        context.driver.implicitly_wait(10)
-        logger.info("Browser launched successfully")
+# FYC_SESSION_MODE=context: sessions are browser contexts inside shared Chrome processes
+browser_contexts = BrowserContexts(launch_browser, on_quit=profile_templates.discard)
+
+
+def create_driver():
+    """
+    Launch and configure a new Chrome session.
+    Used by the driver pool to pre-launch warm sessions.
+    """
+    if config.SESSION_MODE == "context":
+        driver = browser_contexts.create()
+    else:
+        driver = launch_browser()
+
+    # Implicit waits stay off: explicit waits share the step budget (utils/wait_budget.py)
+    driver.implicitly_wait(0)
+    # Push-based waits resolve within their own budget; this only bounds a stuck script
+    driver.set_script_timeout(config.STEP_BUDGET + 5)
+    apply_request_blocking(driver)
+    logger.info(f"Browser launched successfully (worker {config.WORKER_ID})")
+
+    # Maximize the window explicitly (context tabs are opened at full size)
+    if config.SESSION_MODE != "context":
+        driver.maximize_window()
+    # Clear all cookies
+    with allure.step("Clearing all browser cookies"):
+        driver.delete_all_cookies()
+        logger.info("✅ All browser cookies cleared successfully")
+
+    return driver
+
 
-        # Maximize the window explicitly
-        context.driver.maximize_window()
-        # Clear all cookies
-        with allure.step("Clearing all browser cookies"):
-            context.driver.delete_all_cookies()
-            logger.info("✅ All browser cookies cleared successfully")
+def discard_session(driver):
+    """Driver pool hook for a session that has quit: close its browser context or remove its profile clone."""
+    browser_contexts.dispose(driver)
+    profile_templates.discard(driver)
+    ElementCache.discard(driver)
 
-        # Accept cookies if banner appears
-        accept_cookies(context)
 
+def before_all(context):
+    start_file_logging()
+    if config.TIMING_ENABLED:
+        timing.install([AutomationPage, LoginPage, HomePage, BasePage])
+    context.screenshots = ScreenshotService()
+    profile_templates.prune()
+    try:
+        context.driver_pool = DriverPool(
+            create_driver,
+            size=config.DRIVER_POOL_SIZE,
+            max_uses=config.DRIVER_MAX_USES,
+            max_memory_mb=config.DRIVER_MAX_MEMORY_MB,
+            on_quit=discard_session,
+            # Browsers start with the first browser scenario, so @protocol-only runs never launch one
+            lazy=True,
+        )
     except Exception as e:
         logger.error(f"Failed to start browser: {e}")
         raise
-def accept_cookies(context, timeout=10):
+
+
+# Logging out ends the server session, which restored snapshots share
+LOGOUT_STEP = "I logout from the platform"
+
+
+def keeps_session(scenario):
+    """True if the scenario never logs out, so it may restore and snapshot the signed-in session."""
+    return all(step.name != LOGOUT_STEP for step in scenario.all_steps)
+
+
+def before_scenario(context, scenario):
+    set_log_context(scenario=scenario.name)
+    context.reuse_session = config.SESSION_SNAPSHOT and keeps_session(scenario)
+    context.timing_mark = timing.mark()
+    context.budget_reports = []
+    context.protocol = None
+    if "protocol" in scenario.effective_tags:
+        if not config.PROTOCOL_ENABLED:
+            scenario.skip("Protocol scenarios are off (set FYC_PROTOCOL=1)")
+            return
+        # Login and catalog over HTTP, no browser (utils/protocol_client.py)
+        context.protocol = ProtocolViewer()
+        allure.dynamic.parameter("client", "protocol")
+        return
+    context.driver = context.driver_pool.acquire()
+    # Only a fresh clone of the warmed template has the cookie banner accepted
+    context.consent_accepted = getattr(context.driver, "consent_accepted", False)
+    context.driver.consent_accepted = False
+    context.network = NetworkEmulation(context.driver, config.NETWORK_PROFILE)
+    context.network.start()
+    if config.NETWORK_PROFILE != "none":
+        allure.dynamic.parameter("network profile", config.NETWORK_PROFILE)
+    context.har = HarRecorder(context.driver) if config.HAR_ENABLED else None
+    if context.har:
+        context.har.start()
+
+
+def before_step(context, step):
+    set_log_context(scenario=context.scenario.name, step=step.name)
+    # Network blips due while no wait was running
+    tick()
+    context.step_timer = timing.measure("step", step.name)
+    context.step_timer.__enter__()
+    context.step_budget = step_budget(config.STEP_BUDGET, step.name)
+    context.wait_budget = context.step_budget.__enter__()
+
+
+def after_scenario(context, scenario):
+    if config.TIMING_ENABLED:
+        allure.attach(
+            json.dumps(timing.summarize(since=context.timing_mark), indent=2),
+            name="timings", attachment_type=allure.attachment_type.JSON
+        )
+    allure.attach(
+        json.dumps(context.budget_reports, indent=2),
+        name="wait budget", attachment_type=allure.attachment_type.JSON
+    )
+    driver = getattr(context, "driver", None)
+    if driver is not None:
+        record_qoe(scenario, VideoQoe.pop(driver))
+        if context.har:
+            try:
+                context.har.write(scenario.name)
+            except Exception as e:
+                logger.error(f"❌ Could not write HAR: {e}")
+        context.network.stop()
+        if context.network.blips or context.network.missed:
+            record = write_record(scenario.name, context.network.summary())
+            allure.attach(json.dumps(record, indent=2), name="network blips",
+                          attachment_type=allure.attachment_type.JSON)
+        ElementCache.clear_for(driver)
+        context.driver_pool.release(driver)
+    if context.protocol:
+        context.protocol.close()
+    set_log_context()
+
+
+def record_qoe(scenario, metrics):
+    """Emit the scenario's video QoE metrics as an Allure attachment and a JSON line."""
+    if not metrics:
+        return
+    violations = evaluate(metrics)
+    record = write_artifact(scenario.name, metrics, violations)
+    allure.attach(json.dumps(record, indent=2), name="video QoE", attachment_type=allure.attachment_type.JSON)
+    for violation in violations:
+        logger.warning(f"⚠️ Video QoE threshold exceeded: {violation}")
+
+
+def accept_cookies(driver, timeout=10):
     """
     Accept cookies by clicking the 'Accept All' button if it appears.
     """
@@ -61,7 +231,7 @@ def accept_cookies(context, timeout=10):
         accept_button = (By.XPATH, "//button[text()='Accept All']")
 
         logger.info("Waiting for 'Accept All Cookies' button...")
-        button_element = WebDriverWait(context.driver, timeout).until(
+        button_element = BudgetedWait(driver, timeout).until(
             EC.element_to_be_clickable(accept_button)
         )
         button_element.click()
@@ -75,19 +245,31 @@ def accept_cookies(context, timeout=10):
         return False
 
 def after_step(context, step):
-    """Capture screenshot if any step fails."""
+    """Stop the step timer and budget, then capture a screenshot according to the screenshot mode."""
+    context.step_timer.__exit__(None, None, None)
+    context.step_budget.__exit__(None, None, None)
+    tick()
+    report = context.wait_budget.report()
+    context.budget_reports.append(report)
+    logger.info(f"Step waited {report['waited_s']}s of its {report['budget_s']}s budget ({report['waited_pct']}%)")
+    context.screenshots.capture_step(getattr(context, "driver", None), step)
     if step.status == "failed":
-        screenshots_dir = os.path.join(os.getcwd(), "screenshots")
-        os.makedirs(screenshots_dir, exist_ok=True)
-        filename = f"{step.name}_{int(time.time())}.png"
-        filepath = os.path.join(screenshots_dir, filename)
-        context.driver.save_screenshot(filepath)
-        allure.attach.file(filepath, name=step.name, attachment_type=allure.attachment_type.PNG)
-        logger.error(f"Step failed: {step.name}, screenshot saved at {filepath}")
+        logger.error(f"Step failed: {step.name}")
 
 def after_all(context):
     try:
-#        context.driver.quit()
+        context.driver_pool.close()
+        browser_contexts.close()
         logger.info("Browser closed successfully")
     except Exception as e:
         logger.error(f"Error closing browser: {e}")
+    # Flush screenshots still queued for the background writer
+    context.screenshots.close()
+    if config.TIMING_ENABLED:
+        # The run-level p50/p95/max go into the report as global attachments, next to the files
+        json_path, csv_path = timing.write_summary()
+        allure.global_attach.file(json_path, name=f"timings worker {config.WORKER_ID}",
+                                  attachment_type=allure.attachment_type.JSON)
+        allure.global_attach.file(csv_path, name=f"timings worker {config.WORKER_ID} (csv)",
+                                  attachment_type=allure.attachment_type.CSV)
+        timing.uninstall()
@@ -0,0 +1,10 @@
+@protocol
+Feature: PIN login and title catalog over HTTP, without a browser
+
+  Background:
+    Given I launch the FYC application
+
+  Scenario: Sign in, open a title and sign out at the protocol level
+    When I sign in using PIN "WVMVHWBS"
+    Then I navigate to "Test Automation Project"
+    And I logout from the platform
@@ -15,4 +15,17 @@ Feature: Automate FYC video playback and controls
     And I set video volume to 50 percent
     And I change video resolution to 480p and then back to 720p
     And I pause video and exit project
-    And I logout from the platform
\ No newline at end of file
+    And I logout from the platform
+    And the video playback quality is within thresholds
+
+  # These scenarios keep their session: the first one snapshots its login, the second restores it
+  Scenario: Browse the project from a signed-in session
+    Given I am signed in using PIN "WVMVHWBS"
+    Then I navigate to "Test Automation Project"
+    And I switch to Details tab and wait for few seconds
+    And I return to Videos tab
+
+  Scenario: Play a video from a restored session
+    Given I am signed in using PIN "WVMVHWBS"
+    Then I navigate to "Test Automation Project"
+    And I play the video for 10 seconds and pause
@@ -1,156 +1,149 @@
-import time
+import json
 import allure
 from behave import given, when, then
 from pages.home_page import HomePage
 from pages.login_page import LoginPage
 from pages.automation_page import AutomationPage
 from utils.logger import get_logger
+from utils.video_qoe import VideoQoe, evaluate, switch_violations
+from utils import config
 
-logger = get_logger()
+logger = get_logger("steps")
 
 
 @given("I launch the FYC application")
 @allure.step("Launching the FYC application")
 def step_launch_app(context):
-    try:
-        context.home_page = HomePage(context.driver)
-        context.home_page.launch_url('https://indeedemo-fyc.watch.indee.tv/login', timeout=15)
-    finally:
-        screenshot_path = f"screenshots/launch_app_{int(time.time())}.png"
-        context.driver.save_screenshot(screenshot_path)
-        allure.attach.file(screenshot_path, name="launch_app", attachment_type=allure.attachment_type.PNG)
-        logger.info("✅ Screenshot captured for step: launch application")
+    if context.protocol:
+        context.protocol.launch()
+        return
+    context.home_page = HomePage(context.driver)
+    context.home_page.launch_url(f"{config.BASE_URL}/login", timeout=15)
 
 
 @when('I sign in using PIN "{pin}"')
 @allure.step('Logging in with "{pin}"')
 def step_login(context, pin):
-    try:
-        context.login_page = LoginPage(context.driver)
-        context.automation_page = AutomationPage(context.driver)
-        context.automation_page.click_accept_all_button()
-        context.login_page.login(pin, timeout=15)
-    finally:
-        screenshot_path = f"screenshots/login_{int(time.time())}.png"
-        context.driver.save_screenshot(screenshot_path)
-        allure.attach.file(screenshot_path, name="login_step", attachment_type=allure.attachment_type.PNG)
-        logger.info("✅ Screenshot captured for step: login")
+    if context.protocol:
+        context.protocol.login(pin)
+        return
+    context.login_page = LoginPage(context.driver)
+    context.automation_page = AutomationPage(context.driver)
+    context.automation_page.click_accept_all_button(expected=not context.consent_accepted)
+    context.login_page.ensure_logged_in(pin, f"{config.BASE_URL}/login", timeout=15, reuse=context.reuse_session)
+
+
+@given('I am signed in using PIN "{pin}"')
+@allure.step('Signing in with "{pin}" (session snapshot when available)')
+def step_signed_in(context, pin):
+    context.login_page = LoginPage(context.driver)
+    context.automation_page = AutomationPage(context.driver)
+    context.automation_page.click_accept_all_button(expected=not context.consent_accepted)
+    signed_in = context.login_page.ensure_logged_in(pin, f"{config.BASE_URL}/login", timeout=15,
+                                                    reuse=context.reuse_session)
+    assert signed_in, f'Could not sign in with PIN "{pin}"'
 
 
 @then('I navigate to "{project_name}"')
 @allure.step("Navigating to the project")
 def step_open_project(context, project_name):
-    try:
-        context.automation_page = AutomationPage(context.driver)
-        context.automation_page.click_automation_project_title()
-    finally:
-        screenshot_path = f"screenshots/open_project_{int(time.time())}.png"
-        context.driver.save_screenshot(screenshot_path)
-        allure.attach.file(screenshot_path, name="open_project", attachment_type=allure.attachment_type.PNG)
-        logger.info("✅ Screenshot captured for step: open project")
+    if context.protocol:
+        context.protocol.open_title(project_name)
+        return
+    context.automation_page = AutomationPage(context.driver)
+    context.automation_page.click_automation_project_title()
 
 
 @then("I switch to Details tab and wait for few seconds")
 @allure.step("Switching to Details tab")
 def step_details_tab(context):
-    try:
-        context.automation_page = AutomationPage(context.driver)
-        context.automation_page.click_details_section(timeout=15)
-    finally:
-        screenshot_path = f"screenshots/details_tab_{int(time.time())}.png"
-        context.driver.save_screenshot(screenshot_path)
-        allure.attach.file(screenshot_path, name="details_tab", attachment_type=allure.attachment_type.PNG)
-        logger.info("✅ Screenshot captured for step: details tab")
+    context.automation_page = AutomationPage(context.driver)
+    context.automation_page.click_details_section(timeout=15)
 
 
 @then("I return to Videos tab")
 @allure.step("Returning to Videos tab")
 def step_videos_tab(context):
-    try:
-        context.automation_page = AutomationPage(context.driver)
-        context.automation_page.click_video_section()
-    finally:
-        screenshot_path = f"screenshots/videos_tab_{int(time.time())}.png"
-        context.driver.save_screenshot(screenshot_path)
-        allure.attach.file(screenshot_path, name="videos_tab", attachment_type=allure.attachment_type.PNG)
-        logger.info("✅ Screenshot captured for step: videos tab")
+    context.automation_page = AutomationPage(context.driver)
+    context.automation_page.click_video_section()
 
 
 @then("I play the video for 10 seconds and pause")
 @allure.step("Playing the video for 10 seconds")
 def step_play_video(context):
-    try:
-        context.automation_page = AutomationPage(context.driver)
-        context.automation_page.play_first_video()
-        context.automation_page.pause_html5_video()
-    finally:
-        screenshot_path = f"screenshots/play_video_{int(time.time())}.png"
-        context.driver.save_screenshot(screenshot_path)
-        allure.attach.file(screenshot_path, name="play_video", attachment_type=allure.attachment_type.PNG)
-        logger.info("✅ Screenshot captured for step: play video")
+    context.automation_page = AutomationPage(context.driver)
+    context.automation_page.play_first_video()
+    context.automation_page.pause_html5_video()
 
 
 @then("I resume playback using Continue Watching button")
 @allure.step("Resuming playback")
 def step_resume_video(context):
-    try:
-        context.automation_page = AutomationPage(context.driver)
-        context.automation_page.play_html5_video()
-    finally:
-        screenshot_path = f"screenshots/resume_video_{int(time.time())}.png"
-        context.driver.save_screenshot(screenshot_path)
-        allure.attach.file(screenshot_path, name="resume_video", attachment_type=allure.attachment_type.PNG)
-        logger.info("✅ Screenshot captured for step: resume video")
+    context.automation_page = AutomationPage(context.driver)
+    context.automation_page.play_html5_video()
 
 
 @then("I set video volume to 50 percent")
 @allure.step("Adjusting video volume")
 def step_volume(context):
-    try:
-        context.automation_page = AutomationPage(context.driver)
-        context.automation_page.set_video_volume_to_50()
-    finally:
-        screenshot_path = f"screenshots/volume_{int(time.time())}.png"
-        context.driver.save_screenshot(screenshot_path)
-        allure.attach.file(screenshot_path, name="volume_adjust", attachment_type=allure.attachment_type.PNG)
-        logger.info("✅ Screenshot captured for step: volume adjustment")
+    context.automation_page = AutomationPage(context.driver)
+    context.automation_page.set_video_volume_to_50()
+
+
+def check_switches(transitions, renditions):
+    """Attach the latency of every transition and fail unless each one resumed within FYC_QOE_MAX_SWITCH_MS."""
+    assert transitions is not None, f"Could not switch renditions {renditions}"
+    allure.attach(json.dumps(transitions, indent=2), name="rendition switches",
+                  attachment_type=allure.attachment_type.JSON)
+    violations = switch_violations(transitions)
+    assert not violations, f"Rendition switches failed: {', '.join(violations)}"
 
 
 @then("I change video resolution to 480p and then back to 720p")
 @allure.step("Changing video resolution")
 def step_resolution(context):
-    try:
-        context.automation_page = AutomationPage(context.driver)
-        context.automation_page.change_resolution_480_to_720_via_settings()
-    finally:
-        screenshot_path = f"screenshots/resolution_{int(time.time())}.png"
-        context.driver.save_screenshot(screenshot_path)
-        allure.attach.file(screenshot_path, name="change_resolution", attachment_type=allure.attachment_type.PNG)
-        logger.info("✅ Screenshot captured for step: change resolution")
+    context.automation_page = AutomationPage(context.driver)
+    check_switches(context.automation_page.change_resolution_480_to_720_via_settings(), "480p, 720p")
+
+
+@then('I switch the video through renditions "{renditions}"')
+@allure.step('Switching renditions "{renditions}"')
+def step_renditions(context, renditions):
+    context.automation_page = AutomationPage(context.driver)
+    context.driver.switch_to.default_content()
+    context.automation_page.switch_to_player()
+    check_switches(context.automation_page.change_resolutions([r.strip() for r in renditions.split(",")]), renditions)
 
 
 @then("I pause video and exit project")
 @allure.step("Pausing and exiting project")
 def step_exit(context):
-    try:
-        context.automation_page = AutomationPage(context.driver)
-        context.automation_page.pause_html5_video()
-        context.automation_page.navigate_back()
-    finally:
-        screenshot_path = f"screenshots/exit_project_{int(time.time())}.png"
-        context.driver.save_screenshot(screenshot_path)
-        allure.attach.file(screenshot_path, name="exit_project", attachment_type=allure.attachment_type.PNG)
-        logger.info("✅ Screenshot captured for step: exit project")
+    context.automation_page = AutomationPage(context.driver)
+    context.automation_page.pause_html5_video()
+    context.automation_page.navigate_back()
 
 
 @then("I logout from the platform")
 @allure.step("Logging out from the platform")
 def step_logout(context):
-    try:
-        context.automation_page = AutomationPage(context.driver)
-        context.automation_page.click_logout_button()
-    finally:
-        screenshot_path = f"screenshots/logout_{int(time.time())}.png"
-        context.driver.save_screenshot(screenshot_path)
-        allure.attach.file(screenshot_path, name="logout_step", attachment_type=allure.attachment_type.PNG)
-        logger.info("✅ Screenshot captured for step: logout")
+    if context.protocol:
+        context.protocol.logout()
+        return
+    context.automation_page = AutomationPage(context.driver)
+    context.automation_page.click_logout_button()
+
+
+@then("the video playback quality is within thresholds")
+@allure.step("Checking video QoE against thresholds")
+def step_video_qoe(context):
+    if not config.QOE_ENABLED:
+        logger.info("ℹ️ Video QoE collection is disabled (FYC_QOE=0), skipping the check.")
+        return
+    # The metrics are always recorded (after_scenario); only @qoe scenarios or FYC_QOE_ENFORCE fail on them
+    enforce = config.QOE_ENFORCE or "qoe" in context.scenario.effective_tags
+    metrics = VideoQoe.for_driver(context.driver).latest
+    violations = evaluate(metrics) if metrics else ["no video QoE metrics were collected"]
+    if violations and not enforce:
+        logger.warning(f"⚠️ Video QoE outside thresholds (reported only): {', '.join(violations)}")
+        return
+    assert not violations, f"Video QoE thresholds exceeded: {', '.join(violations)}"
@@ -1,38 +1,68 @@
 # automation_page.py
-import time
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
+from pages.base_page import BasePage
+from pages.element_cache import ElementCache
+from pages.locators import locator, rendition_locator
 from utils.logger import get_logger
+from utils.video_qoe import VideoQoe
+from utils.waits import PlaybackWaits
+from utils import config
 
-logger = get_logger()
+logger = get_logger(__name__)
 
-class AutomationPage:
+# Element cache scope for handles found inside the video_player iframe
+PLAYER_SCOPE = "video_player"
+
+class AutomationPage(BasePage):
     def __init__(self, driver):
-        self.driver = driver
+        super().__init__(driver)
         # Locator for the Automation project title
-        self.automation_project_title = (By.XPATH, "//h5[text()='Test automation project']")
+        self.automation_project_title = locator("automation_project_title")
         # Locator for the Details section link
-        self.details_section_link = (By.XPATH, "//a[@id='detailsSection']")
+        self.details_section_link = locator("details_section_link")
         # Locator for 'Accept All' button
-        self.accept_all_button = (By.XPATH, "(//button[text()='Accept All'])[1]")
-        self.iframe_xpath = (By.XPATH, "//iframe[@id='video_player']")
-        self.settings_button = (By.XPATH, "(//div[@aria-label='Settings'])[2]")
-        self.resolution_480_button = (By.XPATH, "//button[text()='480p']")
-        self.resolution_720_button = (By.XPATH, "//button[text()='720p']")
+        self.accept_all_button = locator("accept_all_button")
+        self.iframe_xpath = locator("video_player_iframe")
+        self.settings_button = locator("settings_button")
+        self.video_tag = locator("video")
+        self.waits = PlaybackWaits(driver)
+        # Element handles shared by every page object on this driver
+        self.elements = ElementCache.for_driver(driver)
+        self.qoe = VideoQoe.for_driver(driver)
+
+    def switch_to_player(self, timeout=10):
+        """Switch into the video_player iframe using the cached iframe handle."""
+        self.elements.use("video_player_iframe", self.driver.switch_to.frame, timeout=timeout)
+
+    def with_video(self, action, timeout=10):
+        """
+        Run action(video_element) with the cached <video> handle inside the player iframe.
+        With FYC_QOE the QoE collector is attached before and sampled after the action.
+        """
+        if not config.QOE_ENABLED:
+            return self.elements.use("video", action, scope=PLAYER_SCOPE, timeout=timeout)
+
+        def measured(video_element):
+            self.qoe.attach(video_element)
+            result = action(video_element)
+            self.qoe.sample(video_element)
+            return result
 
-    def click_accept_all_button(self, timeout=10):
+        return self.elements.use("video", measured, scope=PLAYER_SCOPE, timeout=timeout)
+
+    def click_accept_all_button(self, timeout=10, expected=True):
         """
-        Click on 'Accept All' button if it appears.
+        Click on 'Accept All' button if it appears. With expected=False (the
+        profile has accepted cookies already) the button is only looked for
+        once, without waiting for it.
         """
         try:
+            if not expected and not self.check_conditions([(self.accept_all_button, "clickable")])[0]:
+                logger.info("ℹ️ Cookies already accepted in this profile, skipping.")
+                return False
             logger.info("Waiting for 'Accept All' button to be clickable...")
-            button_element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable(self.accept_all_button)
-            )
-            button_element.click()
+            self.scroll_and_click(self.accept_all_button, timeout)
             logger.info("✅ 'Accept All' button clicked successfully.")
             return True
         except TimeoutException:
@@ -44,24 +74,13 @@ class AutomationPage:
 
     def click_automation_project_title(self, timeout=15):
         """
-        Click 'Accept All' button first if it exists, then scroll to and click
-        on 'Test automation project' title using Selenium click.
+        Scroll to and click on 'Test automation project' title in a single
+        batched locate+scroll+click round-trip.
         """
 
         try:
             logger.info("Waiting for 'Test automation project' title to be clickable...")
-            title_element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable(self.automation_project_title)
-            )
-
-            # Scroll the element into view
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'nearest'});", title_element
-            )
-            logger.info("Scrolled to 'Test automation project' title.")
-
-            # Click the element
-            title_element.click()
+            self.scroll_and_click(self.automation_project_title, timeout)
             logger.info("✅ 'Test automation project' title clicked successfully.")
             return True
 
@@ -80,28 +99,17 @@ class AutomationPage:
 
     def click_details_section(self, timeout=15):
         """
-        Scroll to and click on the 'Details' section link using Selenium click.
-        Waits until the element is clickable, then pauses for 5 seconds.
+        Scroll to and click on the 'Details' section link (batched locate+scroll+click),
+        then wait until the section has rendered.
         """
         try:
             logger.info("Waiting for 'Details' section link to be clickable...")
-            details_element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable(self.details_section_link)
-            )
-
-            # Scroll the element into view
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'nearest'});", details_element
-            )
-            logger.info("Scrolled to 'Details' section link.")
-
-            # Click the element
-            details_element.click()
+            self.scroll_and_click(self.details_section_link, timeout)
             logger.info("✅ 'Details' section link clicked successfully.")
 
-            # Wait for 5 seconds
-            time.sleep(5)
-            logger.info("Waited 5 seconds after clicking 'Details' section link.")
+            # Wait for the section content to render
+            self.waits.until_dom_settled(timeout=timeout)
+            logger.info("'Details' section content rendered.")
 
             return True
 
@@ -120,30 +128,19 @@ class AutomationPage:
 
     def click_video_section(self, timeout=15):
         """
-        Scroll to and click on the 'Video' section link using Selenium click.
-        Waits until the element is clickable.
+        Scroll to and click on the 'Video' section link (batched locate+scroll+click),
+        then wait until the section has rendered.
         """
-        video_section_link = (By.XPATH, "//a[@id='videosSection']")
+        video_section_link = locator("video_section_link")
 
         try:
             logger.info("Waiting for 'Video' section link to be clickable...")
-            video_element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable(video_section_link)
-            )
-
-            # Scroll the element into view
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'nearest'});", video_element
-            )
-            logger.info("Scrolled to 'Video' section link.")
-
-            # Click the element
-            video_element.click()
+            self.scroll_and_click(video_section_link, timeout)
             logger.info("✅ 'Video' section link clicked successfully.")
 
-            # Optional wait after clicking (if needed)
-            time.sleep(5)
-            logger.info("Waited 5 seconds after clicking 'Video' section link.")
+            # Wait for the section content to render
+            self.waits.until_dom_settled(timeout=timeout)
+            logger.info("'Video' section content rendered.")
 
             return True
 
@@ -160,33 +157,36 @@ class AutomationPage:
             logger.error(f"❌ Unexpected error clicking 'Video' section link: {e}")
             return False
 
-    def play_first_video(self, timeout=15):
+    def play_first_video(self, timeout=15, play_seconds=None):
         """
-        Scroll to the 'Remaining Views' element and click on the first 'Play Video' button.
+        Scroll to the 'Remaining Views' element and click on the first 'Play Video' button,
+        then wait until the video inside the player iframe has played for `play_seconds`.
         """
-        remaining_views = (By.XPATH, "//span[text()='Remaining Views: ']")
-        play_button = (By.XPATH, "//button[@aria-label='Play Video']")
+        remaining_views = locator("remaining_views")
+        play_button = locator("play_video_button")
 
         try:
-            # Wait for the remaining views element and scroll to it
-            logger.info("Waiting for 'Remaining Views' element to be visible...")
-            views_element = WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located(remaining_views)
-            )
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center', inline: 'nearest'});", views_element
-            )
-            logger.info("Scrolled to 'Remaining Views' element.")
-
-            # Wait for the play button to be clickable and click it
-            logger.info("Waiting for 'Play Video' button to be clickable...")
-            play_element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable(play_button)
-            )
-            play_element.click()
-            time.sleep(15)
+            # Check 'Remaining Views' and the play button together, then scroll and click
+            logger.info("Waiting for 'Remaining Views' and 'Play Video' button...")
+            self.wait_for_conditions([(remaining_views, "visible"), (play_button, "clickable")], timeout)
+            clicked = self.scroll_and_click(play_button, timeout)
+            self.qoe.mark_play(clicked.get("at"))
             logger.info("✅ 'Play Video' button clicked successfully.")
 
+            # Wait for real playback inside the player iframe
+            play_for = config.PLAYBACK_SECONDS if play_seconds is None else play_seconds
+
+            def wait_for_playback(video_element):
+                self.waits.until_ready(video_element, timeout=timeout)
+                self.waits.until_playing_for(video_element, play_for)
+
+            self.switch_to_player(timeout)
+            try:
+                self.with_video(wait_for_playback, timeout)
+                logger.info("✅ Video is playing inside the iframe.")
+            finally:
+                self.driver.switch_to.default_content()
+
             return True
 
         except TimeoutException:
@@ -208,23 +208,17 @@ class AutomationPage:
         Does NOT switch back to the default content.
         """
         try:
-            # Declare iframe XPath inside the method
-
-
             logger.info("Waiting for and switching to the video iframe...")
-            iframe_element = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located(self.iframe_xpath)
-            )
-            self.driver.switch_to.frame(iframe_element)
+            self.switch_to_player()
             logger.info("✅ Switched to video iframe successfully.")
 
-            # Locate the HTML5 video and pause it
-            video_element = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "video"))
-            )
-            self.driver.execute_script("arguments[0].pause();", video_element)
+            # Pause the HTML5 video and wait for it to report paused
+            def pause(video_element):
+                self.driver.execute_script("arguments[0].pause();", video_element)
+                self.waits.until_paused(video_element)
+
+            self.with_video(pause)
             logger.info("✅ Video paused successfully inside the iframe.")
-            time.sleep(10)
             return True
 
         except TimeoutException:
@@ -237,19 +231,26 @@ class AutomationPage:
             logger.error(f"❌ Unexpected error while pausing video in iframe: {e}")
             return False
 
-    def play_html5_video(self):
+    def play_html5_video(self, play_seconds=None):
         """
-        Resume (play) the HTML5 video inside the iframe.
+        Resume (play) the HTML5 video inside the iframe and wait until it has
+        played for `play_seconds`.
         Assumes the driver is already switched to the iframe.
         """
         try:
             logger.info("Waiting for the HTML5 video element to be present...")
-            # Locate the HTML5 video and play it
-            video_element = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "video"))
-            )
-            self.driver.execute_script("arguments[0].play();", video_element)
-            time.sleep(10)  # Optional: let the video play for 10 seconds
+            # Play the HTML5 video and wait for real playback
+            play_for = config.RESUME_SECONDS if play_seconds is None else play_seconds
+
+            def play(video_element):
+                self.qoe.mark_play(self.driver.execute_script(
+                    "var at = performance.timeOrigin + performance.now(); arguments[0].play(); return at;",
+                    video_element,
+                ))
+                self.waits.until_ready(video_element)
+                self.waits.until_playing_for(video_element, play_for)
+
+            self.with_video(play)
             logger.info("✅ Video resumed (playing) successfully inside the iframe.")
             return True
 
@@ -270,14 +271,13 @@ class AutomationPage:
         """
         try:
             logger.info("Waiting for the HTML5 video element to be present for volume adjustment...")
-            video_element = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "video"))
-            )
-
             # Set volume to 50%
-            self.driver.execute_script("arguments[0].volume = 0.5;", video_element)
+            def set_volume(video_element):
+                self.driver.execute_script("arguments[0].volume = 0.5;", video_element)
+                self.waits.until_volume(video_element, 0.5)
+
+            self.with_video(set_volume)
             logger.info("✅ Video volume set to 50% successfully.")
-            time.sleep(10)
             return True
 
         except TimeoutException:
@@ -292,79 +292,65 @@ class AutomationPage:
 
     def change_resolution_480_to_720_via_settings(self):
         """
-        Change video resolution from 480p to 720p using the Settings button via JavaScript clicks.
+        Change video resolution from 480p to 720p using the Settings menu.
         Assumes the driver is already inside the iframe containing the video.
+        Returns the two transitions, or None on failure.
+        """
+        return self.change_resolutions(["480p", "720p"])
+
+    def select_rendition(self, rendition, timeout=10):
+        """
+        Open the Settings menu and click `rendition` (e.g. '480p'), then measure
+        the time until the video size changes and playback resumes.
+        Returns the transition record from VideoQoe.await_switch.
+        """
+        # Hover the video control bar so the Settings button is shown
+        logger.info(f"Hovering over the video control bar before selecting {rendition}...")
+        hover_element = self.wait_for_element(locator("control_bar"), "present", timeout)
+        ActionChains(self.driver).move_to_element(hover_element).perform()
+
+        # Click the Settings button normally
+        logger.info("Clicking the 'Settings' button...")
+        self.wait_for_element(self.settings_button, "clickable", timeout).click()
+
+        # Arm the switch watcher right before clicking the rendition
+        logger.info(f"Selecting {rendition} resolution...")
+        button = self.wait_for_element(rendition_locator(rendition), "clickable", timeout)
+        self.with_video(self.qoe.arm_switch, timeout)
+        button.click()
+        return self.with_video(lambda video: self.qoe.await_switch(video, rendition, timeout), timeout)
+
+    def change_resolutions(self, renditions, timeout=10):
+        """
+        Switch through `renditions` in order (e.g. ['480p', '720p', '1080p']) and
+        report the switch latency of every transition.
+        Assumes the driver is already inside the iframe containing the video;
+        switches back to the default content afterwards.
+        Returns the list of transitions, or None on failure.
         """
         try:
-            # Hover element (video control bar)
-            hover_element_xpath = "//div[@class='jw-controlbar jw-reset']"
-
-            # ------------------ First Settings Click ------------------
-            logger.info("Hovering over the video control bar before first Settings click...")
-            hover_element = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, hover_element_xpath))
-            )
-            ActionChains(self.driver).move_to_element(hover_element).perform()
-            logger.info("✅ Hover performed successfully.")
-
-            # Click the Settings button normally
-            logger.info("Clicking the 'Settings' button (first time)...")
-            settings_elem = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable(self.settings_button)
-            )
-            settings_elem.click()
-            logger.info("✅ 'Settings' button clicked.")
-            time.sleep(10)
-
-            # Select 480p normally
-            logger.info("Selecting 480p resolution...")
-            button_480 = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable(self.resolution_480_button)
-            )
-            button_480.click()
-            logger.info("✅ 480p selected. Waiting 10 seconds...")
-            time.sleep(10)
-
-            # ------------------ Second Settings Click ------------------
-            logger.info("Hovering over the video control bar before second Settings click...")
-            hover_element = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, hover_element_xpath))
-            )
-            ActionChains(self.driver).move_to_element(hover_element).perform()
-            logger.info("✅ Hover performed successfully.")
-
-            # Click Settings again normally
-            logger.info("Clicking the 'Settings' button (second time)...")
-            settings_elem = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable(self.settings_button)
-            )
-            settings_elem.click()
-            logger.info("✅ 'Settings' button clicked again.")
-            time.sleep(10)
-
-            # Select 720p normally
-            logger.info("Selecting 720p resolution...")
-            button_720 = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable(self.resolution_720_button)
-            )
-            button_720.click()
-            logger.info("✅ 720p selected. Waiting 10 seconds...")
-            time.sleep(10)
+            transitions = []
+            for rendition in renditions:
+                transition = self.select_rendition(rendition, timeout)
+                transitions.append(transition)
+                if transition["status"] != "ok":
+                    logger.warning(f"⚠️ Switch to {rendition} did not complete: {transition['status']}")
+                else:
+                    logger.info(f"✅ {rendition} selected, playback resumed after {transition['resume_ms']} ms.")
 
             self.driver.switch_to.default_content()
             logger.info("✅ Switched back to default content from iframe.")
-
-            return True
+            return transitions
 
         except TimeoutException:
             logger.error("❌ Timeout: Hover element, Settings, or resolution button not found/clickable.")
-            return False
+            return None
         except NoSuchElementException:
             logger.error("❌ Hover element, Settings, or resolution button not found on the page.")
-            return False
+            return None
         except Exception as e:
             logger.error(f"❌ Unexpected error while changing video resolution: {e}")
-            return False
+            return None
 
     def navigate_back(self):
         """
@@ -373,9 +359,12 @@ class AutomationPage:
         try:
             logger.info("Navigating back to the previous page...")
             self.driver.back()
-            time.sleep(5)  # Optional: wait for 5 seconds to allow page to load
+            self.waits.until_dom_settled()
             logger.info("✅ Successfully navigated back to the previous page.")
             return True
+        except TimeoutException:
+            logger.error("❌ Timeout: previous page did not finish loading.")
+            return False
         except WebDriverException as e:
             logger.error(f"❌ WebDriverException occurred while navigating back: {e}")
             return False
@@ -387,13 +376,11 @@ class AutomationPage:
         """
         Hover over and click the 'Logout' button in the sidebar.
         """
-        logout_button_xpath = "//a[@id='signOutSideBar']"
+        logout_button = locator("logout_button")
 
         try:
             logger.info("Waiting for the 'Logout' button to be visible and hoverable...")
-            logout_element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located((By.XPATH, logout_button_xpath))
-            )
+            logout_element = self.wait_for_element(logout_button, "present", timeout)
 
             # Hover over the logout button
             ActionChains(self.driver).move_to_element(logout_element).perform()
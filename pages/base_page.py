@@ -1,19 +1,137 @@
+import time
 import allure
-from selenium.webdriver.support.ui import WebDriverWait
+from utils.wait_budget import BudgetedWait, current_budget, pause, poll_intervals, tick
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, ElementClickInterceptedException, JavascriptException
+)
+from utils import config, page_timing
 from utils.logger import get_logger
 
-logger = get_logger()
+logger = get_logger(__name__)
+
+# Shared helpers for the batched scripts: locate by selenium strategy, visibility check
+LOCATE_JS = """
+function locate(by, value) {
+    if (by === 'xpath') {
+        return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    if (by === 'id') { return document.getElementById(value); }
+    if (by === 'tag name') { return document.getElementsByTagName(value)[0] || null; }
+    if (by === 'name') { return document.getElementsByName(value)[0] || null; }
+    if (by === 'class name') { return document.getElementsByClassName(value)[0] || null; }
+    return document.querySelector(value);
+}
+function visible(el) {
+    var style = window.getComputedStyle(el);
+    var rect = el.getBoundingClientRect();
+    return style.visibility !== 'hidden' && style.display !== 'none' && rect.width > 0 && rect.height > 0;
+}
+"""
+
+# Locates an element, checks it is actionable and performs the action in one
+# round-trip. Returns {status, detail, element, at}; status is 'ok' once the action
+# is done, and `at` is when it was performed (epoch ms, performance.timeOrigin based).
+# 'clear' only empties and focuses an input: text is typed with real key events.
+ACTION_SCRIPT = LOCATE_JS + """
+var by = arguments[0], value = arguments[1], action = arguments[2];
+var el = locate(by, value);
+if (!el) { return {status: 'missing'}; }
+if (!visible(el)) { return {status: 'hidden'}; }
+if (el.disabled) { return {status: 'disabled'}; }
+el.scrollIntoView({block: 'center', inline: 'nearest'});
+var at = performance.timeOrigin + performance.now();
+if (action === 'click') {
+    var rect = el.getBoundingClientRect();
+    var top = document.elementFromPoint(rect.left + rect.width / 2, rect.top + rect.height / 2);
+    if (top && top !== el && !el.contains(top)) {
+        return {status: 'covered', detail: top.outerHTML.slice(0, 120)};
+    }
+    el.click();
+} else if (action === 'clear') {
+    var proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    var setter = Object.getOwnPropertyDescriptor(proto, 'value').set;
+    el.focus();
+    setter.call(el, '');
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+}
+return {status: 'ok', detail: el.tagName.toLowerCase(), element: el, at: at};
+"""
+
+# Evaluates several [by, value, condition] checks in one round-trip.
+# Conditions: present, visible, clickable, absent.
+CONDITIONS_SCRIPT = LOCATE_JS + """
+var checks = arguments[0];
+return checks.map(function (check) {
+    var el = locate(check[0], check[1]);
+    switch (check[2]) {
+        case 'present': return !!el;
+        case 'absent': return !el;
+        case 'visible': return !!el && visible(el);
+        case 'clickable': return !!el && visible(el) && !el.disabled;
+    }
+    return false;
+});
+"""
+
+# Resolves one async script call as soon as the element matches the condition
+# ('present', 'visible', 'clickable') or the document is loaded ('ready').
+# A MutationObserver re-checks on every DOM change; a slow in-page timer covers
+# changes that are layout-only. Reports 'cross-origin' inside a frame whose
+# parent cannot be reached, where the caller falls back to polling.
+OBSERVE_SCRIPT = LOCATE_JS + """
+var by = arguments[0], value = arguments[1], condition = arguments[2], timeoutMs = arguments[3];
+var done = arguments[arguments.length - 1];
+if (window !== window.top) {
+    try { window.top.document; } catch (e) { return done({status: 'cross-origin'}); }
+}
+function check() {
+    if (condition === 'ready') { return document.readyState === 'complete' ? document.documentElement : null; }
+    var el = locate(by, value);
+    if (!el) { return null; }
+    if (condition === 'visible' && !visible(el)) { return null; }
+    if (condition === 'clickable' && (!visible(el) || el.disabled)) { return null; }
+    return el;
+}
+var observer, timer, interval, finished = false;
+function finish(result) {
+    if (finished) { return; }
+    finished = true;
+    if (observer) { observer.disconnect(); }
+    clearTimeout(timer);
+    clearInterval(interval);
+    document.removeEventListener('readystatechange', recheck);
+    done(result);
+}
+function recheck() {
+    var el = check();
+    if (el) { finish({status: 'ok', element: el}); }
+}
+var el = check();
+if (el) { return done({status: 'ok', element: el}); }
+observer = new MutationObserver(recheck);
+observer.observe(document, {childList: true, subtree: true, attributes: true});
+document.addEventListener('readystatechange', recheck);
+interval = setInterval(recheck, 100);
+timer = setTimeout(function () { finish({status: 'timeout'}); }, timeoutMs);
+"""
+
+# Polling equivalents of the OBSERVE_SCRIPT conditions
+POLL_CONDITIONS = {
+    "present": EC.presence_of_element_located,
+    "visible": EC.visibility_of_element_located,
+    "clickable": EC.element_to_be_clickable,
+}
+
 
 class BasePage:
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 20)
+        self.wait = BudgetedWait(driver, 20)
 
     def click(self, locator):
         try:
-            self.wait.until(EC.element_to_be_clickable(locator)).click()
+            self.wait_for_element(locator, "clickable").click()
             logger.info(f"Clicked element {locator}")
             allure.step(f"Clicked element {locator}")
         except (TimeoutException, ElementClickInterceptedException) as e:
@@ -22,7 +140,7 @@ class BasePage:
 
     def send_keys(self, locator, text):
         try:
-            elem = self.wait.until(EC.visibility_of_element_located(locator))
+            elem = self.wait_for_element(locator, "visible")
             elem.clear()
             elem.send_keys(text)
             logger.info(f"Entered text in {locator}")
@@ -33,8 +151,148 @@ class BasePage:
 
     def get_element(self, locator):
         try:
-            elem = self.wait.until(EC.presence_of_element_located(locator))
+            elem = self.wait_for_element(locator, "present")
             return elem
         except (TimeoutException, NoSuchElementException) as e:
             logger.error(f"Element not found: {locator} - {e}")
             raise
+
+    # ------------------------------------------------------------ push-based waits
+    def _observe(self, by, value, condition, timeout):
+        """
+        Run OBSERVE_SCRIPT once. Returns the element, None on timeout, or
+        False when the current frame cannot be observed.
+        """
+        budget = current_budget()
+        granted = timeout if budget is None else budget.grant(timeout)
+        start = time.monotonic()
+        end = start + granted
+        result = {"status": "error"}
+        try:
+            while True:
+                # Return by the thread's next tick at the latest (e.g. a network blip), then observe again
+                due = tick()
+                remaining = max(0.0, end - time.monotonic())
+                chunk = remaining if due is None else min(remaining, max(due, 0.05))
+                result = self.driver.execute_async_script(
+                    OBSERVE_SCRIPT, by, value, condition, int(chunk * 1000)
+                ) or {}
+                if result.get("status") != "timeout" or time.monotonic() >= end:
+                    break
+        except (JavascriptException, TimeoutException) as e:
+            logger.debug(f"Observer wait failed ({e.__class__.__name__}), polling instead")
+        finally:
+            if budget is not None:
+                outcome = result.get("status") if result.get("status") in ("ok", "timeout") else "fallback"
+                budget.record(f"observe:{condition}:{value}", timeout, granted, time.monotonic() - start, outcome)
+        if result.get("status") == "ok":
+            return result["element"]
+        if result.get("status") == "timeout":
+            return None
+        return False
+
+    def wait_for_element(self, locator, condition="present", timeout=20):
+        """
+        Wait until the element matches `condition` ('present', 'visible', 'clickable')
+        and return it. With FYC_PUSH_WAITS an injected MutationObserver resolves a
+        single async script call; cross-origin frames fall back to polling.
+        """
+        if config.PUSH_WAITS:
+            element = self._observe(locator[0], locator[1], condition, timeout)
+            if element is None:
+                raise TimeoutException(f"Element {locator} not {condition} within {timeout}s")
+            if element is not False:
+                return element
+        return BudgetedWait(self.driver, timeout).until(
+            POLL_CONDITIONS[condition](locator), message=f"Element {locator} not {condition}"
+        )
+
+    def wait_for_document_ready(self, timeout=20):
+        """Wait until document.readyState is 'complete', push-based where possible."""
+        if config.PUSH_WAITS:
+            result = self._observe(None, None, "ready", timeout)
+            if result is None:
+                raise TimeoutException(f"Document not loaded within {timeout}s")
+            if result is not False:
+                return True
+        BudgetedWait(self.driver, timeout).until(
+            lambda d: d.execute_script("return document.readyState") == "complete",
+            message="document did not finish loading",
+        )
+        return True
+
+    def record_page_timing(self, page):
+        """Collect and record the Navigation/Resource Timing of the current document; never raises."""
+        if not config.PAGE_TIMING_ENABLED:
+            return None
+        try:
+            return page_timing.record(page, page_timing.collect(self.driver))
+        except Exception as e:
+            logger.error(f"❌ Could not collect page timing for '{page}': {e}")
+            return None
+
+    # ------------------------------------------------------------ batched actions
+    def _perform(self, locator, action, timeout=20):
+        """
+        Run ACTION_SCRIPT until the element is actionable and the action is done.
+        Each attempt is a single WebDriver round-trip; the timeout is clamped to
+        the step budget and retries back off like BudgetedWait.
+        Raises TimeoutException with the last status if it never succeeds.
+        """
+        by, value = locator
+        budget = current_budget()
+        granted = timeout if budget is None else budget.grant(timeout)
+        start = time.monotonic()
+        result = {}
+        outcome = "timeout"
+        try:
+            for interval in poll_intervals():
+                result = self.driver.execute_script(ACTION_SCRIPT, by, value, action) or {}
+                if result.get("status") == "ok":
+                    outcome = "ok"
+                    return result
+                remaining = start + granted - time.monotonic()
+                if remaining <= 0:
+                    break
+                pause(min(interval, remaining))
+        finally:
+            if budget is not None:
+                budget.record(f"{action}:{value}", timeout, granted, time.monotonic() - start, outcome)
+        raise TimeoutException(
+            f"Could not {action} {locator}: {result.get('status')} {result.get('detail', '')}".strip()
+        )
+
+    def scroll_and_click(self, locator, timeout=20):
+        """
+        Locate, scroll into view and click an element in one round-trip per attempt.
+        Returns the action result; its 'at' is when the click happened in the page.
+        """
+        result = self._perform(locator, "click", timeout=timeout)
+        logger.info(f"Clicked element {locator}")
+        return result
+
+    def clear_and_type(self, locator, text, timeout=20):
+        """
+        Locate, scroll into view, clear and focus an input in one round-trip per
+        attempt, then type with send_keys so the page gets real key events
+        (key handlers, input masking).
+        """
+        self._perform(locator, "clear", timeout=timeout)["element"].send_keys(text)
+        logger.info(f"Entered text in {locator}")
+        return True
+
+    def check_conditions(self, checks):
+        """
+        Evaluate several (locator, condition) checks in one round-trip.
+        Conditions: 'present', 'absent', 'visible', 'clickable'. Returns a list of booleans.
+        """
+        payload = [[locator[0], locator[1], condition] for locator, condition in checks]
+        return self.driver.execute_script(CONDITIONS_SCRIPT, payload)
+
+    def wait_for_conditions(self, checks, timeout=20):
+        """Wait until every (locator, condition) check holds, polling with one round-trip per attempt."""
+        BudgetedWait(self.driver, timeout, poll_frequency=config.POLL_FREQUENCY).until(
+            lambda d: all(self.check_conditions(checks)),
+            message=f"Conditions not met: {checks}",
+        )
+        return True
@@ -0,0 +1,96 @@
+# element_cache.py
+"""
+Per-driver cache of element handles.
+
+Page objects are re-created in every step, so the cache lives with the driver
+rather than the page object. A cached handle is used as-is, with no extra
+round-trip to check it; only when the browser reports it stale (or gone) is the
+locator resolved again and the action retried once.
+
+Handles are cached per scope, since an element found inside the video_player
+iframe is only usable while the driver is switched into that frame.
+
+The cache refers to its driver weakly and is dropped with discard() when the
+session quits, so retired sessions are not kept alive by their cached handles.
+
+Usage:
+    elements = ElementCache.for_driver(driver)
+    elements.use("video", lambda video: driver.execute_script("arguments[0].pause();", video),
+                 scope="video_player")
+"""
+
+import weakref
+from selenium.common.exceptions import StaleElementReferenceException, NoSuchElementException
+from pages.base_page import BasePage
+from pages.locators import locator
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+STALE_ERRORS = (StaleElementReferenceException, NoSuchElementException)
+
+_caches = weakref.WeakKeyDictionary()
+
+
+class ElementCache:
+    def __init__(self, driver):
+        self._driver = weakref.ref(driver)
+        self._handles = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Return the cache shared by every page object using `driver`."""
+        cache = _caches.get(driver)
+        if cache is None:
+            cache = _caches[driver] = cls(driver)
+        return cache
+
+    @classmethod
+    def clear_for(cls, driver):
+        cache = _caches.get(driver)
+        if cache is not None:
+            cache.clear()
+
+    @classmethod
+    def discard(cls, driver):
+        """Forget the cache of a session that has quit."""
+        _caches.pop(driver, None)
+
+    @property
+    def driver(self):
+        return self._driver()
+
+    def clear(self):
+        self._handles.clear()
+
+    def invalidate(self, name, scope="top"):
+        self._handles.pop((scope, name), None)
+
+    def _resolve(self, name, timeout):
+        return BasePage(self.driver).wait_for_element(locator(name), "present", timeout)
+
+    def find(self, name, scope="top", timeout=10):
+        """Return a cached handle, or resolve and cache it (waiting up to `timeout`)."""
+        key = (scope, name)
+        element = self._handles.get(key)
+        if element is not None:
+            self.hits += 1
+            return element
+        self.misses += 1
+        element = self._resolve(name, timeout)
+        self._handles[key] = element
+        return element
+
+    def use(self, name, action, scope="top", timeout=10):
+        """
+        Run `action(element)` with a cached handle. If the handle has gone stale,
+        resolve it again and retry once.
+        """
+        try:
+            return action(self.find(name, scope, timeout))
+        except STALE_ERRORS:
+            logger.info(f"ℹ️ Cached element '{name}' is stale, locating it again.")
+            self.invalidate(name, scope)
+            return action(self.find(name, scope, timeout))
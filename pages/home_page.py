@@ -1,15 +1,15 @@
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
+from urllib.parse import urlparse
+from pages.base_page import BasePage
 from utils.logger import get_logger
 
-logger = get_logger()
+logger = get_logger(__name__)
 
 
-class HomePage:
+class HomePage(BasePage):
     def __init__(self, driver):
-        self.driver = driver
+        super().__init__(driver)
 
     def launch_url(self, url, timeout=15):
         """
@@ -24,11 +24,10 @@ class HomePage:
             self.driver.get(url)
 
             # Wait until document.readyState == 'complete'
-            WebDriverWait(self.driver, timeout).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
+            self.wait_for_document_ready(timeout)
 
             logger.info(f"✅ Successfully loaded the URL: {url}")
+            self.record_page_timing(urlparse(url).path.strip("/") or "home")
             return True
 
         except TimeoutException:
@@ -0,0 +1,52 @@
+# locators.py
+"""
+Registry of the locators used by the page objects.
+
+Each entry keeps the original XPath and, where one exists, an equivalent CSS
+selector. CSS is preferred because browsers resolve it natively and faster;
+text matches and global indexes such as (//div[@aria-label='Settings'])[2]
+have no CSS equivalent and stay XPath.
+
+Usage:
+    from pages.locators import locator
+    locator("details_section_link")   # -> (By.CSS_SELECTOR, "a#detailsSection")
+"""
+
+from selenium.webdriver.common.by import By
+from utils import config
+
+# name: (xpath, css or None)
+LOCATORS = {
+    # Login page
+    "pin_input": ("//input[@id='pin']", "input#pin"),
+    "sign_in_button": ("//button[@id='sign-in-button']", "button#sign-in-button"),
+    "all_titles_button": ("//button[@aria-label='All Titles']", "button[aria-label='All Titles']"),
+    "all_titles_text": ("//p[text()=' All Titles ']", None),
+    "accept_all_button": ("(//button[text()='Accept All'])[1]", None),
+    # Catalog / project page
+    "automation_project_title": ("//h5[text()='Test automation project']", None),
+    "details_section_link": ("//a[@id='detailsSection']", "a#detailsSection"),
+    "video_section_link": ("//a[@id='videosSection']", "a#videosSection"),
+    "remaining_views": ("//span[text()='Remaining Views: ']", None),
+    "play_video_button": ("//button[@aria-label='Play Video']", "button[aria-label='Play Video']"),
+    "video_player_iframe": ("//iframe[@id='video_player']", "iframe#video_player"),
+    "logout_button": ("//a[@id='signOutSideBar']", "a#signOutSideBar"),
+    # Inside the video_player iframe
+    "video": ("//video", "video"),
+    "control_bar": ("//div[@class='jw-controlbar jw-reset']", "div[class='jw-controlbar jw-reset']"),
+    "settings_button": ("(//div[@aria-label='Settings'])[2]", None),
+}
+
+
+def locator(name, prefer_css=None):
+    """Return a (By, value) tuple for a registered locator, preferring CSS when available."""
+    xpath, css = LOCATORS[name]
+    prefer_css = config.PREFER_CSS_LOCATORS if prefer_css is None else prefer_css
+    if css and prefer_css:
+        return By.CSS_SELECTOR, css
+    return By.XPATH, xpath
+
+
+def rendition_locator(label):
+    """Return the locator of a rendition button in the player's settings menu, e.g. '480p'."""
+    return By.XPATH, f"//button[text()='{label}']"
@@ -1,27 +1,24 @@
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
+from selenium.common.exceptions import WebDriverException, NoSuchElementException
+from pages.base_page import BasePage
+from pages.locators import locator
 from utils.logger import get_logger
+from utils.session_snapshot import SessionSnapshot, discard
+from utils import config
 
-logger = get_logger()
+logger = get_logger(__name__)
 
-class LoginPage:
+class LoginPage(BasePage):
     def __init__(self, driver):
-        self.driver = driver
-        self.pin_input = (By.XPATH, "//input[@id='pin']")
-        self.sign_in_button = (By.XPATH, "//button[@id='sign-in-button']")
-        self.all_titles_button = (By.XPATH, "//button[@aria-label='All Titles']")  # Button to click
-        self.all_titles_text = (By.XPATH, "//p[text()=' All Titles ']")  # Text to verify
+        super().__init__(driver)
+        self.pin_input = locator("pin_input")
+        self.sign_in_button = locator("sign_in_button")
+        self.all_titles_button = locator("all_titles_button")  # Button to click
+        self.all_titles_text = locator("all_titles_text")  # Text to verify
 
     def enter_pin(self, pin, timeout=15):
         try:
             logger.info("Waiting for PIN input field to be visible...")
-            pin_element = WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located(self.pin_input)
-            )
-            pin_element.clear()
-            pin_element.send_keys(pin)
+            self.clear_and_type(self.pin_input, pin, timeout)
             logger.info("✅ PIN entered successfully.")
             return True
         except Exception as e:
@@ -31,14 +28,7 @@ class LoginPage:
     def click_sign_in(self, timeout=15):
         try:
             logger.info("Waiting for Sign In button to be clickable...")
-            button_element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable(self.sign_in_button)
-            )
-
-            # Scroll the element into view
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", button_element)
-
-            button_element.click()
+            self.scroll_and_click(self.sign_in_button, timeout)
             logger.info("✅ Sign In button clicked successfully.")
             return True
         except Exception as e:
@@ -49,10 +39,7 @@ class LoginPage:
         """Click the 'All Titles' button."""
         try:
             logger.info("Waiting for 'All Titles' button to be clickable...")
-            button_element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable(self.all_titles_button)
-            )
-            button_element.click()
+            self.scroll_and_click(self.all_titles_button, timeout)
             logger.info("✅ 'All Titles' button clicked successfully.")
             return True
         except Exception as e:
@@ -63,10 +50,9 @@ class LoginPage:
         """Verify the 'All Titles' text appears."""
         try:
             logger.info("Waiting for 'All Titles' text to appear...")
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located(self.all_titles_text)
-            )
+            self.wait_for_conditions([(self.all_titles_text, "visible")], timeout)
             logger.info("✅ 'All Titles' text is visible. Verification successful.")
+            self.record_page_timing("catalog")
             return True
         except Exception as e:
             logger.error(f"❌ 'All Titles' text not found: {e}")
@@ -89,3 +75,56 @@ class LoginPage:
         else:
             logger.error("❌ Login failed: PIN entry or Sign In failed.")
             return False
+
+    def save_session(self, pin):
+        """Snapshot the authenticated session so later scenarios can skip the PIN flow."""
+        try:
+            SessionSnapshot.capture(self.driver, key=pin).save()
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to capture session snapshot: {e}")
+            return False
+
+    def restore_session(self, pin, timeout=5):
+        """
+        Restore a saved session and check it is still valid by reaching the
+        'All Titles' view. Returns False if there is no usable snapshot.
+        """
+        snapshot = SessionSnapshot.load(key=pin)
+        if snapshot is None:
+            logger.info("ℹ️ No session snapshot available.")
+            return False
+        try:
+            snapshot.restore(self.driver)
+        except Exception as e:
+            logger.error(f"❌ Failed to restore session snapshot: {e}")
+            discard(pin)
+            return False
+        if self.click_all_titles_button(timeout) and self.verify_all_titles_text(timeout):
+            logger.info("✅ Signed in from session snapshot.")
+            return True
+        logger.info("ℹ️ Session snapshot is no longer valid, discarding it.")
+        discard(pin)
+        return False
+
+    def ensure_logged_in(self, pin, login_url, timeout=15, reuse=True):
+        """
+        Reach the signed-in 'All Titles' view as cheaply as possible: restore the
+        session snapshot if there is a valid one, otherwise do the full login and
+        snapshot the result.
+
+        A restored session shares its server session with every other restore of
+        the snapshot, so a scenario that logs out must pass reuse=False: it then
+        gets a login of its own and neither restores nor snapshots it.
+        """
+        reuse = reuse and config.SESSION_SNAPSHOT
+        if reuse and self.restore_session(pin):
+            return True
+        logger.info("Falling back to full PIN login...")
+        if self.driver.current_url.split("?")[0] != login_url:
+            self.driver.get(login_url)
+        if self.login(pin, timeout):
+            if reuse:
+                self.save_session(pin)
+            return True
+        return False
@@ -1,20 +1,283 @@
+import argparse
+import json
 import os
+import re
+import shutil
+import statistics
+import subprocess
 import sys
-from utils.logger import get_logger
-
-logger = get_logger()
-
-try:
-    # Run behave tests with allure result directory
-    cmd = "behave -f allure_behave.formatter:AllureFormatter -o reports/allure-results -f pretty"
-    exit_code = os.system(cmd)
-
-    if exit_code == 0:
-        logger.info("Behave tests executed successfully. Generating Allure report...")
-        os.system("allure generate reports/allure-results -o reports/allure-report --clean")
-        logger.info("Allure report generated at: reports/allure-report")
-    else:
-        logger.error("Behave tests failed. Check allure-results for details.")
-except Exception as e:
-    logger.error(f"Error running tests: {e}")
-    sys.exit(1)
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils import network_emulation, page_timing, video_qoe
+from utils.allure_results import ResultsCollector, dedupe, generate_report, reset_results
+from utils.logger import get_logger, start_file_logging
+from utils.network_emulation import PROFILES
+from utils.scenario_history import ScenarioHistory, fast, order, pack, scenario_key
+
+logger = get_logger("run_tests")
+
+FEATURES_DIR = "features"
+RESULTS_DIR = os.path.join("reports", "allure-results")
+REPORT_DIR = os.path.join("reports", "allure-report")
+WORKERS_DIR = os.path.join("reports", "workers")
+NETWORK_DIR = os.path.join("reports", "network")
+
+FEATURE_PATTERN = re.compile(r"^\s*Feature:\s*(.*)")
+SCENARIO_PATTERN = re.compile(r"^\s*Scenario( Outline| Template)?:\s*(.*)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Behave suite and build the Allure report.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of parallel behave processes (default: 1)")
+    parser.add_argument("--tags", default=None, help="Behave tag expression, e.g. @smoke")
+    parser.add_argument("--network-profiles", default=None,
+                        help=f"Comma-separated network profiles to run the suite under, with a HAR per "
+                             f"scenario and a degradation summary ({', '.join(PROFILES)})")
+    parser.add_argument("--fast", action="store_true",
+                        help="Fast feedback: only @smoke scenarios plus those that failed recently")
+    parser.add_argument("--report-only", action="store_true",
+                        help="Only build the Allure report from existing results (e.g. after a plain behave run)")
+    args = parser.parse_args(argv)
+    if args.network_profiles and args.workers > 1:
+        parser.error("--network-profiles runs each profile in a single behave process; drop --workers")
+    return args
+
+
+def discover_scenarios(features_dir=FEATURES_DIR):
+    """
+    Return every scenario in the features directory as a dict with its
+    'path/to/file.feature:LINE' location, its history key ('<feature>: <scenario>')
+    and its tags (feature tags included).
+    """
+    scenarios = []
+    for root, _, files in os.walk(features_dir):
+        for name in sorted(files):
+            if not name.endswith(".feature"):
+                continue
+            path = os.path.join(root, name)
+            feature, feature_tags, tags = "", set(), set()
+            with open(path, encoding="utf-8") as f:
+                for line_no, line in enumerate(f, start=1):
+                    stripped = line.strip()
+                    if stripped.startswith("@"):
+                        tags |= {tag.lstrip("@") for tag in stripped.split() if tag.startswith("@")}
+                        continue
+                    feature_match = FEATURE_PATTERN.match(line)
+                    scenario_match = SCENARIO_PATTERN.match(line)
+                    if feature_match:
+                        feature, feature_tags = feature_match.group(1).strip(), tags
+                    elif scenario_match:
+                        scenarios.append({
+                            "location": f"{path}:{line_no}",
+                            "key": scenario_key(feature, scenario_match.group(2).strip()),
+                            "tags": feature_tags | tags,
+                        })
+                    if stripped and not stripped.startswith("#"):
+                        tags = set()
+    return scenarios
+
+
+def behave_command(results_dir, tags=None, locations=None):
+    cmd = [sys.executable, "-m", "behave",
+           "-f", "allure_behave.formatter:AllureFormatter", "-o", results_dir,
+           "-f", "pretty"]
+    if tags:
+        cmd += ["--tags", tags]
+    if locations:
+        cmd += locations
+    return cmd
+
+
+def run_worker(worker_id, locations, tags=None):
+    """Run one behave process for a shard, with its own allure-results directory and Chrome."""
+    results_dir = os.path.join(WORKERS_DIR, f"worker-{worker_id}", "allure-results")
+    shutil.rmtree(results_dir, ignore_errors=True)
+    os.makedirs(results_dir, exist_ok=True)
+
+    env = dict(os.environ, FYC_WORKER_ID=str(worker_id))
+    log_path = os.path.join(WORKERS_DIR, f"worker-{worker_id}", "behave.log")
+    logger.info(f"Worker {worker_id}: running {len(locations)} scenario(s)")
+    with open(log_path, "w", encoding="utf-8") as log_file:
+        exit_code = subprocess.call(
+            behave_command(results_dir, tags, locations), env=env,
+            stdout=log_file, stderr=subprocess.STDOUT
+        )
+    logger.info(f"Worker {worker_id}: finished with exit code {exit_code} (log: {log_path})")
+    return exit_code
+
+
+def run_serial(tags=None, locations=None):
+    # A worker id gives behave its own log file, apart from this process's
+    exit_code = subprocess.call(behave_command(RESULTS_DIR, tags, locations), env=dict(os.environ, FYC_WORKER_ID="0"))
+    dedupe(RESULTS_DIR)
+    return exit_code
+
+
+def run_parallel(workers, scenarios, history, tags=None):
+    shards = pack(scenarios, workers, history)
+    if not shards:
+        logger.error("No scenarios found to run.")
+        return 1
+
+    logger.info(f"Running {sum(len(s) for s in shards)} scenario(s) across {len(shards)} worker(s)...")
+    # Results move into RESULTS_DIR as scenarios finish, not in one copy at the end
+    collector = ResultsCollector(RESULTS_DIR)
+    collector.start([os.path.join(WORKERS_DIR, f"worker-{i}", "allure-results") for i in range(len(shards))])
+    try:
+        with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+            exit_codes = list(pool.map(lambda args: run_worker(*args, tags=tags), enumerate(shards)))
+    finally:
+        collector.stop()
+    return max(exit_codes)
+
+
+def run_profile(profile, tags=None, locations=None):
+    """Run the suite (or `locations`) once under a network profile; artifacts go to reports/network/<profile>/."""
+    profile_dir = os.path.join(NETWORK_DIR, profile)
+    shutil.rmtree(profile_dir, ignore_errors=True)
+    results_dir = os.path.join(profile_dir, "allure-results")
+    os.makedirs(results_dir, exist_ok=True)
+    env = dict(
+        os.environ,
+        FYC_WORKER_ID="0",
+        FYC_NETWORK_PROFILE=profile,
+        FYC_LAUNCH_PROFILE="faithful",
+        FYC_HAR="1",
+        FYC_HAR_DIR=os.path.join(profile_dir, "har"),
+        FYC_PAGE_TIMING_DIR=os.path.join(profile_dir, "page_timing"),
+        FYC_QOE_DIR=os.path.join(profile_dir, "qoe"),
+        FYC_NETWORK_BLIPS_DIR=os.path.join(profile_dir, "blips"),
+        FYC_TIMINGS_DIR=os.path.join(profile_dir, "timings"),
+    )
+    logger.info(f"Running the suite under network profile '{profile}'...")
+    start = time.perf_counter()
+    exit_code = subprocess.call(behave_command(results_dir, tags, locations), env=env)
+    elapsed = time.perf_counter() - start
+    logger.info(f"Profile '{profile}': finished in {elapsed:.1f}s with exit code {exit_code}")
+    return exit_code, elapsed
+
+
+def _median(values):
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values), 1) if values else None
+
+
+def summarize_profile(profile, exit_code, elapsed):
+    """Login/catalog load and playback start of one profile run."""
+    profile_dir = os.path.join(NETWORK_DIR, profile)
+    pages = page_timing.load_records(os.path.join(profile_dir, "page_timing"))
+    qoe = video_qoe.load_records(os.path.join(profile_dir, "qoe"))
+    blips = network_emulation.load_records(os.path.join(profile_dir, "blips"))
+    late = [blip["late_s"] for record in blips for blip in record["blips"]]
+
+    def page_metric(page, metric):
+        return _median([r["metrics"].get(metric) for r in pages if r["page"] == page])
+
+    return {
+        "profile": profile,
+        "exit_code": exit_code,
+        "wall_clock_s": round(elapsed, 1),
+        "login_ttfb_ms": page_metric("login", "ttfb_ms"),
+        "login_load_ms": page_metric("login", "load_ms"),
+        "catalog_load_ms": page_metric("catalog", "load_ms"),
+        "catalog_lcp_ms": page_metric("catalog", "lcp_ms"),
+        "playback_ttff_ms": _median([r["metrics"].get("ttff_ms") for r in qoe]),
+        "playback_stalls": _median([r["metrics"].get("stall_count") for r in qoe]),
+        # Offline blips as applied: how many, how many windows were missed, worst lateness
+        "blips": len(late),
+        "blips_missed": sum(record["missed"] for record in blips),
+        "blip_max_late_ms": round(max(late) * 1000) if late else None,
+    }
+
+
+def write_network_summary(rows, path=None):
+    """Write the per-profile summary, with each metric relative to the first profile, and log it."""
+    path = path or os.path.join(NETWORK_DIR, "summary.json")
+    baseline = rows[0]
+    for row in rows:
+        row["vs_" + baseline["profile"]] = {
+            key: round(value / baseline[key], 2)
+            for key, value in row.items()
+            if key.endswith(("_ms", "_s")) and value and baseline.get(key)
+        }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(rows, f, indent=2)
+
+    columns = ["wall_clock_s", "login_load_ms", "catalog_load_ms", "catalog_lcp_ms", "playback_ttff_ms"]
+    logger.info("profile      " + "  ".join(f"{c:>16}" for c in columns))
+    for row in rows:
+        logger.info(f"{row['profile']:<12} " + "  ".join(f"{str(row[c]):>16}" for c in columns))
+    logger.info(f"Network profile summary written to {path}")
+
+
+def run_network_matrix(profiles, tags=None, locations=None):
+    """Run the suite under every profile, merge the Allure results and summarize the degradation."""
+    unknown = [p for p in profiles if p not in PROFILES]
+    if unknown:
+        logger.error(f"Unknown network profile(s): {', '.join(unknown)}")
+        return 1
+
+    rows = []
+    exit_codes = []
+    collector = ResultsCollector(RESULTS_DIR)
+    for profile in profiles:
+        exit_code, elapsed = run_profile(profile, tags, locations)
+        exit_codes.append(exit_code)
+        rows.append(summarize_profile(profile, exit_code, elapsed))
+        collector.collect(os.path.join(NETWORK_DIR, profile, "allure-results"), final=True)
+
+    collector.log_summary()
+    write_network_summary(rows)
+    return max(exit_codes)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start_file_logging()
+    history = ScenarioHistory()
+    if args.report_only:
+        dedupe(RESULTS_DIR)
+        history.record_results(RESULTS_DIR)
+        history.save()
+        return generate_report(RESULTS_DIR, REPORT_DIR)
+    exit_code = 1
+    try:
+        reset_results(RESULTS_DIR)
+        scenarios = discover_scenarios()
+        if args.fast:
+            scenarios = fast(scenarios, history)
+            logger.info(f"Fast feedback: {len(scenarios)} @smoke or recently failed scenario(s)")
+        if not scenarios:
+            logger.error("No scenarios found to run.")
+        elif args.network_profiles:
+            profiles = [p.strip() for p in args.network_profiles.split(",") if p.strip()]
+            # Each profile runs the --fast selection if there is one, the whole suite otherwise
+            locations = [s["location"] for s in order(scenarios, history)] if args.fast else None
+            exit_code = run_network_matrix(profiles, args.tags, locations)
+        elif args.workers > 1:
+            exit_code = run_parallel(args.workers, scenarios, history, args.tags)
+        else:
+            # Run behave tests with allure result directory, recent failures first
+            exit_code = run_serial(args.tags, [s["location"] for s in order(scenarios, history)])
+
+        if exit_code == 0:
+            logger.info("Behave tests executed successfully.")
+        else:
+            logger.error("Behave tests failed. Check the Allure report for details.")
+        if args.network_profiles:
+            # Failures provoked by degraded profiles must not count as recent failures
+            logger.info("Network profile run: scenario history not updated")
+        else:
+            history.record_results(RESULTS_DIR)
+            history.save()
+    except Exception as e:
+        logger.error(f"Error running tests: {e}")
+    # The report is built whatever the outcome, so failing runs can be inspected
+    generate_report(RESULTS_DIR, REPORT_DIR)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+# stand_in/server.py
+"""
+Local stand-in for the FYC site.
+
+Serves the pages our locators target (PIN login with cookie banner, "All Titles"
+catalog, project page with Details/Videos tabs, and a `video_player` iframe with
+a JW-Player-style control bar around a real <video> element), so the feature
+can run end-to-end offline and be benchmarked reproducibly.
+
+Latency and failures can be injected for every request:
+
+    python -m stand_in.server --port 8000 --latency-ms 50 --jitter-ms 20 --failure-rate 0.01
+
+Then run the suite against it:
+
+    FYC_BASE_URL=http://127.0.0.1:8000 python run_tests.py
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import secrets
+import threading
+import time
+from http import HTTPStatus
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+SESSION_COOKIE = "fyc_session"
+DEFAULT_PIN = "WVMVHWBS"
+
+TITLES = [
+    {"slug": "test-automation-project", "name": "Test automation project", "videos": 1},
+]
+
+PAGES = {
+    "/login": ("login.html", False),
+    "/titles": ("titles.html", True),
+    "/projects/test-automation-project": ("project.html", True),
+    "/player": ("player.html", True),
+}
+
+CONTENT_TYPES = {".html": "text/html", ".css": "text/css", ".js": "application/javascript"}
+
+
+class StandInSettings:
+    def __init__(self, pin=DEFAULT_PIN, latency_ms=0, jitter_ms=0, failure_rate=0.0, fail_paths=None):
+        """
+        :param pin: PIN accepted by the login form
+        :param latency_ms: delay added to every response
+        :param jitter_ms: random extra delay (0..jitter_ms) added to every response
+        :param failure_rate: probability (0..1) that a request fails with 503
+        :param fail_paths: optional regex; failures are only injected for matching paths
+        """
+        self.pin = pin
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.fail_paths = re.compile(fail_paths) if fail_paths else None
+        self.sessions = set()
+        self.lock = threading.Lock()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server_version = "FYCStandIn/1.0"
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, keep-alive clients wait on delayed ACKs
+    disable_nagle_algorithm = True
+
+    @property
+    def settings(self):
+        return self.server.settings
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    # ------------------------------------------------------------ helpers
+    def _session(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        token = cookie[SESSION_COOKIE].value if SESSION_COOKIE in cookie else None
+        with self.settings.lock:
+            return token if token in self.settings.sessions else None
+
+    def _inject(self, path):
+        """Apply configured latency; return True if this request should fail."""
+        delay = self.settings.latency_ms + random.uniform(0, self.settings.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000)
+        if self.settings.failure_rate and random.random() < self.settings.failure_rate:
+            return not self.settings.fail_paths or bool(self.settings.fail_paths.search(path))
+        return False
+
+    def _send(self, status, body=b"", content_type="text/plain", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_json(self, status, payload, headers=None):
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+    def _redirect(self, location, headers=None):
+        self._send(HTTPStatus.FOUND, headers=dict(headers or {}, Location=location))
+
+    def _send_static(self, name):
+        path = os.path.join(STATIC_DIR, name)
+        if not os.path.isfile(path):
+            self._send(HTTPStatus.NOT_FOUND, b"not found")
+            return
+        with open(path, "rb") as f:
+            body = f.read()
+        self._send(HTTPStatus.OK, body, CONTENT_TYPES.get(os.path.splitext(name)[1], "application/octet-stream"))
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return {}
+
+    # ------------------------------------------------------------ routes
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if self._inject(path):
+            self._send(HTTPStatus.SERVICE_UNAVAILABLE, b"injected failure")
+            return
+
+        if path == "/":
+            self._redirect("/login")
+        elif path in PAGES:
+            name, needs_session = PAGES[path]
+            if needs_session and not self._session():
+                self._redirect("/login")
+            else:
+                self._send_static(name)
+        elif path.startswith("/static/"):
+            self._send_static(os.path.basename(path))
+        elif path == "/api/session":
+            self._send_json(HTTPStatus.OK, {"authenticated": self._session() is not None})
+        elif path == "/api/titles":
+            if self._session():
+                self._send_json(HTTPStatus.OK, {"titles": TITLES})
+            else:
+                self._send_json(HTTPStatus.UNAUTHORIZED, {"error": "not signed in"})
+        elif path == "/logout":
+            token = self._session()
+            with self.settings.lock:
+                self.settings.sessions.discard(token)
+            self._redirect("/login", {"Set-Cookie": f"{SESSION_COOKIE}=; Path=/; Max-Age=0"})
+        else:
+            self._send(HTTPStatus.NOT_FOUND, b"not found")
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        if self._inject(path):
+            self._send(HTTPStatus.SERVICE_UNAVAILABLE, b"injected failure")
+            return
+
+        if path == "/api/login":
+            if self._read_json().get("pin") != self.settings.pin:
+                self._send_json(HTTPStatus.UNAUTHORIZED, {"error": "invalid PIN"})
+                return
+            token = secrets.token_hex(16)
+            with self.settings.lock:
+                self.settings.sessions.add(token)
+            self._send_json(HTTPStatus.OK, {"redirect": "/titles"},
+                            {"Set-Cookie": f"{SESSION_COOKIE}={token}; Path=/; HttpOnly; SameSite=Lax"})
+        else:
+            self._send(HTTPStatus.NOT_FOUND, b"not found")
+
+
+class StandInServer(ThreadingHTTPServer):
+    # Room for the connection bursts of load runs (benchmarks/run_load.py)
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def start_server(host="127.0.0.1", port=0, settings=None):
+    """
+    Start the stand-in server on a background thread.
+    Returns (server, base_url); call server.shutdown() to stop it.
+    """
+    server = StandInServer((host, port), StandInHandler)
+    server.settings = settings or StandInSettings()
+    threading.Thread(target=server.serve_forever, name="stand-in-server", daemon=True).start()
+    base_url = f"http://{host}:{server.server_address[1]}"
+    logger.info(f"✅ Stand-in FYC site running at {base_url}")
+    return server, base_url
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the FYC site.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--pin", default=DEFAULT_PIN)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--fail-paths", default=None, help="Regex limiting failure injection to matching paths")
+    args = parser.parse_args(argv)
+
+    settings = StandInSettings(args.pin, args.latency_ms, args.jitter_ms, args.failure_rate, args.fail_paths)
+    server = StandInServer((args.host, args.port), StandInHandler)
+    server.settings = settings
+    logger.info(f"✅ Stand-in FYC site running at http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+# tests/test_allure_results.py
+"""Attachment dedupe by content, result rewriting and report history."""
+
+import hashlib
+import json
+import os
+from utils.allure_results import ResultsCollector, dedupe, restore_history
+
+
+def write_run(directory, uuid, screenshot):
+    """One result with a screenshot attachment, as allure-behave writes them."""
+    os.makedirs(directory, exist_ok=True)
+    attachment = f"{uuid}-attachment.png"
+    with open(os.path.join(directory, attachment), "wb") as f:
+        f.write(screenshot)
+    result = {"uuid": uuid, "name": uuid, "steps": [{"name": "step", "attachments": [
+        {"name": "screenshot", "source": attachment, "type": "image/png"}]}]}
+    with open(os.path.join(directory, f"{uuid}-result.json"), "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+def sources(directory, uuid):
+    with open(os.path.join(directory, f"{uuid}-result.json"), encoding="utf-8") as f:
+        return [a["source"] for step in json.load(f)["steps"] for a in step["attachments"]]
+
+
+def test_identical_attachments_are_kept_once(tmp_path):
+    results = str(tmp_path)
+    write_run(results, "a", b"same pixels")
+    write_run(results, "b", b"same pixels")
+    write_run(results, "c", b"other pixels")
+
+    collector = dedupe(results)
+
+    content_name = hashlib.sha256(b"same pixels").hexdigest() + "-attachment.png"
+    assert sources(results, "a") == sources(results, "b") == [content_name]
+    assert sources(results, "c") != [content_name]
+    attachments = [n for n in os.listdir(results) if "-attachment" in n]
+    assert len(attachments) == 2
+    assert collector.duplicates == 1
+
+
+def test_dedupe_in_place_is_idempotent(tmp_path):
+    results = str(tmp_path)
+    write_run(results, "a", b"pixels")
+    dedupe(results)
+    before = sorted(os.listdir(results))
+
+    collector = dedupe(results)
+
+    assert sorted(os.listdir(results)) == before
+    assert collector.duplicates == 0
+
+
+def test_worker_results_are_moved_and_deduped_across_workers(tmp_path):
+    target = str(tmp_path / "results")
+    workers = [str(tmp_path / f"worker-{i}") for i in range(2)]
+    write_run(workers[0], "a", b"same pixels")
+    write_run(workers[1], "b", b"same pixels")
+    collector = ResultsCollector(target)
+
+    for worker in workers:
+        collector.collect(worker, final=True)
+
+    assert os.listdir(workers[0]) == os.listdir(workers[1]) == []
+    assert sources(target, "a") == sources(target, "b")
+    assert len([n for n in os.listdir(target) if "-attachment" in n]) == 1
+
+
+def test_files_still_being_written_wait_for_the_next_sweep(tmp_path):
+    source = str(tmp_path / "worker-0")
+    write_run(source, "a", b"pixels")
+    collector = ResultsCollector(str(tmp_path / "results"), settle_seconds=60)
+
+    collector.collect(source)
+
+    assert len(os.listdir(source)) == 2
+    collector.collect(source, final=True)
+    assert os.listdir(source) == []
+
+
+def test_global_attachments_are_rewritten_too(tmp_path):
+    results = str(tmp_path)
+    write_run(results, "a", b"timings")
+    with open(tmp_path / "g-attachment.json", "wb") as f:
+        f.write(b"timings")
+    with open(tmp_path / "g-globals.json", "w", encoding="utf-8") as f:
+        json.dump({"attachments": [{"name": "timings", "source": "g-attachment.json", "type": "application/json"}],
+                   "errors": []}, f)
+
+    dedupe(results)
+
+    with open(tmp_path / "g-globals.json", encoding="utf-8") as f:
+        (attachment,) = json.load(f)["attachments"]
+    assert attachment["source"] == hashlib.sha256(b"timings").hexdigest() + "-attachment.json"
+    assert os.path.exists(tmp_path / attachment["source"])
+
+
+def test_the_previous_report_history_is_carried_over(tmp_path):
+    report, results = tmp_path / "report", tmp_path / "results"
+    assert restore_history(str(results), str(report)) is False
+
+    (report / "history").mkdir(parents=True)
+    (report / "history" / "history-trend.json").write_text("[]", encoding="utf-8")
+
+    assert restore_history(str(results), str(report)) is True
+    assert (results / "history" / "history-trend.json").read_text(encoding="utf-8") == "[]"
@@ -0,0 +1,71 @@
+# tests/test_base_page.py
+"""Batched single round-trip actions of BasePage, against a scripted fake driver."""
+
+import pytest
+
+pytest.importorskip("selenium")
+pytest.importorskip("allure")
+
+from selenium.common.exceptions import TimeoutException
+from pages import base_page
+from pages.base_page import BasePage
+
+PIN_INPUT = ("id", "pin")
+
+
+class FakeElement:
+    def __init__(self):
+        self.keys = []
+
+    def send_keys(self, text):
+        self.keys.append(text)
+
+
+class FakeDriver:
+    """Answers ACTION_SCRIPT with the given statuses in turn, the last one repeating."""
+
+    def __init__(self, *statuses, checks=None):
+        self.statuses = list(statuses)
+        self.checks = checks
+        self.element = FakeElement()
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        if script == base_page.CONDITIONS_SCRIPT:
+            return self.checks
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return {"status": status, "detail": "input", "element": self.element}
+
+
+def test_actions_retry_until_the_element_is_actionable():
+    driver = FakeDriver("missing", "hidden", "ok")
+
+    assert BasePage(driver).scroll_and_click(PIN_INPUT, timeout=2)
+    assert [args for _, args in driver.calls] == [("id", "pin", "click")] * 3
+
+
+def test_actions_time_out_with_the_last_status():
+    driver = FakeDriver("covered")
+
+    with pytest.raises(TimeoutException, match="Could not click .* covered input"):
+        BasePage(driver).scroll_and_click(PIN_INPUT, timeout=0.1)
+
+
+def test_clear_and_type_clears_in_one_round_trip_and_types_real_keys():
+    driver = FakeDriver("ok")
+
+    assert BasePage(driver).clear_and_type(PIN_INPUT, "WVMVHWBS")
+
+    assert [args for _, args in driver.calls] == [("id", "pin", "clear")]
+    assert driver.element.keys == ["WVMVHWBS"]
+
+
+def test_check_conditions_sends_all_checks_in_one_round_trip():
+    driver = FakeDriver(checks=[True, False])
+
+    result = BasePage(driver).check_conditions([(PIN_INPUT, "visible"), (("css selector", ".banner"), "absent")])
+
+    assert result == [True, False]
+    payload = [["id", "pin", "visible"], ["css selector", ".banner", "absent"]]
+    assert driver.calls == [(base_page.CONDITIONS_SCRIPT, (payload,))]
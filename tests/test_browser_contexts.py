@@ -0,0 +1,146 @@
+# tests/test_browser_contexts.py
+"""Browser contexts in shared host browsers, with fake host and context drivers."""
+
+import itertools
+import pytest
+
+pytest.importorskip("selenium")
+
+from utils import browser_contexts
+from utils.browser_contexts import BrowserContexts, ContextDriver
+
+
+class FakeHost:
+    """A host Chrome answering the Target.* DevTools commands."""
+
+    ids = itertools.count(1)
+
+    def __init__(self, fail_target=False):
+        self.capabilities = {"goog:chromeOptions": {"debuggerAddress": f"127.0.0.1:{9000 + next(self.ids)}"}}
+        self.fail_target = fail_target
+        self.contexts = set()
+        self.commands = []
+        self.quit_called = False
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append(command)
+        if command == "Target.createBrowserContext":
+            context_id = f"ctx{next(self.ids)}"
+            self.contexts.add(context_id)
+            return {"browserContextId": context_id}
+        if command == "Target.createTarget":
+            if self.fail_target:
+                raise RuntimeError("target crashed")
+            return {"targetId": f"tab{params['browserContextId']}"}
+        if command == "Target.disposeBrowserContext":
+            self.contexts.discard(params["browserContextId"])
+            return {}
+        raise AssertionError(command)
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeContextDriver:
+    def __init__(self, host):
+        self.host = host
+        self.browser_context_id = None
+        self.current = None
+        self.switch_to = self
+
+    @property
+    def window_handles(self):
+        return [f"CDwindow-tab{context}" for context in sorted(self.host.contexts)]
+
+    def window(self, handle):
+        self.current = handle
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def contexts(monkeypatch):
+    hosts = []
+
+    def launch_host():
+        hosts.append(FakeHost())
+        return hosts[-1]
+
+    quit_hosts = []
+    pool = BrowserContexts(launch_host, max_contexts=2, on_quit=quit_hosts.append)
+    monkeypatch.setattr(pool, "_attach", lambda host: FakeContextDriver(host.driver))
+    pool.hosts, pool.quit_hosts = hosts, quit_hosts
+    return pool
+
+
+def test_each_session_gets_its_own_context_and_tab(contexts):
+    first, second = contexts.create(), contexts.create()
+
+    assert first.browser_context_id != second.browser_context_id
+    assert first.current == f"CDwindow-tab{first.browser_context_id}"
+    assert len(contexts.hosts) == 1
+
+
+def test_a_new_host_is_launched_once_the_others_are_full(contexts):
+    drivers = [contexts.create() for _ in range(3)]
+
+    assert len(contexts.hosts) == 2
+    assert drivers[2].host is contexts.hosts[1]
+
+
+def test_dispose_frees_the_slot_and_closes_the_context(contexts):
+    first, _ = contexts.create(), contexts.create()
+    contexts.dispose(first)
+    contexts.dispose(first)  # a second dispose is a no-op
+
+    contexts.create()
+
+    assert len(contexts.hosts) == 1
+    assert contexts.hosts[0].commands.count("Target.disposeBrowserContext") == 1
+    assert first.browser_context_id not in contexts.hosts[0].contexts
+
+
+def test_a_failed_create_disposes_the_context_and_releases_the_slot(contexts):
+    contexts.launch_host = lambda: FakeHost(fail_target=True)
+
+    with pytest.raises(RuntimeError, match="target crashed"):
+        contexts.create()
+
+    host = contexts._hosts[0]
+    assert (host.reserved, host.contexts) == (0, set())
+    assert host.driver.contexts == set()
+
+
+def test_close_quits_every_host_and_runs_the_cleanup(contexts):
+    contexts.create(), contexts.create(), contexts.create()
+
+    contexts.close()
+
+    assert all(host.quit_called for host in contexts.hosts)
+    assert contexts.quit_hosts == contexts.hosts
+
+
+def test_hosts_without_a_debugger_address_are_rejected(contexts):
+    host = FakeHost()
+    host.capabilities = {}
+    contexts.launch_host = lambda: host
+
+    with pytest.raises(RuntimeError, match="debuggerAddress"):
+        contexts.create()
+
+
+def test_context_sessions_only_see_their_own_tabs(monkeypatch):
+    driver = ContextDriver.__new__(ContextDriver)
+    driver.browser_context_id = "ctx1"
+    targets = [
+        {"targetId": "A", "type": "page", "browserContextId": "ctx1"},
+        {"targetId": "B", "type": "page", "browserContextId": "ctx2"},
+        {"targetId": "C", "type": "service_worker", "browserContextId": "ctx1"},
+    ]
+    monkeypatch.setattr(driver, "execute_cdp_cmd", lambda command, params: {"targetInfos": targets}, raising=False)
+    monkeypatch.setattr(driver, "execute", lambda command, params=None: {"value": ["CDwindow-A", "B", "C"]},
+                        raising=False)
+
+    assert driver.window_handles == ["CDwindow-A"]
+    assert browser_contexts._target_id("CDwindow-A") == "A"
@@ -0,0 +1,79 @@
+# tests/test_driver_pool.py
+"""DriverPool hand-out when replacement launches fail, with fake sessions."""
+
+import pytest
+from utils.driver_pool import DriverPool
+
+
+class FakeDriver:
+    window_handles = ["main"]
+
+    def __init__(self):
+        self.quit_called = False
+        self.switch_to = self
+
+    def window(self, handle):
+        pass
+
+    def default_content(self):
+        pass
+
+    def delete_all_cookies(self):
+        pass
+
+    def execute_script(self, script):
+        return 0
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+class Factory:
+    def __init__(self):
+        self.fail = False
+        self.launched = []
+
+    def __call__(self):
+        if self.fail:
+            raise RuntimeError("chromedriver crashed")
+        driver = FakeDriver()
+        self.launched.append(driver)
+        return driver
+
+
+def test_failed_replacement_is_launched_by_the_next_acquire():
+    factory = Factory()
+    pool = DriverPool(factory, size=1, max_uses=1)
+    factory.fail = True
+    pool.release(pool.acquire())  # worn out: retired, replacement launch fails
+    for thread in pool._launchers:
+        thread.join()
+
+    factory.fail = False
+    driver = pool.acquire(timeout=5)
+
+    assert driver is factory.launched[-1]
+    assert len(factory.launched) == 2
+
+
+def test_acquire_raises_when_the_launch_fails_again():
+    factory = Factory()
+    pool = DriverPool(factory, size=1, max_uses=1)
+    factory.fail = True
+    pool.release(pool.acquire())
+    for thread in pool._launchers:
+        thread.join()
+
+    with pytest.raises(RuntimeError):
+        pool.acquire(timeout=5)
+
+
+def test_acquire_times_out_while_every_session_is_in_use():
+    pool = DriverPool(Factory(), size=1)
+    pool.acquire()
+
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.2)
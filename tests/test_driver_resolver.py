@@ -0,0 +1,73 @@
+# tests/test_driver_resolver.py
+"""chromedriver resolution from the content-addressed cache, with fake Chrome/driver versions."""
+
+import pytest
+from utils import config, driver_resolver
+
+
+@pytest.fixture(autouse=True)
+def fresh_resolver(monkeypatch):
+    monkeypatch.setattr(driver_resolver, "_resolved_path", None)
+    monkeypatch.delenv("CHROMEDRIVER_PATH", raising=False)
+    monkeypatch.setattr(config, "DRIVER_OFFLINE", False)
+    monkeypatch.setattr(driver_resolver, "detect_chrome_version", lambda: "129.0.6668.58")
+    monkeypatch.setattr(driver_resolver, "_read_version", lambda path: "129.0.6668.100")
+
+
+@pytest.fixture
+def downloads(tmp_path, monkeypatch):
+    calls = []
+
+    def download():
+        path = tmp_path / f"download-{len(calls)}" / "chromedriver"
+        path.parent.mkdir()
+        path.write_bytes(b"driver 129")
+        calls.append(str(path))
+        return str(path)
+
+    monkeypatch.setattr(driver_resolver, "_download", download)
+    return calls
+
+
+def test_a_miss_downloads_once_into_the_cache(tmp_path, downloads):
+    cache = str(tmp_path / "cache")
+
+    path = driver_resolver.resolve_driver_path(cache_dir=cache)
+
+    assert len(downloads) == 1
+    assert path.startswith(cache) and open(path, "rb").read() == b"driver 129"
+    assert driver_resolver.load_index(cache)["129"]["version"] == "129.0.6668.100"
+
+
+def test_a_hit_returns_the_cached_binary_without_downloading(tmp_path, downloads):
+    cache = str(tmp_path / "cache")
+    seed = tmp_path / "chromedriver"
+    seed.write_bytes(b"driver 129")
+    cached = driver_resolver.import_driver(str(seed), cache)
+
+    assert driver_resolver.resolve_driver_path(cache_dir=cache) == cached
+    assert downloads == []
+
+
+def test_offline_runs_fail_on_a_miss(tmp_path, downloads, monkeypatch):
+    monkeypatch.setattr(config, "DRIVER_OFFLINE", True)
+
+    with pytest.raises(RuntimeError, match="No cached chromedriver for Chrome 129.0.6668.58"):
+        driver_resolver.resolve_driver_path(cache_dir=str(tmp_path / "cache"))
+    assert downloads == []
+
+
+def test_an_entry_whose_blob_is_gone_counts_as_a_miss(tmp_path, downloads):
+    cache = str(tmp_path / "cache")
+    driver_resolver._update_index(cache, "129", {"sha256": "0" * 64, "version": "129.0.0.1"})
+
+    driver_resolver.resolve_driver_path(cache_dir=cache)
+
+    assert len(downloads) == 1
+
+
+def test_chromedriver_path_bypasses_the_cache(tmp_path, downloads, monkeypatch):
+    monkeypatch.setenv("CHROMEDRIVER_PATH", "/opt/chromedriver")
+
+    assert driver_resolver.resolve_driver_path(cache_dir=str(tmp_path / "cache")) == "/opt/chromedriver"
+    assert downloads == []
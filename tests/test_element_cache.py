@@ -0,0 +1,91 @@
+# tests/test_element_cache.py
+"""Per-driver element handle cache: hits, stale-handle retry, scopes and weak driver references."""
+
+import gc
+import pytest
+
+pytest.importorskip("selenium")
+pytest.importorskip("allure")
+
+from selenium.common.exceptions import StaleElementReferenceException
+from pages import element_cache
+from pages.element_cache import ElementCache
+
+
+class FakeDriver:
+    pass
+
+
+@pytest.fixture
+def resolved(monkeypatch):
+    """Replace the page lookup: each resolve returns a new handle and is recorded."""
+    calls = []
+
+    def resolve(self, name, timeout):
+        calls.append(name)
+        return f"{name}#{len(calls)}"
+
+    monkeypatch.setattr(ElementCache, "_resolve", resolve)
+    return calls
+
+
+def test_cached_handles_are_reused_without_a_lookup(resolved):
+    cache = ElementCache.for_driver(FakeDriver())
+
+    assert cache.find("video") == cache.find("video") == "video#1"
+    assert (cache.hits, cache.misses, resolved) == (1, 1, ["video"])
+
+
+def test_a_stale_handle_is_located_again_and_the_action_retried_once(resolved):
+    cache = ElementCache.for_driver(FakeDriver())
+    cache.find("video")
+    seen = []
+
+    def pause(element):
+        seen.append(element)
+        if element == "video#1":
+            raise StaleElementReferenceException("stale element reference")
+        return "paused"
+
+    assert cache.use("video", pause) == "paused"
+    assert seen == ["video#1", "video#2"]
+    assert cache.find("video") == "video#2"
+
+
+def test_an_action_failing_twice_raises(resolved):
+    def always_stale(element):
+        raise StaleElementReferenceException("stale element reference")
+
+    with pytest.raises(StaleElementReferenceException):
+        ElementCache.for_driver(FakeDriver()).use("video", always_stale)
+    assert resolved == ["video", "video"]
+
+
+def test_handles_are_kept_per_frame_scope(resolved):
+    cache = ElementCache.for_driver(FakeDriver())
+
+    assert cache.find("video", scope="video_player") != cache.find("video")
+    cache.invalidate("video", scope="video_player")
+    assert cache.find("video") == "video#2"
+    assert cache.find("video", scope="video_player") == "video#3"
+
+
+def test_each_driver_has_its_own_cache_until_it_is_discarded(resolved):
+    driver = FakeDriver()
+    cache = ElementCache.for_driver(driver)
+
+    assert ElementCache.for_driver(driver) is cache
+    assert ElementCache.for_driver(FakeDriver()) is not cache
+    ElementCache.discard(driver)
+    assert ElementCache.for_driver(driver) is not cache
+
+
+def test_the_cache_does_not_keep_its_driver_alive(resolved):
+    driver = FakeDriver()
+    cache = ElementCache.for_driver(driver)
+    cache.find("video")
+    del driver
+    gc.collect()
+
+    assert cache.driver is None
+    assert cache not in element_cache._caches.values()
@@ -0,0 +1,92 @@
+# tests/test_har.py
+"""HAR 1.2 entries from DevTools Network.* events, and the recorder that writes them."""
+
+import json
+from utils import config
+from utils.har import HarRecorder, build_har
+
+
+def request(request_id, url, timestamp, wall_time, **extra):
+    params = {"requestId": request_id, "timestamp": timestamp, "wallTime": wall_time,
+              "request": {"method": "GET", "url": url, "headers": {"Accept": "*/*"}}}
+    params.update(extra)
+    return "Network.requestWillBeSent", params
+
+
+def response(request_id, status, **timing):
+    return "Network.responseReceived", {"requestId": request_id, "response": {
+        "status": status, "statusText": "OK", "protocol": "h2", "headers": {"Content-Type": "text/html"},
+        "mimeType": "text/html", "remoteIPAddress": "10.0.0.1", "timing": timing or None}}
+
+
+def test_completed_request():
+    har = build_har([
+        request("1", "https://fyc.example/login", 10.0, 1700000000.0),
+        response("1", 200, dnsStart=0, dnsEnd=5, connectStart=5, connectEnd=20, sslStart=10, sslEnd=20,
+                 sendStart=20, sendEnd=21, receiveHeadersEnd=80),
+        ("Network.loadingFinished", {"requestId": "1", "timestamp": 10.1, "encodedDataLength": 2048}),
+    ])
+
+    (entry,) = har["log"]["entries"]
+    assert har["log"]["version"] == "1.2"
+    assert entry["request"]["url"] == "https://fyc.example/login"
+    assert entry["request"]["headers"] == [{"name": "Accept", "value": "*/*"}]
+    assert entry["response"]["status"] == 200
+    assert entry["response"]["content"] == {"size": 2048, "mimeType": "text/html"}
+    assert entry["time"] == 100.0
+    assert entry["timings"]["dns"] == 5 and entry["timings"]["connect"] == 15 and entry["timings"]["wait"] == 59
+    assert entry["timings"]["receive"] == 100.0 - (5 + 15 + 10 + 1 + 59)
+    assert entry["startedDateTime"].startswith("2023-11-14T22:13:20")
+
+
+def test_redirect_closes_the_first_hop():
+    har = build_har([
+        request("1", "https://fyc.example/", 1.0, 1700000000.0),
+        request("1", "https://fyc.example/login", 1.2, 1700000000.2,
+                redirectResponse={"status": 302, "statusText": "Found", "headers": {}}),
+        ("Network.loadingFinished", {"requestId": "1", "timestamp": 1.5, "encodedDataLength": 10}),
+    ])
+
+    assert [(e["request"]["url"], e["response"]["status"]) for e in har["log"]["entries"]] == [
+        ("https://fyc.example/", 302), ("https://fyc.example/login", 0)]
+
+
+def test_failed_and_unfinished_requests_are_kept_in_start_order():
+    har = build_har([
+        request("2", "https://cdn.example/b.js", 2.0, 1700000002.0),
+        request("1", "https://cdn.example/a.js", 1.0, 1700000001.0),
+        ("Network.loadingFailed", {"requestId": "1", "timestamp": 1.3, "errorText": "net::ERR_FAILED"}),
+    ])
+
+    entries = har["log"]["entries"]
+    assert [e["request"]["url"] for e in entries] == ["https://cdn.example/a.js", "https://cdn.example/b.js"]
+    assert entries[0]["response"]["_error"] == "net::ERR_FAILED"
+    assert entries[1]["time"] == 0
+
+
+def test_recorder_writes_the_network_events_logged_since_start(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "WORKER_ID", "3")
+
+    def log(method, params):
+        return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+    class Driver:
+        logs = [
+            [log(*request("0", "https://fyc.example/before", 0.5, 1699999999.0))],
+            [log(*request("1", "https://fyc.example/login", 1.0, 1700000000.0)),
+             log("Page.frameNavigated", {}),
+             log("Network.loadingFinished", {"requestId": "1", "timestamp": 1.2, "encodedDataLength": 5})],
+        ]
+
+        def get_log(self, kind):
+            assert kind == "performance"
+            return self.logs.pop(0)
+
+    recorder = HarRecorder(Driver(), directory=str(tmp_path))
+    recorder.start()
+    path = recorder.write("Login: PIN accepted")
+
+    assert path == str(tmp_path / "Login_PIN_accepted_worker3.har")
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)["log"]["entries"]
+    assert [e["request"]["url"] for e in entries] == ["https://fyc.example/login"]
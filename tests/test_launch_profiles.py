@@ -0,0 +1,61 @@
+# tests/test_launch_profiles.py
+"""Launch profiles: which URL patterns the fast profile blocks, and how they reach the browser."""
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from utils import config, launch_profiles
+from utils.launch_profiles import blocked_url_patterns
+
+
+@pytest.fixture(autouse=True)
+def site(monkeypatch):
+    monkeypatch.setattr(config, "BASE_URL", "https://fyc.example.tv")
+    monkeypatch.setattr(config, "PLAYER_ORIGINS", ["https://player.example-cdn.net"])
+    monkeypatch.setattr(config, "BLOCKED_URLS", [])
+
+
+class FakeDriver:
+    def __init__(self):
+        self.commands = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append((command, params))
+
+
+def test_the_defaults_are_all_kept():
+    assert blocked_url_patterns() == launch_profiles.DEFAULT_BLOCKED_URLS
+
+
+def test_configured_patterns_replace_the_defaults(monkeypatch):
+    monkeypatch.setattr(config, "BLOCKED_URLS", ["*ads.example.com*"])
+
+    assert blocked_url_patterns() == ["*ads.example.com*"]
+
+
+@pytest.mark.parametrize("pattern", [
+    "*fyc.example.tv*",         # the app itself
+    "*example-cdn.net*",        # the configured player/media origin
+    "*player.example-cdn.net/media*",
+    "*.m3u8",                   # manifests and segments on any host
+    "*.m4s*",
+    "*",
+])
+def test_patterns_hitting_the_app_player_or_media_are_dropped(pattern):
+    assert blocked_url_patterns(["*hotjar.com*", pattern]) == ["*hotjar.com*"]
+
+
+def test_only_the_fast_profile_blocks_requests():
+    driver = FakeDriver()
+    assert launch_profiles.apply_request_blocking(driver, profile="faithful") == []
+    assert driver.commands == []
+
+    patterns = launch_profiles.apply_request_blocking(driver, profile="fast")
+
+    assert driver.commands == [("Network.enable", {}), ("Network.setBlockedURLs", {"urls": patterns})]
+
+
+def test_unknown_profiles_are_rejected():
+    with pytest.raises(ValueError, match="Unknown launch profile 'turbo'"):
+        launch_profiles.build_options("turbo")
@@ -0,0 +1,82 @@
+# tests/test_load_scheduler.py
+"""Arrival times of the load-mode ramp profiles, the concurrency cap and the run summary."""
+
+import asyncio
+import threading
+import time
+import pytest
+from benchmarks.load_scheduler import ViewerResult, arrival_times, run_viewers, summarize
+
+
+def test_constant_rate():
+    assert arrival_times(4, rate=2) == [0.0, 0.5, 1.0, 1.5]
+
+
+def test_linear_ramp_starts_slow_and_reaches_the_rate():
+    times = arrival_times(40, rate=4, ramp="linear", ramp_seconds=10)
+    gaps = [b - a for a, b in zip(times, times[1:])]
+
+    assert gaps[0] == pytest.approx(1 / 0.4)
+    assert all(later <= earlier + 1e-9 for earlier, later in zip(gaps, gaps[1:]))
+    assert gaps[-1] == pytest.approx(0.25)
+
+
+def test_step_ramp_holds_each_step():
+    times = arrival_times(12, rate=4, ramp="step", ramp_seconds=4, steps=2)
+    gaps = [round(b - a, 6) for a, b in zip(times, times[1:])]
+
+    assert gaps[0] == 0.5
+    assert set(gaps) == {0.5, 0.25}
+
+
+def test_unknown_ramp():
+    with pytest.raises(ValueError):
+        arrival_times(1, rate=1, ramp="spike")
+
+
+def test_no_more_than_max_concurrent_flows_run_at_once():
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def flow(result):
+        with lock:
+            running.append(result.viewer_id)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(result.viewer_id)
+        result.steps.append(("play", 0.02, True, None))
+
+    results = asyncio.run(run_viewers([0.0] * 6, flow, max_concurrent=2))
+
+    assert max(peak) == 2
+    assert [r.viewer_id for r in results] == list(range(6)) and all(r.ok for r in results)
+    assert max(r.queued_s for r in results) > 0
+
+
+def test_a_raising_flow_is_recorded_as_a_failed_viewer():
+    async def flow(result):
+        raise ConnectionError("login refused")
+
+    (result,) = asyncio.run(run_viewers([0.0], flow, max_concurrent=1))
+
+    assert not result.ok
+    assert result.steps == [("viewer", 0.0, False, "login refused")]
+
+
+def test_summary_percentiles_and_error_rates():
+    results = []
+    for i in range(10):
+        result = ViewerResult(i, arrival_s=0.0)
+        result.started_s = 0.5 if i == 9 else 0.0
+        result.steps = [("login", (i + 1) / 10, i != 9, None if i != 9 else "timeout")]
+        results.append(result)
+
+    report = summarize(results, wall_clock_s=30)
+
+    (login,) = report["steps"]
+    assert (login["count"], login["p50_ms"], login["p95_ms"], login["max_ms"]) == (10, 500.0, 1000.0, 1000.0)
+    assert login["error_rate"] == 0.1
+    assert (report["completed"], report["error_rate"], report["throughput_viewers_per_min"]) == (9, 0.1, 18.0)
+    assert report["queue_p95_s"] == 0.5
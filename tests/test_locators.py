@@ -0,0 +1,26 @@
+# tests/test_locators.py
+"""Locator registry: CSS equivalents are preferred where they exist."""
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from selenium.webdriver.common.by import By
+from pages.locators import LOCATORS, locator, rendition_locator
+
+
+def test_css_is_preferred_when_registered():
+    assert locator("details_section_link", prefer_css=True) == (By.CSS_SELECTOR, "a#detailsSection")
+    assert locator("details_section_link", prefer_css=False) == (By.XPATH, "//a[@id='detailsSection']")
+
+
+def test_locators_without_a_css_equivalent_stay_xpath():
+    assert locator("settings_button", prefer_css=True) == (By.XPATH, "(//div[@aria-label='Settings'])[2]")
+
+
+def test_every_locator_has_an_xpath():
+    assert all(xpath.startswith(("//", "(//")) for xpath, _ in LOCATORS.values())
+
+
+def test_rendition_buttons_are_matched_by_label():
+    assert rendition_locator("480p") == (By.XPATH, "//button[text()='480p']")
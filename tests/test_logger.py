@@ -0,0 +1,62 @@
+# tests/test_logger.py
+"""The log file is only opened by start_file_logging(), and records carry the thread's context."""
+
+import json
+import logging
+import threading
+import pytest
+from utils import config, logger as log
+
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(log, "LOG_DIR", str(tmp_path / "logs"))
+    monkeypatch.setattr(log, "LOG_FILENAME", str(tmp_path / "logs" / "automation_log.log"))
+    monkeypatch.setattr(log, "_file_handler", None)
+    monkeypatch.setattr(config, "LOG_FORMAT", "json")
+    yield tmp_path / "logs"
+    handler = log._file_handler
+    if handler is None:
+        return
+    if log._listener is not None:
+        log._listener.stop()
+        log._listener.handlers = tuple(h for h in log._listener.handlers if h is not handler)
+        log._listener.start()
+    logging.getLogger(log.ROOT_LOGGER_NAME).removeHandler(handler)
+    handler.close()
+
+
+def records(path):
+    for handler in logging.getLogger(log.ROOT_LOGGER_NAME).handlers:
+        handler.flush()
+    if log._listener is not None:
+        # Stopping drains the queue; restart for the next records
+        log._listener.stop()
+        log._listener.start()
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_importing_and_logging_does_not_touch_the_log_directory(log_dir):
+    log.get_logger("tests").info("console only")
+
+    assert not log_dir.exists()
+
+
+def test_start_file_logging_writes_json_lines_with_the_thread_context(log_dir):
+    path = log.start_file_logging()
+    assert log.start_file_logging() == path  # a second call adds no second handler
+
+    logger = log.get_logger("tests")
+    log.set_log_context("Play a title", "I press play")
+    logger.info("in the step")
+    other = threading.Thread(target=lambda: logger.info("on another thread"))
+    other.start()
+    other.join()
+    log.set_log_context()
+
+    lines = [r for r in records(log_dir / "automation_log.log") if r["logger"] == "FYC_Automation_Logger.tests"]
+    assert [(r["message"], r["scenario"], r["step"]) for r in lines] == [
+        ("in the step", "Play a title", "I press play"),
+        ("on another thread", None, None),
+    ]
+    assert (log_dir / "automation_log_latest.log").exists()
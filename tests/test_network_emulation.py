@@ -0,0 +1,63 @@
+# tests/test_network_emulation.py
+"""Offline blip schedule of the flaky profile, driven from the step thread."""
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from utils import network_emulation, wait_budget
+from utils.network_emulation import NetworkEmulation
+
+
+class FakeDriver:
+    def __init__(self):
+        self.offline = []
+
+    def execute_cdp_cmd(self, command, params):
+        if command == "Network.emulateNetworkConditions":
+            self.offline.append(params["offline"])
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(network_emulation.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_blips_follow_the_schedule(clock):
+    emulation = NetworkEmulation(FakeDriver(), "flaky")
+    emulation.start()
+    for offset in (5, 19.9, 20.1, 21, 22.05, 30, 40.3, 42.5):
+        clock[0] = 1000.0 + offset
+        wait_budget.tick()
+    emulation.stop()
+
+    assert emulation.driver.offline == [False, True, False, True, False, False]
+    assert [(b["offline_at_s"], b["online_at_s"]) for b in emulation.blips] == [(20.1, 22.05), (40.3, 42.5)]
+    assert emulation.summary()["max_late_s"] == pytest.approx(0.3)
+    assert emulation.missed == 0
+
+
+def test_tick_reports_when_the_next_switch_is_due(clock):
+    emulation = NetworkEmulation(FakeDriver(), "flaky")
+    emulation.start()
+    clock[0] = 1015.0
+    assert wait_budget.tick() == pytest.approx(5)
+    clock[0] = 1020.5
+    assert wait_budget.tick() == pytest.approx(1.5)
+    emulation.stop()
+
+    assert wait_budget.tick() is None
+
+
+def test_windows_without_a_tick_are_counted_as_missed(clock):
+    emulation = NetworkEmulation(FakeDriver(), "flaky")
+    emulation.start()
+    clock[0] = 1000.0 + 61  # blocked through the windows at 20 s and 40 s, inside the one at 60 s
+    wait_budget.tick()
+    clock[0] = 1000.0 + 75
+    emulation.stop()
+
+    assert len(emulation.blips) == 1 and emulation.blips[0]["window"] == 3
+    assert emulation.missed == 2
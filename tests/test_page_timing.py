@@ -0,0 +1,90 @@
+# tests/test_page_timing.py
+"""Page-load timing: rounding of the collected entries, budget checks, the JSONL record and the benchmark medians."""
+
+import pytest
+
+pytest.importorskip("allure")
+
+from utils import config, page_timing
+
+BUDGETS = {"ttfb_ms": 800, "dom_content_loaded_ms": 2500, "load_ms": 4000, "lcp_ms": 2500}
+
+
+class FakeDriver:
+    def __init__(self, result):
+        self.result = result
+        self.args = None
+
+    def execute_async_script(self, script, *args):
+        assert script == page_timing.COLLECT_SCRIPT
+        self.args = args
+        return self.result
+
+
+def timing(**overrides):
+    return {"ttfb_ms": 120.0, "dom_content_loaded_ms": 900.0, "load_ms": 1500.0, "lcp_ms": 1100.0, **overrides}
+
+
+def test_collect_rounds_the_navigation_and_resource_times():
+    driver = FakeDriver({
+        "ttfb_ms": 123.456, "dom_content_loaded_ms": 900.04, "load_ms": None, "lcp_ms": 1100.26,
+        "slowest_resources": [{"name": "app.js", "duration_ms": 340.55, "ttfb_ms": None}],
+    })
+
+    metrics = page_timing.collect(driver, top=3)
+
+    assert driver.args == (3,)
+    assert (metrics["ttfb_ms"], metrics["dom_content_loaded_ms"], metrics["load_ms"], metrics["lcp_ms"]) == (
+        123.5, 900.0, None, 1100.3)
+    assert metrics["slowest_resources"][0]["duration_ms"] == 340.6
+
+
+def test_collect_tolerates_an_empty_result():
+    assert page_timing.collect(FakeDriver(None), top=5) == {}
+
+
+def test_metrics_within_budget_pass():
+    assert page_timing.evaluate(timing(), BUDGETS) == []
+
+
+@pytest.mark.parametrize("overrides, violation", [
+    ({"ttfb_ms": 950.0}, "ttfb_ms 950.0 > 800"),
+    ({"dom_content_loaded_ms": 2600.0}, "dom_content_loaded_ms 2600.0 > 2500"),
+    ({"load_ms": 4200.0}, "load_ms 4200.0 > 4000"),
+    ({"lcp_ms": 3000.0}, "lcp_ms 3000.0 > 2500"),
+])
+def test_each_budget_is_checked(overrides, violation):
+    assert page_timing.evaluate(timing(**overrides), BUDGETS) == [violation]
+
+
+def test_disabled_budgets_and_pending_values_are_skipped():
+    budgets = dict(BUDGETS, lcp_ms=0)
+
+    assert page_timing.evaluate(timing(lcp_ms=9000.0, load_ms=None), budgets) == []
+
+
+def test_record_appends_one_line_per_page(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "WORKER_ID", "1")
+    monkeypatch.setattr(config, "PAGE_BUDGET_TTFB_MS", 100)
+
+    page_timing.record("login", timing(), directory=str(tmp_path))
+    page_timing.record("catalog", timing(ttfb_ms=80.0), directory=str(tmp_path))
+
+    assert (tmp_path / "page_timing_worker1.jsonl").exists()
+    records = page_timing.load_records(str(tmp_path))
+    assert [(r["page"], r["violations"]) for r in records] == [("login", ["ttfb_ms 120.0 > 100"]), ("catalog", [])]
+    assert records[0]["budgets"]["ttfb_ms"] == 100
+    assert page_timing.load_records(str(tmp_path / "missing")) == []
+
+
+def test_benchmark_tracks_the_median_of_each_page_metric():
+    run_benchmark = pytest.importorskip("benchmarks.run_benchmark")
+    iterations = [
+        (10.0, 0, [], [{"page": "login", "metrics": timing(ttfb_ms=ms)}]) for ms in (100.0, 300.0, 200.0)
+    ]
+
+    result = run_benchmark.aggregate(iterations)
+
+    assert result["pages_p50_ms"]["login:ttfb_ms"] == 200.0
+    assert run_benchmark.compare(result, {"wall_clock_s": 10.0, "pages_p50_ms": {"login:ttfb_ms": 150.0}}, 0.1) == [
+        "login:ttfb_ms p50 150.0ms -> 200.0ms"]
@@ -0,0 +1,106 @@
+# tests/test_profile_templates.py
+"""Warmed profile templates: built once, cloned per session, rebuilt when stale, cleaned up after."""
+
+import os
+import time
+import pytest
+from utils import config
+from utils.profile_templates import TRANSIENT_FILES, ProfileTemplates, template_key
+
+
+class Builder:
+    """Stands in for the Chrome warm-up: writes a cookie file and a lock Chrome would leave behind."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = 0
+
+    def __call__(self, profile_dir):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("Chrome did not start")
+        with open(os.path.join(profile_dir, "Cookies"), "w", encoding="utf-8") as f:
+            f.write(f"consent accepted {self.calls}")
+        with open(os.path.join(profile_dir, TRANSIENT_FILES[0]), "w", encoding="utf-8") as f:
+            f.write("lock")
+
+
+@pytest.fixture
+def templates(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "WORKER_ID", "0")
+    return ProfileTemplates(root=str(tmp_path), key="k", enabled=True, max_age_hours=1)
+
+
+def read(path, name="Cookies"):
+    with open(os.path.join(path, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def test_the_template_is_built_once_and_cloned_per_session(templates):
+    builder = Builder()
+
+    first, second = templates.clone(builder), templates.clone(builder)
+
+    assert builder.calls == 1
+    assert first != second
+    assert read(first) == read(second) == "consent accepted 1"
+    assert not os.path.exists(os.path.join(templates.template_dir, TRANSIENT_FILES[0]))
+
+
+def test_clones_are_independent_of_the_template(templates):
+    clone = templates.clone(Builder())
+    with open(os.path.join(clone, "Cookies"), "w", encoding="utf-8") as f:
+        f.write("session cookie")
+
+    assert read(templates.template_dir) == "consent accepted 1"
+
+
+def test_a_stale_template_is_rebuilt(templates):
+    builder = Builder()
+    templates.clone(builder)
+    stamp = time.time() - 2 * 3600
+    os.utime(templates.template_dir, (stamp, stamp))
+
+    assert read(templates.clone(builder)) == "consent accepted 2"
+    assert os.listdir(os.path.dirname(templates.template_dir)) == ["k"]
+
+
+def test_a_failed_build_falls_back_to_empty_profiles_without_retrying(templates):
+    builder = Builder(fail=True)
+
+    first, second = templates.clone(builder), templates.clone(builder)
+
+    assert builder.calls == 1
+    assert os.listdir(first) == [] and os.listdir(second) == []
+
+
+def test_disabled_templates_give_empty_profiles(tmp_path):
+    builder = Builder()
+
+    profile = ProfileTemplates(root=str(tmp_path), key="k", enabled=False).clone(builder)
+
+    assert builder.calls == 0 and os.listdir(profile) == []
+
+
+def test_only_template_clones_are_warm_and_discard_removes_the_clone(templates):
+    warm, empty = templates.clone(Builder()), ProfileTemplates(root=templates.root, key="k", enabled=False).clone()
+    templates.register("driver A", warm)
+    templates.register("driver B", empty)
+
+    assert templates.is_warm("driver A") and not templates.is_warm("driver B")
+    templates.discard("driver A")
+    assert not os.path.exists(warm) and not templates.is_warm("driver A")
+
+
+def test_prune_removes_clones_left_by_crashed_runs(templates):
+    old, recent = templates.clone(), templates.clone()
+    stamp = time.time() - 24 * 3600
+    os.utime(old, (stamp, stamp))
+
+    assert templates.prune(max_age_hours=12) == 1
+    assert not os.path.exists(old) and os.path.exists(recent)
+
+
+def test_the_key_changes_with_site_profile_and_chrome_version():
+    assert template_key("https://fyc", "fast", "129") == template_key("https://fyc", "fast", "129")
+    assert template_key("https://fyc", "fast", "129") != template_key("https://fyc", "fast", "130")
@@ -0,0 +1,133 @@
+# tests/test_protocol_client.py
+"""The HTTP-level viewer against the stand-in site: login, cookies, redirects and pooled connections."""
+
+import asyncio
+import pytest
+from stand_in.server import StandInSettings, start_server
+from utils.protocol_client import (
+    MAX_REDIRECTS, ConnectionPool, HttpResponse, ProtocolError, ProtocolSession, ProtocolViewer, _read_response,
+)
+
+PIN = "WVMVHWBS"
+TITLE = "Test Automation Project"
+
+
+@pytest.fixture
+def base_url():
+    server, base_url = start_server(settings=StandInSettings(pin=PIN))
+    yield base_url
+    server.shutdown()
+    server.server_close()
+
+
+def run(scenario, base_url, max_connections=4):
+    """Run scenario(pool) on a fresh pool and event loop, closing the pool afterwards."""
+    async def main():
+        pool = ConnectionPool(base_url, max_connections=max_connections, timeout=5)
+        try:
+            return await scenario(pool)
+        finally:
+            await pool.close()
+    return asyncio.run(main())
+
+
+def test_login_stores_the_session_cookie_and_loads_the_catalog(base_url):
+    async def scenario(pool):
+        session = ProtocolSession(pool)
+        await session.launch()
+        titles = await session.login(PIN)
+        return session.cookies, titles, await session.open_title(TITLE), pool.opened
+
+    cookies, titles, opened_title, connections = run(scenario, base_url)
+
+    assert list(cookies) == ["fyc_session"]
+    assert [t["slug"] for t in titles] == ["test-automation-project"]
+    assert opened_title is True
+    assert connections == 1  # every request reused the keep-alive connection
+
+
+def test_a_wrong_pin_is_refused(base_url):
+    async def scenario(pool):
+        await ProtocolSession(pool).login("WRONGPIN")
+
+    with pytest.raises(ProtocolError, match="Login with PIN failed: 401"):
+        run(scenario, base_url)
+
+
+def test_redirects_are_followed_without_a_session(base_url):
+    async def scenario(pool):
+        return await ProtocolSession(pool).request("GET", "/titles")
+
+    response = run(scenario, base_url)
+
+    assert response.status == 200 and response.url == f"{base_url}/login"
+
+
+def test_logout_clears_the_cookie_and_the_session_is_sent_back_to_login(base_url):
+    async def scenario(pool):
+        session = ProtocolSession(pool)
+        await session.login(PIN)
+        await session.logout()
+        assert session.cookies == {}
+        await session.open_title(TITLE)
+
+    with pytest.raises(ProtocolError, match="sent the session back to the login page"):
+        run(scenario, base_url)
+
+
+def test_sessions_sharing_a_pool_keep_their_own_cookies(base_url):
+    async def scenario(pool):
+        signed_in, anonymous = ProtocolSession(pool), ProtocolSession(pool)
+        await signed_in.login(PIN)
+        mine = (await signed_in.request("GET", "/api/session")).json()
+        theirs = (await anonymous.request("GET", "/api/session")).json()
+        return mine, theirs
+
+    assert run(scenario, base_url) == ({"authenticated": True}, {"authenticated": False})
+
+
+def test_titles_missing_from_the_catalog_are_reported(base_url):
+    async def scenario(pool):
+        session = ProtocolSession(pool)
+        await session.login(PIN)
+        await session.open_title("Unknown Title")
+
+    with pytest.raises(ProtocolError, match="'Unknown Title' is not in the catalog"):
+        run(scenario, base_url)
+
+
+def test_the_sync_viewer_runs_the_whole_flow(base_url):
+    viewer = ProtocolViewer(base_url)
+    try:
+        assert viewer.launch() and viewer.login(PIN) and viewer.open_title(TITLE) and viewer.logout()
+    finally:
+        viewer.close()
+
+
+def test_redirect_loops_are_cut_off():
+    class LoopingPool:
+        base_url = "http://fyc.test"
+        requests = 0
+
+        async def request(self, method, path, headers=None, body=b""):
+            self.requests += 1
+            return HttpResponse(302, "Found", {"location": ["/again"]}, b"", self.base_url + path)
+
+    pool = LoopingPool()
+
+    with pytest.raises(ProtocolError, match="Too many redirects"):
+        asyncio.run(ProtocolSession(pool).request("GET", "/"))
+    assert pool.requests == MAX_REDIRECTS + 1
+
+
+def test_chunked_bodies_are_reassembled():
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                         b"5\r\nhello\r\n6\r\n world\r\n0\r\n\r\n")
+        return await _read_response(reader, "GET")
+
+    status, _, headers, body, keep_alive = asyncio.run(read())
+
+    assert (status, body, keep_alive) == (200, b"hello world", True)
+    assert headers["transfer-encoding"] == ["chunked"]
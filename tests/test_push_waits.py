@@ -0,0 +1,103 @@
+# tests/test_push_waits.py
+"""Push-based waits: one observer call per wait, chunked by the ticker, polling fallback."""
+
+import pytest
+
+pytest.importorskip("selenium")
+pytest.importorskip("allure")
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from pages import base_page
+from pages.base_page import BasePage
+from utils import config, wait_budget
+from utils.wait_budget import step_budget
+
+VIDEO = ("css selector", "video")
+
+
+class FakeDriver:
+    """
+    Answers OBSERVE_SCRIPT with the given results in turn, the last one repeating;
+    find_element serves the polling fallback.
+    """
+
+    def __init__(self, *results, found="polled video"):
+        self.results = list(results)
+        self.found = found
+        self.observed = []
+        self.finds = 0
+
+    def execute_async_script(self, script, *args):
+        assert script == base_page.OBSERVE_SCRIPT
+        self.observed.append(args)
+        result = self.results.pop(0) if len(self.results) > 1 else self.results[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def find_element(self, by, value):
+        self.finds += 1
+        return self.found
+
+
+@pytest.fixture(autouse=True)
+def push_waits(monkeypatch):
+    monkeypatch.setattr(config, "PUSH_WAITS", True)
+    monkeypatch.setattr(config, "POLL_MIN", 0.01)
+    yield
+    wait_budget.set_ticker(None)
+
+
+def test_an_observed_element_is_returned_from_one_call():
+    driver = FakeDriver({"status": "ok", "element": "video"})
+
+    assert BasePage(driver).wait_for_element(VIDEO, "visible", timeout=5) == "video"
+    [(by, value, condition, timeout_ms)] = driver.observed
+    assert (by, value, condition) == ("css selector", "video", "visible")
+    assert timeout_ms == pytest.approx(5000, abs=5)
+    assert driver.finds == 0
+
+
+def test_an_observer_timeout_raises():
+    driver = FakeDriver({"status": "timeout"})
+
+    with pytest.raises(TimeoutException, match="not clickable within 0.1s"):
+        BasePage(driver).wait_for_element(VIDEO, "clickable", timeout=0.1)
+
+
+@pytest.mark.parametrize("result", [{"status": "cross-origin"}, JavascriptException("CSP blocked eval")])
+def test_frames_that_cannot_be_observed_fall_back_to_polling(result):
+    driver = FakeDriver(result)
+
+    assert BasePage(driver).wait_for_element(VIDEO, "present", timeout=1) == "polled video"
+    assert driver.finds == 1
+
+
+def test_the_observer_returns_by_the_next_tick():
+    ticks = []
+    wait_budget.set_ticker(lambda: ticks.append(1) or 0.5)
+    driver = FakeDriver({"status": "timeout"}, {"status": "ok", "element": "video"})
+
+    assert BasePage(driver).wait_for_element(VIDEO, "present", timeout=10) == "video"
+    assert [args[3] for args in driver.observed] == [500, 500]
+    assert len(ticks) == 2
+
+
+def test_observer_waits_are_clamped_and_recorded_in_the_step_budget():
+    driver = FakeDriver({"status": "ok", "element": "video"})
+
+    with step_budget(2, "I press play") as budget:
+        BasePage(driver).wait_for_element(VIDEO, "present", timeout=20)
+
+    assert driver.observed[0][3] <= 2000
+    wait = budget.report()["waits"][0]
+    assert (wait["wait"], wait["requested_s"], wait["outcome"]) == ("observe:present:video", 20, "ok")
+
+
+def test_document_ready_uses_the_observer():
+    driver = FakeDriver({"status": "ok", "element": "html"})
+
+    assert BasePage(driver).wait_for_document_ready(timeout=3)
+    [(by, value, condition, timeout_ms)] = driver.observed
+    assert (by, value, condition) == (None, None, "ready")
+    assert timeout_ms == pytest.approx(3000, abs=5)
@@ -0,0 +1,104 @@
+# tests/test_run_tests.py
+"""Scenario discovery, the --workers fan-out and the --network-profiles options of run_tests.py, without behave."""
+
+import pytest
+import run_tests
+from utils.scenario_history import ScenarioHistory
+
+FEATURE = """\
+@playback
+Feature: Playback
+
+  @smoke
+  Scenario: Play a title
+    Given I open the site
+
+  # a comment between tags and scenarios
+  Scenario Outline: Switch renditions
+    Given I switch to <rendition>
+
+    Examples:
+      | rendition |
+      | 720p      |
+"""
+
+
+@pytest.fixture
+def features_dir(tmp_path):
+    (tmp_path / "playback.feature").write_text(FEATURE, encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("Scenario: not a feature file", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_tests, "RESULTS_DIR", str(tmp_path / "allure-results"))
+    monkeypatch.setattr(run_tests, "WORKERS_DIR", str(tmp_path / "workers"))
+    return tmp_path
+
+
+def test_discover_scenarios_reads_locations_keys_and_tags(features_dir):
+    scenarios = run_tests.discover_scenarios(str(features_dir))
+    path = str(features_dir / "playback.feature")
+
+    assert [(s["location"], s["key"]) for s in scenarios] == [
+        (f"{path}:5", "Playback: Play a title"),
+        (f"{path}:9", "Playback: Switch renditions"),
+    ]
+    assert scenarios[0]["tags"] == {"playback", "smoke"}
+    assert scenarios[1]["tags"] == {"playback"}
+
+
+def test_behave_command_adds_tags_and_locations():
+    cmd = run_tests.behave_command("results", tags="@smoke", locations=["a.feature:3"])
+
+    assert cmd[1:3] == ["-m", "behave"]
+    assert cmd[cmd.index("-o") + 1] == "results"
+    assert cmd[-3:] == ["--tags", "@smoke", "a.feature:3"]
+
+
+def test_run_parallel_gives_each_shard_a_worker_and_returns_the_worst_exit_code(dirs, monkeypatch):
+    calls = []
+
+    def run_worker(worker_id, locations, tags=None):
+        calls.append((worker_id, sorted(locations), tags))
+        return worker_id  # worker 1 "fails"
+
+    monkeypatch.setattr(run_tests, "run_worker", run_worker)
+    scenarios = [{"location": f"f.feature:{i}", "key": f"s{i}", "tags": set()} for i in range(4)]
+    history = ScenarioHistory(path=str(dirs / "history.json"))
+
+    assert run_tests.run_parallel(2, scenarios, history, tags="@smoke") == 1
+    assert sorted(worker for worker, _, _ in calls) == [0, 1]
+    assert sorted(loc for _, locations, _ in calls for loc in locations) == [s["location"] for s in scenarios]
+    assert {tags for _, _, tags in calls} == {"@smoke"}
+
+
+def test_run_parallel_without_scenarios_fails(dirs):
+    assert run_tests.run_parallel(3, [], ScenarioHistory(path=str(dirs / "history.json"))) == 1
+
+
+def test_network_profiles_cannot_be_combined_with_workers(capsys):
+    with pytest.raises(SystemExit):
+        run_tests.parse_args(["--network-profiles", "4g", "--workers", "2"])
+
+    assert "drop --workers" in capsys.readouterr().err
+
+
+def test_network_profiles_run_the_fast_selection(dirs, monkeypatch):
+    scenarios = [
+        {"location": "f.feature:3", "key": "Playback: Play a title", "tags": {"smoke"}},
+        {"location": "f.feature:9", "key": "Playback: Switch renditions", "tags": set()},
+    ]
+    calls = []
+    monkeypatch.setattr(run_tests, "ScenarioHistory", lambda: ScenarioHistory(path=str(dirs / "history.json")))
+    monkeypatch.setattr(run_tests, "start_file_logging", lambda: None)
+    monkeypatch.setattr(run_tests, "discover_scenarios", lambda: scenarios)
+    monkeypatch.setattr(run_tests, "generate_report", lambda results, report: 0)
+    monkeypatch.setattr(run_tests, "run_network_matrix",
+                        lambda profiles, tags=None, locations=None: calls.append((profiles, locations)) or 0)
+
+    assert run_tests.main(["--network-profiles", "none,4g", "--fast"]) == 0
+    assert run_tests.main(["--network-profiles", "4g"]) == 0
+
+    assert calls == [(["none", "4g"], ["f.feature:3"]), (["4g"], None)]
@@ -0,0 +1,101 @@
+# tests/test_scenario_history.py
+"""Failure-first ordering, longest-first packing and history recording."""
+
+import json
+from utils.scenario_history import ScenarioHistory, fast, order, pack, scenario_key
+
+
+def scenario(key, tags=()):
+    return {"location": f"features/x.feature:{key}", "key": key, "tags": list(tags)}
+
+
+def history_with(tmp_path, runs):
+    """runs: {key: [(status, duration_s, at), ...]}"""
+    history = ScenarioHistory(path=str(tmp_path / "history.json"), failure_window=3)
+    history.scenarios = {
+        key: [{"uuid": f"{key}-{i}", "status": status, "duration_s": duration, "at": at}
+              for i, (status, duration, at) in enumerate(entries)]
+        for key, entries in runs.items()
+    }
+    return history
+
+
+def write_result(results_dir, uuid, feature, name, status, start, stop):
+    result = {"uuid": uuid, "name": name, "status": status, "start": start, "stop": stop,
+              "labels": [{"name": "feature", "value": feature}]}
+    (results_dir / f"{uuid}-result.json").write_text(json.dumps(result), encoding="utf-8")
+
+
+def test_outline_rows_share_the_scenario_key():
+    assert scenario_key("Playback", "Switch renditions -- @1.2 hd") == "Playback: Switch renditions"
+    assert scenario_key("Playback", "Switch renditions") == "Playback: Switch renditions"
+
+
+def test_recent_failures_come_first_latest_first_then_longest(tmp_path):
+    history = history_with(tmp_path, {
+        "short": [("passed", 5, 1)],
+        "long": [("passed", 50, 1)],
+        "old failure": [("failed", 1, 100)],
+        "new failure": [("broken", 1, 200)],
+    })
+    scenarios = [scenario(k) for k in ("short", "long", "old failure", "new failure")]
+
+    assert [s["key"] for s in order(scenarios, history)] == ["new failure", "old failure", "long", "short"]
+
+
+def test_failures_outside_the_window_do_not_count(tmp_path):
+    history = history_with(tmp_path, {
+        "recovered": [("failed", 1, 1), ("passed", 1, 2), ("passed", 1, 3), ("passed", 1, 4)],
+    })
+
+    assert history.last_failure("recovered") is None
+
+
+def test_pack_balances_longest_first(tmp_path):
+    durations = {"a": 40, "b": 30, "c": 20, "d": 20, "e": 10}
+    history = history_with(tmp_path, {key: [("passed", d, 1)] for key, d in durations.items()})
+    shards = pack([scenario(k) for k in durations], workers=2, history=history)
+
+    loads = [sum(durations[location.rsplit(":", 1)[1]] for location in shard) for shard in shards]
+    assert sorted(loads) == [60, 60]
+
+
+def test_pack_spreads_recent_failures_over_the_workers(tmp_path):
+    history = history_with(tmp_path, {
+        "f1": [("failed", 1, 10)], "f2": [("failed", 1, 20)],
+        "long": [("passed", 100, 1)], "short": [("passed", 1, 1)],
+    })
+    shards = pack([scenario(k) for k in ("long", "short", "f1", "f2")], workers=2, history=history)
+
+    assert [shard[0].rsplit(":", 1)[1] for shard in shards] == ["f2", "f1"]
+
+
+def test_unknown_scenarios_are_estimated_at_the_median(tmp_path):
+    history = history_with(tmp_path, {"a": [("passed", 10, 1)], "b": [("passed", 30, 1)]})
+
+    assert history.estimates([scenario("a"), scenario("b"), scenario("new")])["new"] == 20
+
+
+def test_fast_selects_smoke_and_recent_failures(tmp_path):
+    history = history_with(tmp_path, {"failing": [("failed", 1, 1)], "passing": [("passed", 1, 1)]})
+    scenarios = [scenario("smoke", tags=["smoke"]), scenario("failing"), scenario("passing")]
+
+    assert [s["key"] for s in fast(scenarios, history)] == ["smoke", "failing"]
+
+
+def test_record_results_folds_outlines_skips_and_duplicates(tmp_path):
+    results = tmp_path / "results"
+    results.mkdir()
+    write_result(results, "u1", "Playback", "Switch -- @1.1 sd", "passed", 0, 4000)
+    write_result(results, "u2", "Playback", "Switch -- @1.2 hd", "failed", 5000, 7000)
+    write_result(results, "u3", "Playback", "Skipped one", "skipped", 0, 0)
+    history = ScenarioHistory(path=str(tmp_path / "history.json"))
+
+    assert history.record_results(str(results)) == 2
+    assert history.record_results(str(results)) == 0
+    runs = history.scenarios["Playback: Switch"]
+    assert [(run["status"], run["duration_s"]) for run in runs] == [("passed", 4.0), ("failed", 2.0)]
+    assert "Playback: Skipped one" not in history.scenarios
+
+    history.save()
+    assert ScenarioHistory(path=str(tmp_path / "history.json")).scenarios == history.scenarios
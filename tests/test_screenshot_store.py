@@ -0,0 +1,103 @@
+# tests/test_screenshot_store.py
+"""Content-addressed screenshot store: dedupe, manifests, retention and object GC."""
+
+import json
+import os
+import time
+import pytest
+from utils.screenshot_store import ScreenshotStore
+
+DAY = 86400
+
+
+def age(path, seconds):
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def objects(root):
+    return sorted(name for _, _, names in os.walk(root / "objects") for name in names)
+
+
+def old_run(root, run_id, frames, age_days):
+    """A finished run of `frames` ({name: bytes}) last touched `age_days` ago, objects included."""
+    store = ScreenshotStore(root=str(root), run_id=run_id)
+    for name, data in frames.items():
+        store.put(name, data, "jpg")
+    for dirpath, _, names in os.walk(root / "objects"):
+        for name in names:
+            age(os.path.join(dirpath, name), 2 * 60)
+    age(store.run_dir, age_days * DAY)
+    return store
+
+
+def test_identical_frames_are_stored_once_and_listed_in_order(tmp_path):
+    store = ScreenshotStore(root=str(tmp_path), run_id="run1")
+    store.put("login", b"frame A", "jpg")
+    store.put("catalog", b"frame B", "jpg")
+    store.put("details", b"frame A", "jpg")
+
+    manifest = json.loads((tmp_path / "runs" / "run1" / "manifest.json").read_text(encoding="utf-8"))
+    assert [(e["seq"], e["name"], e["file"]) for e in manifest["screenshots"]] == [
+        (1, "login", "0001_login.jpg"), (2, "catalog", "0002_catalog.jpg"), (3, "details", "0003_details.jpg"),
+    ]
+    assert manifest["screenshots"][0]["sha256"] == manifest["screenshots"][2]["sha256"]
+    assert len(objects(tmp_path)) == 2
+
+
+def test_prune_removes_old_runs_and_their_unreferenced_objects(tmp_path):
+    old_run(tmp_path, "old", {"login": b"old frame", "shared": b"shared frame"}, age_days=10)
+    old_run(tmp_path, "recent", {"shared": b"shared frame"}, age_days=1)
+
+    ScreenshotStore(root=str(tmp_path), run_id="current").prune(max_age_days=7, max_runs=0, max_bytes=0)
+
+    assert sorted(os.listdir(tmp_path / "runs")) == ["recent"]
+    assert len(objects(tmp_path)) == 1  # the shared frame, still referenced by 'recent'
+
+
+def test_prune_keeps_the_newest_runs(tmp_path):
+    for i, days in enumerate((3, 2, 1)):
+        old_run(tmp_path, f"run{i}", {"frame": f"frame {i}".encode()}, age_days=days)
+
+    ScreenshotStore(root=str(tmp_path), run_id="current").prune(max_age_days=0, max_runs=2, max_bytes=0)
+
+    assert sorted(os.listdir(tmp_path / "runs")) == ["run2"]
+
+
+def test_prune_drops_oldest_runs_while_over_the_size_limit(tmp_path):
+    old_run(tmp_path, "older", {"frame": b"x" * 1000}, age_days=2)
+    old_run(tmp_path, "newer", {"frame": b"y" * 1000}, age_days=1)
+
+    total = ScreenshotStore(root=str(tmp_path), run_id="current").prune(max_age_days=0, max_runs=0, max_bytes=1500)
+
+    assert sorted(os.listdir(tmp_path / "runs")) == ["newer"]
+    assert total == 1000
+
+
+def test_the_current_run_and_fresh_objects_survive(tmp_path):
+    store = ScreenshotStore(root=str(tmp_path), run_id="current")
+    store.put("login", b"frame", "jpg")
+    age(store.run_dir, 30 * DAY)
+    # Written by another worker that has not recorded it in a manifest yet
+    store.put("other", b"unlisted frame", "jpg")
+    os.remove(os.path.join(store.run_dir, "0002_other.jpg"))
+
+    store.prune(max_age_days=7, max_runs=1, max_bytes=0)
+
+    assert os.listdir(tmp_path / "runs") == ["current"]
+    assert len(objects(tmp_path)) == 2
+
+
+def test_loose_files_outside_the_store_are_never_deleted(tmp_path):
+    loose = tmp_path / "details_tab_1760735675.png"
+    loose.write_bytes(b"tracked screenshot")
+    age(loose, 365 * DAY)
+
+    ScreenshotStore(root=str(tmp_path), run_id="current").prune(max_age_days=7, max_runs=1, max_bytes=1)
+
+    assert loose.read_bytes() == b"tracked screenshot"
+
+
+@pytest.mark.parametrize("limits", [{"max_age_days": 7}, {"max_runs": 1}, {"max_bytes": 1}])
+def test_prune_on_an_empty_directory_is_a_no_op(tmp_path, limits):
+    assert ScreenshotStore(root=str(tmp_path / "missing"), run_id="current").prune(**limits) == 0
@@ -0,0 +1,110 @@
+# tests/test_screenshots.py
+"""Screenshot modes, DevTools capture with PNG fallback and the background writer."""
+
+import base64
+import types
+import pytest
+
+pytest.importorskip("allure")
+
+from utils import screenshots
+from utils.screenshots import ScreenshotService
+
+
+class FakeStore:
+    def __init__(self):
+        self.frames = []
+        self.closed = False
+
+    def put(self, name, data, extension):
+        self.frames.append((name, data, extension))
+
+    def close(self):
+        self.closed = True
+
+
+class FakeDriver:
+    def __init__(self, devtools=True):
+        self.devtools = devtools
+        self.params = None
+
+    def execute_cdp_cmd(self, command, params):
+        if not self.devtools:
+            raise RuntimeError("no DevTools")
+        self.params = params
+        return {"data": base64.b64encode(b"jpeg frame").decode()}
+
+    def get_screenshot_as_png(self):
+        return b"png frame"
+
+
+def step(name="I open the Details tab", status="passed"):
+    return types.SimpleNamespace(name=name, status=status)
+
+
+@pytest.fixture
+def service():
+    created = []
+
+    def make(**kwargs):
+        kwargs.setdefault("store", FakeStore())
+        kwargs.setdefault("image_format", "jpeg")
+        created.append(ScreenshotService(**kwargs))
+        return created[-1]
+
+    yield make
+    for s in created:
+        if s._writer.is_alive():
+            s.close()
+
+
+def test_unknown_modes_are_rejected():
+    with pytest.raises(ValueError, match="Unknown screenshot mode"):
+        ScreenshotService(mode="never", store=FakeStore())
+
+
+def test_on_failure_mode_captures_failed_steps_only(service):
+    s = service(mode="on-failure")
+
+    assert s.capture_step(FakeDriver(), step()) is None
+    assert s.capture_step(FakeDriver(), step(status="failed")) == b"jpeg frame"
+
+
+def test_sampled_mode_follows_the_sample_rate(service, monkeypatch):
+    s = service(mode="sampled", sample_rate=0.25)
+    monkeypatch.setattr(screenshots.random, "random", lambda: 0.2)
+    assert s.should_capture(failed=False)
+    monkeypatch.setattr(screenshots.random, "random", lambda: 0.3)
+    assert not s.should_capture(failed=False)
+    assert s.should_capture(failed=True)
+
+
+def test_devtools_captures_are_clipped_and_compressed(service):
+    driver = FakeDriver()
+    service(mode="always", quality=60, clip=(0, 0, 640, 360)).capture_step(driver, step())
+
+    assert driver.params["format"] == "jpeg"
+    assert driver.params["quality"] == 60
+    assert driver.params["clip"]["width"] == 640
+
+
+def test_writes_happen_on_the_writer_and_are_flushed_on_close(service):
+    store = FakeStore()
+    s = service(mode="always", store=store)
+    s.capture_step(FakeDriver(), step("Login: PIN accepted!"))
+    s.capture_step(FakeDriver(devtools=False), step())
+    s.close()
+
+    assert store.frames == [
+        ("login_pin_accepted", b"jpeg frame", "jpg"),
+        ("i_open_the_details_tab", b"png frame", "png"),
+    ]
+    assert store.closed
+
+
+def test_capture_errors_do_not_fail_the_step(service):
+    class BrokenDriver(FakeDriver):
+        def get_screenshot_as_png(self):
+            raise RuntimeError("session gone")
+
+    assert service(mode="always").capture_step(BrokenDriver(devtools=False), step()) is None
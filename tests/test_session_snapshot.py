@@ -0,0 +1,232 @@
+# tests/test_session_snapshot.py
+"""
+Session snapshot reuse across scenarios, against a fake site whose logout ends
+the server session (like the real one), and over HTTP against stand_in/server.py.
+"""
+
+import http.client
+import json
+import types
+from http.cookies import SimpleCookie
+from urllib.parse import urljoin, urlparse
+import pytest
+
+pytest.importorskip("selenium")
+pytest.importorskip("allure")
+
+from features import environment
+from pages.login_page import LoginPage
+from stand_in.server import StandInSettings, start_server
+from utils import config, session_snapshot
+
+PIN = "WVMVHWBS"
+LOGIN_URL = "https://fyc.example/login"
+TITLES_URL = "https://fyc.example/titles"
+
+
+class FakeSite:
+    def __init__(self):
+        self.sessions = set()
+        self.logins = 0
+
+    def login(self, driver):
+        self.logins += 1
+        token = f"token-{self.logins}"
+        self.sessions.add(token)
+        driver.add_cookie({"name": "fyc_session", "value": token, "domain": "fyc.example"})
+        driver.get(TITLES_URL)
+
+    def logout(self, driver):
+        self.sessions.discard(driver.cookies.get("fyc_session", {}).get("value"))
+
+    def signed_in(self, driver):
+        return driver.cookies.get("fyc_session", {}).get("value") in self.sessions
+
+
+class FakeDriver:
+    """Just enough WebDriver for capture/restore: one origin's cookies and storage."""
+
+    def __init__(self):
+        self.current_url = "about:blank"
+        self.cookies = {}
+        self.local = {}
+        self.switch_to = types.SimpleNamespace(default_content=lambda: None)
+
+    def get(self, url):
+        self.current_url = url
+
+    def get_cookies(self):
+        return list(self.cookies.values())
+
+    def add_cookie(self, cookie):
+        self.cookies[cookie["name"]] = cookie
+
+    def delete_all_cookies(self):
+        self.cookies.clear()
+
+    def execute_script(self, script, *args):
+        if script == session_snapshot.STORAGE_DUMP_SCRIPT:
+            return {"local": dict(self.local), "session": {}}
+        if script == session_snapshot.STORAGE_LOAD_SCRIPT:
+            self.local.update(args[0])
+
+
+@pytest.fixture
+def site(monkeypatch, tmp_path):
+    site = FakeSite()
+    monkeypatch.setattr(config, "SESSION_SNAPSHOT", True)
+    monkeypatch.setattr(config, "SESSION_SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(session_snapshot, "_memory", {})
+    monkeypatch.setattr(LoginPage, "login", lambda self, pin, timeout=15: site.login(self.driver) or True)
+    monkeypatch.setattr(LoginPage, "click_all_titles_button", lambda self, timeout=15: site.signed_in(self.driver))
+    monkeypatch.setattr(LoginPage, "verify_all_titles_text", lambda self, timeout=15: site.signed_in(self.driver))
+    return site
+
+
+def run_scenario(site, steps):
+    """Sign in the way the 'I sign in using PIN' step does; log out if the scenario does."""
+    scenario = types.SimpleNamespace(all_steps=[types.SimpleNamespace(name=name) for name in steps])
+    reuse = environment.keeps_session(scenario)
+    driver = FakeDriver()
+    driver.get(LOGIN_URL)
+    assert LoginPage(driver).ensure_logged_in(PIN, LOGIN_URL, reuse=reuse)
+    assert site.signed_in(driver)
+    if environment.LOGOUT_STEP in steps:
+        site.logout(driver)
+    # DriverPool.reset clears the browser side only; the server session stays
+    driver.delete_all_cookies()
+
+
+BROWSE = ['I sign in using PIN "WVMVHWBS"', 'I navigate to "Test Automation Project"']
+BROWSE_AND_LOGOUT = BROWSE + [environment.LOGOUT_STEP]
+
+
+def test_second_scenario_restores_the_snapshot(site):
+    run_scenario(site, BROWSE)
+    run_scenario(site, BROWSE)
+    run_scenario(site, BROWSE)
+
+    # Only the first scenario went through the PIN form
+    assert site.logins == 1
+
+
+def test_scenarios_that_log_out_use_their_own_session(site):
+    run_scenario(site, BROWSE)
+    run_scenario(site, BROWSE_AND_LOGOUT)
+    run_scenario(site, BROWSE)
+
+    # The logout ended its own login, not the snapshotted one
+    assert site.logins == 2
+
+
+def test_logged_out_sessions_are_never_snapshotted(site):
+    run_scenario(site, BROWSE_AND_LOGOUT)
+
+    assert session_snapshot.SessionSnapshot.load(key=PIN) is None
+
+
+# ---------------------------------------------------------------- against stand_in/server.py
+class StandInDriver(FakeDriver):
+    """Fetches pages from the stand-in over HTTP, keeping its cookies like a browser."""
+
+    def _request(self, method, url, body=None):
+        parsed = urlparse(url)
+        headers = {"Cookie": "; ".join(f"{c['name']}={c['value']}" for c in self.cookies.values())}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        connection = http.client.HTTPConnection(parsed.netloc, timeout=5)
+        try:
+            connection.request(method, parsed.path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        finally:
+            connection.close()
+        for header in response.headers.get_all("Set-Cookie") or []:
+            morsel = next(iter(SimpleCookie(header).values()))
+            if morsel["max-age"] == "0":
+                self.cookies.pop(morsel.key, None)
+            else:
+                self.cookies[morsel.key] = {"name": morsel.key, "value": morsel.value,
+                                            "domain": parsed.hostname, "path": "/"}
+        return response
+
+    def get(self, url):
+        for _ in range(5):
+            response = self._request("GET", url)
+            if response.status != 302:
+                break
+            url = urljoin(url, response.headers["Location"])
+        self.current_url = url
+
+    def sign_in(self, base_url, pin):
+        self._request("POST", f"{base_url}/api/login", json.dumps({"pin": pin}))
+        self.get(f"{base_url}/titles")
+
+
+@pytest.fixture
+def stand_in(monkeypatch, tmp_path):
+    settings = StandInSettings(pin=PIN)
+    server, base_url = start_server(settings=settings)
+    logins = []
+
+    def login(self, pin, timeout=15):
+        logins.append(pin)
+        self.driver.sign_in(base_url, pin)
+        return urlparse(self.driver.current_url).path == "/titles"
+
+    def on_titles(self, timeout=15):
+        return urlparse(self.driver.current_url).path == "/titles"
+
+    monkeypatch.setattr(config, "SESSION_SNAPSHOT", True)
+    monkeypatch.setattr(config, "SESSION_SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "BASE_URL", base_url)
+    monkeypatch.setattr(session_snapshot, "_memory", {})
+    monkeypatch.setattr(LoginPage, "login", login)
+    monkeypatch.setattr(LoginPage, "click_all_titles_button", on_titles)
+    monkeypatch.setattr(LoginPage, "verify_all_titles_text", on_titles)
+    yield types.SimpleNamespace(base_url=base_url, settings=settings, logins=logins)
+    server.shutdown()
+    server.server_close()
+
+
+def sign_in_on_stand_in(stand_in, steps=BROWSE):
+    """Run a scenario's sign-in on a fresh browser, as the sign-in steps do, and return the driver."""
+    scenario = types.SimpleNamespace(all_steps=[types.SimpleNamespace(name=name) for name in steps])
+    login_url = f"{stand_in.base_url}/login"
+    driver = StandInDriver()
+    driver.get(login_url)
+    assert LoginPage(driver).ensure_logged_in(PIN, login_url, reuse=environment.keeps_session(scenario))
+    assert urlparse(driver.current_url).path == "/titles"
+    if environment.LOGOUT_STEP in steps:
+        driver.get(f"{stand_in.base_url}/logout")
+    return driver
+
+
+def test_stand_in_session_is_restored_from_the_snapshot(stand_in):
+    first = sign_in_on_stand_in(stand_in)
+    second = sign_in_on_stand_in(stand_in)
+
+    assert stand_in.logins == [PIN]
+    assert second.cookies["fyc_session"]["value"] == first.cookies["fyc_session"]["value"]
+    assert len(stand_in.settings.sessions) == 1
+
+
+def test_expired_stand_in_session_falls_back_to_the_pin_login(stand_in):
+    sign_in_on_stand_in(stand_in)
+    stand_in.settings.sessions.clear()  # the server forgot the snapshotted session
+
+    driver = sign_in_on_stand_in(stand_in)
+
+    assert stand_in.logins == [PIN, PIN]
+    # The fallback login replaced the stale snapshot
+    snapshot = session_snapshot.SessionSnapshot.load(key=PIN)
+    assert snapshot.cookies[0]["value"] == driver.cookies["fyc_session"]["value"]
+    assert snapshot.cookies[0]["value"] in stand_in.settings.sessions
+
+
+def test_logging_out_on_the_stand_in_leaves_the_snapshot_usable(stand_in):
+    sign_in_on_stand_in(stand_in)
+    sign_in_on_stand_in(stand_in, BROWSE_AND_LOGOUT)
+    sign_in_on_stand_in(stand_in)
+
+    assert stand_in.logins == [PIN, PIN]
@@ -0,0 +1,88 @@
+# tests/test_timing.py
+"""Latency instrumentation: patching only when enabled, clean removal and the p50/p95 summary."""
+
+import csv
+import json
+import time
+import pytest
+
+pytest.importorskip("selenium")
+
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.wait import WebDriverWait
+from utils import config, timing
+from utils.wait_budget import BudgetedWait
+
+
+class Page:
+    def open(self):
+        time.sleep(0.01)
+        return "opened"
+
+    def _helper(self):
+        return "private"
+
+
+@pytest.fixture(autouse=True)
+def clean_timing(monkeypatch):
+    monkeypatch.setattr(timing, "_samples", type(timing._samples)(list))
+    yield
+    timing.uninstall()
+
+
+def originals():
+    return (time.sleep, WebDriver.execute, WebDriverWait.until, BudgetedWait.until_not, Page.open, Page._helper)
+
+
+def test_nothing_is_patched_while_timing_is_disabled(monkeypatch):
+    monkeypatch.setattr(config, "TIMING_ENABLED", False)
+    before = originals()
+
+    assert timing.install([Page]) is False
+    assert originals() == before
+
+
+def test_uninstall_restores_every_patch(monkeypatch):
+    monkeypatch.setattr(config, "TIMING_ENABLED", True)
+    before = originals()
+
+    assert timing.install([Page]) is True
+    assert time.sleep is not before[0] and WebDriver.execute is not before[1] and Page.open is not before[4]
+    assert Page._helper is before[5]
+    timing.uninstall()
+
+    assert originals() == before
+
+
+def test_page_methods_record_their_sleep_time(monkeypatch):
+    monkeypatch.setattr(config, "TIMING_ENABLED", True)
+    timing.install([Page])
+
+    assert Page().open() == "opened"
+
+    rows = {(r["kind"], r["operation"]): r for r in timing.summarize()}
+    page = rows[("page", "Page.open")]
+    assert page["count"] == 1
+    assert page["sleep_ms"] >= 10
+    assert rows[("sleep", "sleep")]["count"] == 1
+
+
+def test_summary_percentiles_and_mark():
+    for ms in range(1, 21):
+        timing._record("I press play", "step", ms / 1000)
+    since = timing.mark()
+    timing._record("I press play", "step", 0.5)
+
+    row = next(r for r in timing.summarize() if r["operation"] == "I press play")
+    assert (row["count"], row["p50_ms"], row["p95_ms"], row["max_ms"]) == (21, 11.0, 20.0, 500.0)
+    assert timing.summarize(since=since)[0]["count"] == 1
+
+
+def test_write_summary_exports_json_and_csv(tmp_path):
+    timing._record("I press play", "step", 0.02, dict.fromkeys(timing.CATEGORIES, 0.005))
+
+    json_path, csv_path = timing.write_summary(str(tmp_path))
+
+    assert json.loads(open(json_path, encoding="utf-8").read())[0]["other_ms"] == 0.0
+    with open(csv_path, encoding="utf-8") as f:
+        assert next(csv.DictReader(f))["webdriver_ms"] == "5.0"
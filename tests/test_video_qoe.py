@@ -0,0 +1,158 @@
+# tests/test_video_qoe.py
+"""QoE sampling against a fake driver: TTFF from the play mark, threshold evaluation and the JSONL artifact."""
+
+import pytest
+from utils import config, video_qoe
+from utils.video_qoe import VideoQoe, evaluate, load_records, write_artifact
+
+LIMITS = {
+    "max_ttff_ms": 5000, "max_stall_count": 3, "max_stall_ms": 3000,
+    "max_dropped_pct": 5, "min_playback_rate": 0.9, "max_switch_ms": 5000,
+}
+
+
+class FakeDriver:
+    """Answers SAMPLE_SCRIPT with `raw` and AWAIT_SWITCH_SCRIPT with `switch`."""
+
+    def __init__(self, raw=None, switch=None):
+        self.raw = raw
+        self.switch = switch
+
+    def execute_script(self, script, *args):
+        assert script == video_qoe.SAMPLE_SCRIPT
+        return self.raw
+
+    def execute_async_script(self, script, *args):
+        assert script == video_qoe.AWAIT_SWITCH_SCRIPT
+        return self.switch
+
+
+def raw(**overrides):
+    return {
+        "first_frame_at": 1_700_000_001_200.0, "ttff_estimated": False,
+        "stall_count": 1, "stall_ms": 250.0, "longest_stall_ms": 250.0,
+        "dropped_frames": 3, "decoded_frames": 300, "corrupted_frames": 0,
+        "media_seconds": 9.5, "playing_seconds": 10.0, "video_width": 1280, "video_height": 720,
+        **overrides,
+    }
+
+
+def metrics(**overrides):
+    return {
+        "ttff_ms": 1200.0, "stall_count": 1, "stall_ms": 250.0, "dropped_pct": 1.0,
+        "playback_rate": 0.95, "resolution_switches": [], **overrides,
+    }
+
+
+def test_ttff_is_measured_from_the_first_play_mark():
+    qoe = VideoQoe(FakeDriver(raw()))
+    qoe.mark_play(1_700_000_000_000.0)
+    qoe.mark_play(1_700_000_001_000.0)  # a later resume does not move the start
+
+    sample = qoe.sample("video")
+
+    assert sample["ttff_ms"] == 1200.0
+    assert (sample["dropped_pct"], sample["playback_rate"]) == (1.0, 0.95)
+
+
+def test_ttff_is_unknown_without_a_play_mark_and_never_negative():
+    assert VideoQoe(FakeDriver(raw())).sample("video")["ttff_ms"] is None
+
+    qoe = VideoQoe(FakeDriver(raw(ttff_estimated=True)))
+    qoe.mark_play(1_700_000_002_000.0)  # back-dated first frame before the mark
+    sample = qoe.sample("video")
+    assert (sample["ttff_ms"], sample["ttff_estimated"]) == (0.0, True)
+
+
+def test_an_empty_sample_keeps_the_previous_metrics():
+    driver = FakeDriver(raw())
+    qoe = VideoQoe(driver)
+    first = qoe.sample("video")
+    driver.raw = None
+
+    assert qoe.sample("video") is first
+
+
+def test_switches_are_recorded_on_the_latest_metrics():
+    driver = FakeDriver(raw(), switch={"status": "ok", "from": "854x480", "to": "1280x720",
+                                       "switch_ms": 800.0, "resume_ms": 1100.0, "stalls": 1, "stall_ms": 300.0})
+    qoe = VideoQoe(driver)
+    qoe.sample("video")
+
+    transition = qoe.await_switch("video", "720p")
+
+    assert transition["rendition"] == "720p" and transition["resume_ms"] == 1100.0
+    assert qoe.latest["resolution_switches"] == [transition]
+    assert VideoQoe(FakeDriver(switch=None)).await_switch("video", "1080p")["status"] == "not-armed"
+
+
+def test_metrics_within_thresholds_pass():
+    assert evaluate(metrics(), LIMITS) == []
+
+
+@pytest.mark.parametrize("overrides, violation", [
+    ({"ttff_ms": 5001.0}, "ttff_ms 5001.0 > 5000"),
+    ({"stall_count": 4}, "stall_count 4 > 3"),
+    ({"stall_ms": 3500.0}, "stall_ms 3500.0 > 3000"),
+    ({"dropped_pct": 7.5}, "dropped_pct 7.5 > 5"),
+    ({"playback_rate": 0.5}, "playback_rate 0.5 < 0.9"),
+    ({"resolution_switches": [{"rendition": "720p", "status": "timeout", "resume_ms": None}]},
+     "switch to 720p: timeout"),
+    ({"resolution_switches": [{"rendition": "720p", "status": "ok", "resume_ms": 6000.0}]},
+     "switch to 720p resumed after 6000.0 ms > 5000"),
+])
+def test_each_threshold_is_reported(overrides, violation):
+    assert evaluate(metrics(**overrides), LIMITS) == [violation]
+
+
+def test_zero_disables_a_threshold_and_missing_values_are_skipped():
+    limits = dict(LIMITS, max_ttff_ms=0)
+
+    assert evaluate(metrics(ttff_ms=60000.0, dropped_pct=None), limits) == []
+
+
+def test_artifacts_append_one_record_per_scenario(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "WORKER_ID", "2")
+    write_artifact("Play a title", metrics(), [], directory=str(tmp_path))
+    write_artifact("Switch renditions", metrics(stall_count=4), ["stall_count 4 > 3"], directory=str(tmp_path))
+
+    assert (tmp_path / "qoe_worker2.jsonl").exists()
+    records = load_records(str(tmp_path))
+    assert [(r["scenario"], r["passed"]) for r in records] == [("Play a title", True), ("Switch renditions", False)]
+    assert records[1]["violations"] == ["stall_count 4 > 3"]
+    assert load_records(str(tmp_path / "missing")) == []
+
+
+def test_switch_violations_use_the_configured_limit(monkeypatch):
+    monkeypatch.setattr(config, "QOE_MAX_SWITCH_MS", 1000)
+    transitions = [
+        {"rendition": "480p", "status": "ok", "resume_ms": 900.0},
+        {"rendition": "720p", "status": "ok", "resume_ms": 1500.0},
+        {"rendition": "1080p", "status": "no-resize", "resume_ms": None},
+    ]
+
+    assert video_qoe.switch_violations(transitions) == [
+        "switch to 720p resumed after 1500.0 ms > 1000", "switch to 1080p: no-resize",
+    ]
+    assert video_qoe.switch_violations(transitions, max_switch_ms=0) == ["switch to 1080p: no-resize"]
+
+
+def test_the_480_to_720_switch_reports_each_transition(monkeypatch):
+    pytest.importorskip("selenium")
+    pytest.importorskip("allure")
+    from pages.automation_page import AutomationPage
+
+    class Driver:
+        class switch_to:
+            @staticmethod
+            def default_content():
+                pass
+
+    page = AutomationPage(Driver())
+    monkeypatch.setattr(page, "select_rendition", lambda rendition, timeout: {
+        "rendition": rendition, "status": "ok", "resume_ms": 700.0,
+    })
+
+    transitions = page.change_resolution_480_to_720_via_settings()
+
+    assert [(t["rendition"], t["resume_ms"]) for t in transitions] == [("480p", 700.0), ("720p", 700.0)]
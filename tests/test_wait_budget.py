@@ -0,0 +1,104 @@
+# tests/test_wait_budget.py
+"""Step-wide wait budget, adaptive polling and BudgetedWait."""
+
+import itertools
+import pytest
+
+pytest.importorskip("selenium")
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from utils import config, wait_budget
+from utils.wait_budget import BudgetedWait, WaitBudget, poll_intervals, step_budget
+
+
+@pytest.fixture
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(config, "POLL_MIN", 0.01)
+    monkeypatch.setattr(config, "POLL_BACKOFF", 2)
+
+
+def test_poll_intervals_back_off_up_to_the_maximum(fast_polling):
+    assert list(itertools.islice(poll_intervals(0.05), 5)) == [0.01, 0.02, 0.04, 0.05, 0.05]
+
+
+def test_poll_intervals_never_start_above_the_maximum(fast_polling):
+    assert next(poll_intervals(0.005)) == 0.005
+
+
+def test_a_budget_grants_only_what_is_left(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(wait_budget.time, "monotonic", lambda: now[0])
+    budget = WaitBudget(10, "I log in")
+    now[0] += 7
+
+    assert budget.grant(20) == pytest.approx(3)
+    assert budget.grant(1) == 1
+    now[0] += 5
+    assert budget.remaining() == 0.0 and budget.grant(5) == 0.0
+    # A nested budget cannot outlive its parent
+    assert WaitBudget(30, "nested", parent=budget).seconds == 0.0
+
+
+def test_step_budgets_nest_and_restore_the_outer_one():
+    with step_budget(5, "outer") as outer:
+        with step_budget(60, "inner") as inner:
+            assert wait_budget.current_budget() is inner
+            assert inner.seconds <= 5
+        assert wait_budget.current_budget() is outer
+    assert wait_budget.current_budget() is None
+
+
+def test_waits_are_clamped_to_the_step_budget(fast_polling):
+    with step_budget(0.1, "I press play") as budget:
+        with pytest.raises(TimeoutException, match=r"video never plays \(step budget of 0.1s exhausted\)"):
+            BudgetedWait(object(), 20).until(lambda d: False, message="video never plays")
+        # The budget is spent: later waits give up at once
+        with pytest.raises(TimeoutException):
+            BudgetedWait(object(), 20).until(lambda d: False)
+
+    first, second = budget.report()["waits"]
+    assert (first["requested_s"], first["outcome"]) == (20, "timeout")
+    assert first["granted_s"] <= 0.1
+    assert second["granted_s"] == 0.0
+
+
+def test_passing_waits_return_the_condition_value(fast_polling):
+    values = iter([None, None, "element"])
+
+    assert BudgetedWait(object(), 1).until(lambda d: next(values)) == "element"
+
+
+def test_ignored_exceptions_keep_polling(fast_polling):
+    errors = iter([NoSuchElementException(), StaleElementReferenceException(), None])
+
+    def condition(driver):
+        error = next(errors)
+        if error:
+            raise error
+        return True
+
+    assert BudgetedWait(object(), 1, ignored_exceptions=StaleElementReferenceException).until(condition)
+
+
+def test_other_exceptions_propagate(fast_polling):
+    def condition(driver):
+        raise StaleElementReferenceException("gone")
+
+    with pytest.raises(StaleElementReferenceException):
+        BudgetedWait(object(), 1).until(condition)
+
+
+def test_until_not_passes_when_the_element_is_gone(fast_polling):
+    def condition(driver):
+        raise NoSuchElementException()
+
+    assert BudgetedWait(object(), 1).until_not(condition) is True
+
+
+def test_the_wait_receives_its_own_driver(fast_polling):
+    driver = object()
+    seen = []
+
+    BudgetedWait(driver, 1, poll_frequency=0).until(lambda d: seen.append(d) or True)
+
+    assert seen == [driver]
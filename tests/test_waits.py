@@ -0,0 +1,78 @@
+# tests/test_waits.py
+"""Playback-aware waits against a fake video element."""
+
+import pytest
+
+pytest.importorskip("selenium")
+
+from selenium.common.exceptions import TimeoutException
+from utils.waits import PlaybackWaits
+
+
+class FakeVideo:
+    def __init__(self, **properties):
+        self.properties = {"currentTime": 0.0, "readyState": 0, "paused": False, "volume": 1.0, **properties}
+
+    def read(self, name):
+        return self.properties[name]
+
+
+class PlayingVideo(FakeVideo):
+    """currentTime advances by one second every time it is read."""
+
+    def read(self, name):
+        value = super().read(name)
+        if name == "currentTime":
+            self.properties["currentTime"] += 1.0
+        return value
+
+
+class FakeDriver:
+    def __init__(self, nodes=None):
+        self.nodes = nodes or [10]
+
+    def execute_script(self, script, *args):
+        if script.startswith("return arguments[0]."):
+            return args[0].read(script[len("return arguments[0]."):-1])
+        if script == "return document.readyState":
+            return "complete"
+        # DOM node count: the last value repeats once the list runs out
+        return self.nodes.pop(0) if len(self.nodes) > 1 else self.nodes[0]
+
+
+def waits(driver=None, timeout=2):
+    return PlaybackWaits(driver or FakeDriver(), timeout=timeout, poll_frequency=0.01)
+
+
+def test_until_playing_for_returns_once_current_time_advanced():
+    video = PlayingVideo(currentTime=3.0)
+
+    assert waits().until_playing_for(video, seconds=4) is True
+    assert video.properties["currentTime"] >= 7.0
+
+
+def test_until_ready_times_out_while_nothing_is_buffered():
+    with pytest.raises(TimeoutException, match="readyState did not reach 3"):
+        waits(timeout=0.1).until_ready(FakeVideo(readyState=2))
+
+
+def test_until_ready_passes_once_future_data_is_buffered():
+    assert waits().until_ready(FakeVideo(readyState=4)) is True
+
+
+def test_until_volume_accepts_values_within_the_tolerance():
+    assert waits().until_volume(FakeVideo(volume=0.505), 0.5) is True
+    with pytest.raises(TimeoutException):
+        waits(timeout=0.1).until_volume(FakeVideo(volume=0.6), 0.5)
+
+
+def test_until_paused_needs_a_real_true():
+    with pytest.raises(TimeoutException):
+        waits(timeout=0.1).until_paused(FakeVideo(paused=None))
+
+
+def test_until_dom_settled_waits_for_the_node_count_to_stop_changing():
+    driver = FakeDriver(nodes=[10, 20, 30, 30])
+
+    assert waits(driver).until_dom_settled(quiet_period=0.05) is True
+    assert driver.nodes == [30]
@@ -0,0 +1,210 @@
+# utils/allure_results.py
+"""
+Allure results handling for run_tests.py.
+
+Attachments are stored by content: every attachment file is renamed to
+<sha256>-attachment.<ext> and the result files that reference it are rewritten
+to that name, so identical attachments (unchanged screenshots, repeated JSON
+reports) are kept once per results directory.
+
+ResultsCollector moves finished result files from the per-worker directories
+into the shared results directory while the workers are still running, so
+the results grow as scenarios finish instead of being copied at the end.
+
+generate_report() copies the previous report's history (trends, retries,
+flaky markers) into the results before generating, and is called whatever
+the outcome of the run.
+
+Usage:
+    collector = ResultsCollector(RESULTS_DIR)
+    collector.start([worker_dir_0, worker_dir_1])
+    ...
+    collector.stop()
+    generate_report(RESULTS_DIR, REPORT_DIR)
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CONTENT_NAME = re.compile(r"^[0-9a-f]{64}-attachment")
+RESULT_SUFFIXES = ("-result.json", "-container.json", "-globals.json")
+
+
+def _is_result(name):
+    return name.endswith(RESULT_SUFFIXES)
+
+
+def _content_name(path, name):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return f"{digest.hexdigest()}-attachment{os.path.splitext(name)[1]}"
+
+
+def _rewrite_sources(node, aliases):
+    """Point every attachment 'source' in a result/container/globals document at its content name."""
+    if isinstance(node, dict):
+        for attachment in node.get("attachments", []):
+            attachment["source"] = aliases.get(attachment.get("source"), attachment.get("source"))
+        for value in node.values():
+            _rewrite_sources(value, aliases)
+    elif isinstance(node, list):
+        for value in node:
+            _rewrite_sources(value, aliases)
+
+
+class ResultsCollector:
+    def __init__(self, target_dir, settle_seconds=1.0):
+        """
+        :param target_dir: shared results directory the report is generated from
+        :param settle_seconds: files modified more recently are left for the next sweep
+        """
+        self.target_dir = target_dir
+        self.settle_seconds = settle_seconds
+        self.aliases = {}  # original attachment name -> content name
+        self.files = 0
+        self.duplicates = 0
+        self.saved_bytes = 0
+        self._stop = threading.Event()
+        self._thread = None
+        os.makedirs(target_dir, exist_ok=True)
+
+    def _settled(self, path, final):
+        try:
+            return final or time.time() - os.path.getmtime(path) >= self.settle_seconds
+        except OSError:
+            return False
+
+    def collect(self, source_dir, final=False):
+        """
+        Move the finished files of `source_dir` into the target directory,
+        storing attachments by content. With source_dir == target_dir the
+        directory is deduplicated in place. `final` also takes files that are
+        still settling (the writer has exited).
+        """
+        if not os.path.isdir(source_dir):
+            return
+        in_place = os.path.abspath(source_dir) == os.path.abspath(self.target_dir)
+        names = [n for n in sorted(os.listdir(source_dir)) if os.path.isfile(os.path.join(source_dir, n))]
+        # Attachments are written before the results that reference them
+        attachments = [n for n in names if "-attachment" in n and not (in_place and CONTENT_NAME.match(n))]
+        results = [n for n in names if _is_result(n)]
+        others = [n for n in names if n not in attachments and n not in results and not in_place]
+
+        for name in attachments:
+            source = os.path.join(source_dir, name)
+            if not self._settled(source, final):
+                continue
+            content_name = _content_name(source, name)
+            target = os.path.join(self.target_dir, content_name)
+            if os.path.exists(target):
+                self.duplicates += 1
+                self.saved_bytes += os.path.getsize(source)
+                os.remove(source)
+            else:
+                shutil.move(source, target)
+                self.files += 1
+            self.aliases[name] = content_name
+
+        for name in results:
+            source = os.path.join(source_dir, name)
+            if not self._settled(source, final):
+                continue
+            try:
+                with open(source, encoding="utf-8") as f:
+                    document = json.load(f)
+            except ValueError:
+                if final:
+                    logger.error(f"❌ Skipping unreadable Allure result {source}")
+                continue
+            _rewrite_sources(document, self.aliases)
+            target = os.path.join(self.target_dir, name)
+            with open(target, "w", encoding="utf-8") as f:
+                json.dump(document, f)
+            if not in_place:
+                os.remove(source)
+                self.files += 1
+
+        for name in others:
+            source = os.path.join(source_dir, name)
+            if self._settled(source, final):
+                shutil.move(source, os.path.join(self.target_dir, name))
+                self.files += 1
+
+    def start(self, source_dirs, interval=2.0):
+        """Collect from `source_dirs` every `interval` seconds on a background thread."""
+        def sweep():
+            while not self._stop.wait(interval):
+                for source_dir in source_dirs:
+                    try:
+                        self.collect(source_dir)
+                    except OSError as e:
+                        logger.debug(f"Results sweep of {source_dir} deferred: {e}")
+
+        self._source_dirs = list(source_dirs)
+        self._thread = threading.Thread(target=sweep, name="allure-results-collector", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background sweeps and collect everything that is left."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            for source_dir in self._source_dirs:
+                self.collect(source_dir, final=True)
+        self.log_summary()
+
+    def log_summary(self):
+        logger.info(f"Collected {self.files} Allure result file(s) into {self.target_dir}, "
+                    f"{self.duplicates} duplicate attachment(s) dropped "
+                    f"({self.saved_bytes / (1024 * 1024):.1f} MB saved)")
+
+
+def dedupe(results_dir):
+    """Store the attachments of a results directory by content, in place."""
+    collector = ResultsCollector(results_dir)
+    collector.collect(results_dir, final=True)
+    collector.log_summary()
+    return collector
+
+
+def reset_results(results_dir):
+    """Remove the previous run's results (the report keeps their history)."""
+    shutil.rmtree(results_dir, ignore_errors=True)
+    os.makedirs(results_dir, exist_ok=True)
+
+
+def restore_history(results_dir, report_dir):
+    """Copy the previous report's history into the results so trends carry over."""
+    history = os.path.join(report_dir, "history")
+    if not os.path.isdir(history):
+        return False
+    shutil.copytree(history, os.path.join(results_dir, "history"), dirs_exist_ok=True)
+    return True
+
+
+def generate_report(results_dir, report_dir):
+    """Generate the Allure report from `results_dir`, keeping the history of the previous report."""
+    if restore_history(results_dir, report_dir):
+        logger.info("Reusing the previous report's history")
+    start = time.perf_counter()
+    try:
+        exit_code = subprocess.call(["allure", "generate", results_dir, "-o", report_dir, "--clean"])
+    except OSError as e:
+        logger.error(f"❌ Allure CLI not available, report not generated: {e}")
+        return 1
+    if exit_code == 0:
+        logger.info(f"Allure report generated at {report_dir} in {time.perf_counter() - start:.1f}s")
+    else:
+        logger.error(f"❌ Allure report generation failed with exit code {exit_code}")
+    return exit_code
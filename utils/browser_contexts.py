@@ -0,0 +1,164 @@
+# utils/browser_contexts.py
+"""
+Isolated browser contexts inside shared Chrome processes.
+
+A full Chrome per session costs hundreds of MB (browser, GPU, network and
+utility processes on top of the page's renderer). In context mode
+(FYC_SESSION_MODE=context) a few "host" Chrome processes are launched, and each
+session is a DevTools browser context inside one of them
+(Target.createBrowserContext): its own cookies, storage and cache, like a
+separate incognito profile, with a tab opened in it (Target.createTarget).
+
+ChromeDriver runs one command at a time per session, so every context gets its
+own lightweight chromedriver session attached to the host through its
+debuggerAddress and switched to the context's tab. Sessions therefore run
+concurrently and page objects use them like any other WebDriver. The window
+handles of a context session are limited to its own context's tabs, so
+resetting one session never touches another.
+
+Contexts start from an empty profile: the host's warmed profile template
+(cookie banner accepted) is not shared with them.
+
+Usage:
+    contexts = BrowserContexts(launch_host)   # launch_host() returns a host WebDriver
+    driver = contexts.create()
+    ...
+    driver.quit()
+    contexts.dispose(driver)                  # closes the context and its tabs
+    contexts.close()                          # quits the host browsers
+"""
+
+import threading
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from utils import config
+from utils.driver_resolver import resolve_driver_path
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+WINDOW_SIZE = {"width": 1920, "height": 1080}
+
+
+def _target_id(handle):
+    # Older chromedrivers prefix window handles with "CDwindow-"
+    return handle.rsplit("-", 1)[-1] if handle.startswith("CDwindow-") else handle
+
+
+class ContextDriver(webdriver.Chrome):
+    """A chromedriver session attached to one browser context of a host Chrome."""
+
+    browser_context_id = None
+
+    @property
+    def window_handles(self):
+        targets = self.execute_cdp_cmd("Target.getTargets", {})["targetInfos"]
+        own = {t["targetId"] for t in targets
+               if t["type"] == "page" and t.get("browserContextId") == self.browser_context_id}
+        return [handle for handle in super().window_handles if _target_id(handle) in own]
+
+
+class _Host:
+    def __init__(self, driver):
+        self.driver = driver
+        self.debugger_address = driver.capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+        if not self.debugger_address:
+            raise RuntimeError("The host Chrome does not expose a debuggerAddress")
+        self.contexts = set()
+        self.reserved = 0  # slots claimed by contexts still being created
+        # The host session runs one DevTools command at a time
+        self.lock = threading.Lock()
+
+    def cdp(self, command, params):
+        with self.lock:
+            return self.driver.execute_cdp_cmd(command, params)
+
+
+class BrowserContexts:
+    def __init__(self, launch_host, max_contexts=None, on_quit=None):
+        """
+        :param launch_host: callable returning a new, configured Chrome WebDriver to host contexts
+        :param max_contexts: contexts per host Chrome before another host is launched
+        :param on_quit: optional callable(host_driver) run after a host has quit (e.g. profile cleanup)
+        """
+        self.launch_host = launch_host
+        self.max_contexts = max(1, config.CONTEXTS_PER_BROWSER if max_contexts is None else max_contexts)
+        self.on_quit = on_quit
+        self._hosts = []
+        self._owners = {}  # context driver -> host
+        self._lock = threading.Lock()
+
+    def _host_with_room(self):
+        with self._lock:
+            for host in self._hosts:
+                if len(host.contexts) + host.reserved < self.max_contexts:
+                    host.reserved += 1
+                    return host
+        host = _Host(self.launch_host())
+        host.reserved += 1
+        with self._lock:
+            self._hosts.append(host)
+        logger.info(f"✅ Launched host browser #{len(self._hosts)} for browser contexts")
+        return host
+
+    def _attach(self, host):
+        options = Options()
+        options.debugger_address = host.debugger_address
+        if config.HAR_ENABLED:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        return ContextDriver(service=Service(resolve_driver_path()), options=options)
+
+    def create(self):
+        """Return a WebDriver for a new isolated browser context."""
+        host = self._host_with_room()
+        context_id = driver = None
+        try:
+            context_id = host.cdp("Target.createBrowserContext", {"disposeOnDetach": False})["browserContextId"]
+            target_id = host.cdp("Target.createTarget",
+                                 dict(WINDOW_SIZE, url="about:blank", browserContextId=context_id))["targetId"]
+            driver = self._attach(host)
+            driver.browser_context_id = context_id
+            driver.switch_to.window(next(h for h in driver.window_handles if _target_id(h) == target_id))
+        except Exception:
+            if driver is not None:
+                driver.quit()
+            if context_id:
+                self._dispose_context(host, context_id)
+            with self._lock:
+                host.reserved -= 1
+            raise
+        with self._lock:
+            host.reserved -= 1
+            host.contexts.add(driver)
+            self._owners[driver] = host
+        logger.info(f"Browser context created ({len(host.contexts)}/{self.max_contexts} in its host)")
+        return driver
+
+    def _dispose_context(self, host, context_id):
+        try:
+            host.cdp("Target.disposeBrowserContext", {"browserContextId": context_id})
+        except Exception as e:
+            logger.error(f"❌ Could not dispose browser context {context_id}: {e}")
+
+    def dispose(self, driver):
+        """Close a context session's browser context; no-op for other drivers."""
+        with self._lock:
+            host = self._owners.pop(driver, None)
+            if host is not None:
+                host.contexts.discard(driver)
+        if host is not None:
+            self._dispose_context(host, driver.browser_context_id)
+
+    def close(self):
+        """Quit every host browser (and with them any context still open)."""
+        with self._lock:
+            hosts, self._hosts = self._hosts, []
+            self._owners.clear()
+        for host in hosts:
+            try:
+                host.driver.quit()
+            except Exception as e:
+                logger.error(f"Error closing host browser: {e}")
+            if self.on_quit:
+                self.on_quit(host.driver)
@@ -0,0 +1,209 @@
+# utils/config.py
+"""
+Central configuration for the automation framework.
+
+Every value can be overridden with an environment variable so CI jobs can
+tune a run without touching the code.
+
+Usage:
+    from utils import config
+    WebDriverWait(driver, config.WAIT_TIMEOUT)
+"""
+
+import os
+import tempfile
+
+
+def _env_float(name, default):
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return float(default)
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return int(default)
+
+
+def _env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_clip(name):
+    """Parse an 'x,y,width,height' region, or return None when unset/invalid."""
+    try:
+        values = [float(v) for v in os.environ.get(name, "").split(",")]
+    except ValueError:
+        return None
+    return tuple(values) if len(values) == 4 else None
+
+
+# ---------------------------------------------------------------- site
+# Base URL of the FYC site under test (point at stand_in.server for offline runs)
+BASE_URL = os.environ.get("FYC_BASE_URL", "https://indeedemo-fyc.watch.indee.tv").rstrip("/")
+
+# Reuse an authenticated session snapshot instead of the PIN login where allowed
+SESSION_SNAPSHOT = _env_bool("FYC_SESSION_SNAPSHOT", True)
+# Seconds a session snapshot stays valid
+SESSION_SNAPSHOT_TTL = _env_float("FYC_SESSION_SNAPSHOT_TTL", 1800)
+# Where snapshots are kept (outside reports/, as they contain session tokens)
+SESSION_SNAPSHOT_DIR = os.environ.get(
+    "FYC_SESSION_SNAPSHOT_DIR", os.path.join(tempfile.gettempdir(), "fyc_automation_sessions")
+)
+
+# Use CSS equivalents of registered XPath locators where one exists
+PREFER_CSS_LOCATORS = _env_bool("FYC_PREFER_CSS_LOCATORS", True)
+
+# ---------------------------------------------------------------- waits
+# Default deadline (seconds) for playback-aware waits
+WAIT_TIMEOUT = _env_float("FYC_WAIT_TIMEOUT", 15)
+# Longest interval (seconds) between re-checks of a wait condition
+POLL_FREQUENCY = _env_float("FYC_POLL_FREQUENCY", 0.25)
+# First poll interval (seconds); each re-check waits FYC_POLL_BACKOFF times longer
+POLL_MIN = _env_float("FYC_POLL_MIN", 0.05)
+POLL_BACKOFF = _env_float("FYC_POLL_BACKOFF", 1.5)
+# Time budget (seconds) shared by all the waits of one step
+STEP_BUDGET = _env_float("FYC_STEP_BUDGET", 60)
+# Wait for elements with an injected MutationObserver instead of polling
+PUSH_WAITS = _env_bool("FYC_PUSH_WAITS", True)
+# How long (seconds) the DOM must stay unchanged to count as rendered
+DOM_QUIET_PERIOD = _env_float("FYC_DOM_QUIET_PERIOD", 0.5)
+# Seconds of real playback required by "play the video" steps
+PLAYBACK_SECONDS = _env_float("FYC_PLAYBACK_SECONDS", 10)
+# Seconds of real playback required after resuming
+RESUME_SECONDS = _env_float("FYC_RESUME_SECONDS", 2)
+
+# ---------------------------------------------------------------- runner
+# Identifier of the parallel worker this process belongs to (set by run_tests.py)
+WORKER_ID = os.environ.get("FYC_WORKER_ID", "0")
+
+# ---------------------------------------------------------------- logging
+# Level of the framework logger (DEBUG, INFO, ...)
+LOG_LEVEL = os.environ.get("FYC_LOG_LEVEL", "INFO").upper()
+# Per-module overrides, e.g. "pages.automation_page=DEBUG,utils.waits=WARNING"
+LOG_LEVELS = os.environ.get("FYC_LOG_LEVELS", "")
+# text | json (file output)
+LOG_FORMAT = os.environ.get("FYC_LOG_FORMAT", "text")
+# Hand records to a background listener thread instead of writing on the caller's thread
+LOG_QUEUE = _env_bool("FYC_LOG_QUEUE", True)
+
+# ---------------------------------------------------------------- browser
+# Chrome launch profile: "fast" (blocks non-essential requests) or "faithful"
+LAUNCH_PROFILE = os.environ.get("FYC_LAUNCH_PROFILE", "faithful")
+# Comma-separated URL patterns blocked by the "fast" profile (default: utils/launch_profiles.py)
+BLOCKED_URLS = [p.strip() for p in os.environ.get("FYC_BLOCK_URLS", "").split(",") if p.strip()]
+# Comma-separated origins of the video player and its media (manifests, segments), besides BASE_URL;
+# blocked patterns that would match them are ignored
+PLAYER_ORIGINS = [o.strip().rstrip("/") for o in os.environ.get("FYC_PLAYER_ORIGINS", "").split(",") if o.strip()]
+# Clone each session's profile from a warmed template (cookies accepted, cache primed)
+PROFILE_TEMPLATE = _env_bool("FYC_PROFILE_TEMPLATE", True)
+# Rebuild the template once it is older than this (hours)
+PROFILE_TEMPLATE_MAX_AGE_HOURS = _env_float("FYC_PROFILE_TEMPLATE_MAX_AGE_HOURS", 24)
+# Where templates and per-session clones are kept
+PROFILE_DIR = os.environ.get("FYC_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "fyc_automation_profiles"))
+# Number of warm browser sessions kept per worker
+DRIVER_POOL_SIZE = _env_int("FYC_DRIVER_POOL_SIZE", 1)
+# Seconds acquiring a pooled session may wait before failing the scenario
+DRIVER_ACQUIRE_TIMEOUT = _env_float("FYC_DRIVER_ACQUIRE_TIMEOUT", 120)
+# Recycle a session after this many scenarios (0 = never)
+DRIVER_MAX_USES = _env_int("FYC_DRIVER_MAX_USES", 20)
+# Recycle a session once its page JS heap exceeds this many MB (0 = never)
+DRIVER_MAX_MEMORY_MB = _env_int("FYC_DRIVER_MAX_MEMORY_MB", 512)
+# Content-addressed chromedriver cache used by utils/driver_resolver.py
+DRIVER_CACHE_DIR = os.environ.get(
+    "FYC_DRIVER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "fyc_automation", "chromedriver")
+)
+# Never download: fail when the cache has no chromedriver for the installed Chrome
+DRIVER_OFFLINE = _env_bool("FYC_DRIVER_OFFLINE")
+
+# ---------------------------------------------------------------- screenshots
+# always | on-failure | sampled
+SCREENSHOT_MODE = os.environ.get("FYC_SCREENSHOT_MODE", "always")
+# Share of passing steps captured in 'sampled' mode
+SCREENSHOT_SAMPLE_RATE = _env_float("FYC_SCREENSHOT_SAMPLE_RATE", 0.2)
+# jpeg | webp | png
+SCREENSHOT_FORMAT = os.environ.get("FYC_SCREENSHOT_FORMAT", "jpeg")
+# Compression quality (0-100) for jpeg/webp
+SCREENSHOT_QUALITY = _env_int("FYC_SCREENSHOT_QUALITY", 70)
+# Optional 'x,y,width,height' region to capture instead of the full viewport
+SCREENSHOT_CLIP = _env_clip("FYC_SCREENSHOT_CLIP")
+# Scale factor applied to the clipped region
+SCREENSHOT_SCALE = _env_float("FYC_SCREENSHOT_SCALE", 1.0)
+# Screenshot runs older than this many days are pruned (0 = keep)
+SCREENSHOT_RETENTION_DAYS = _env_float("FYC_SCREENSHOT_RETENTION_DAYS", 7)
+# Number of most recent screenshot runs kept (0 = unlimited)
+SCREENSHOT_RETENTION_RUNS = _env_int("FYC_SCREENSHOT_RETENTION_RUNS", 20)
+# Upper bound on stored screenshot bytes (0 = unlimited)
+SCREENSHOT_RETENTION_BYTES = _env_int("FYC_SCREENSHOT_RETENTION_MB", 500) * 1024 * 1024
+
+# ---------------------------------------------------------------- instrumentation
+# Time steps, page methods, WebDriver round-trips, waits, sleeps and scripts
+TIMING_ENABLED = _env_bool("FYC_TIMING", True)
+# Where per-worker timing summaries (JSON/CSV) are written
+TIMINGS_DIR = os.environ.get("FYC_TIMINGS_DIR", os.path.join("reports", "timings"))
+
+# ---------------------------------------------------------------- video QoE
+# Collect time-to-first-frame, stalls, dropped frames and playback rate
+QOE_ENABLED = _env_bool("FYC_QOE", True)
+# Where per-worker QoE records (one JSON line per scenario) are written
+QOE_DIR = os.environ.get("FYC_QOE_DIR", os.path.join("reports", "qoe"))
+# Fail 'the video playback quality is within thresholds' on a violation; otherwise
+# (and for scenarios without a @qoe tag) violations are only recorded and logged
+QOE_ENFORCE = _env_bool("FYC_QOE_ENFORCE")
+# Pass/fail thresholds (0 disables a threshold)
+QOE_MAX_TTFF_MS = _env_float("FYC_QOE_MAX_TTFF_MS", 5000)
+QOE_MAX_STALLS = _env_int("FYC_QOE_MAX_STALLS", 3)
+QOE_MAX_STALL_MS = _env_float("FYC_QOE_MAX_STALL_MS", 3000)
+QOE_MAX_DROPPED_PCT = _env_float("FYC_QOE_MAX_DROPPED_PCT", 5)
+QOE_MIN_PLAYBACK_RATE = _env_float("FYC_QOE_MIN_PLAYBACK_RATE", 0.9)
+# Longest time (ms) from a rendition click until playback resumes at the new size
+QOE_MAX_SWITCH_MS = _env_float("FYC_QOE_MAX_SWITCH_MS", 5000)
+
+# ---------------------------------------------------------------- page timing
+# Collect Navigation/Resource Timing and LCP after page loads
+PAGE_TIMING_ENABLED = _env_bool("FYC_PAGE_TIMING", True)
+# Where per-worker page timing records (one JSON line per page load) are written
+PAGE_TIMING_DIR = os.environ.get("FYC_PAGE_TIMING_DIR", os.path.join("reports", "page_timing"))
+# How many of the slowest resources are kept per page
+PAGE_TIMING_TOP = _env_int("FYC_PAGE_TIMING_TOP", 5)
+# Budgets (ms from navigation start; 0 disables a budget)
+PAGE_BUDGET_TTFB_MS = _env_float("FYC_PAGE_BUDGET_TTFB_MS", 800)
+PAGE_BUDGET_DCL_MS = _env_float("FYC_PAGE_BUDGET_DCL_MS", 2500)
+PAGE_BUDGET_LOAD_MS = _env_float("FYC_PAGE_BUDGET_LOAD_MS", 4000)
+PAGE_BUDGET_LCP_MS = _env_float("FYC_PAGE_BUDGET_LCP_MS", 2500)
+
+# ---------------------------------------------------------------- network
+# DevTools network profile applied to every scenario (see utils/network_emulation.py)
+NETWORK_PROFILE = os.environ.get("FYC_NETWORK_PROFILE", "none")
+# Where per-worker offline blip records (one JSON line per scenario) are written
+NETWORK_BLIPS_DIR = os.environ.get("FYC_NETWORK_BLIPS_DIR", os.path.join("reports", "network_blips"))
+# Record a HAR per scenario from Chrome's performance log
+HAR_ENABLED = _env_bool("FYC_HAR", False)
+# Where HAR files are written
+HAR_DIR = os.environ.get("FYC_HAR_DIR", os.path.join("reports", "har"))
+
+# ---------------------------------------------------------------- protocol client
+# Run @protocol scenarios: login and catalog over HTTP, no browser (utils/protocol_client.py)
+PROTOCOL_ENABLED = _env_bool("FYC_PROTOCOL", False)
+# Keep-alive connections shared by all protocol sessions of a worker
+PROTOCOL_MAX_CONNECTIONS = _env_int("FYC_PROTOCOL_MAX_CONNECTIONS", 64)
+# Timeout (seconds) for one protocol request, connect included
+PROTOCOL_TIMEOUT = _env_float("FYC_PROTOCOL_TIMEOUT", 15)
+
+# ---------------------------------------------------------------- session mode
+# process: one Chrome per session | context: isolated browser contexts in shared Chrome processes
+SESSION_MODE = os.environ.get("FYC_SESSION_MODE", "process")
+# Browser contexts per host Chrome in context mode
+CONTEXTS_PER_BROWSER = _env_int("FYC_CONTEXTS_PER_BROWSER", 8)
+
+# ---------------------------------------------------------------- scheduling
+# Scenario outcomes and durations of past runs, used to order the next run (utils/scenario_history.py)
+SCENARIO_HISTORY = os.environ.get("FYC_SCENARIO_HISTORY", os.path.join("reports", "scenario_history.json"))
+# A failure within this many latest runs of a scenario counts as recent
+RECENT_FAILURE_RUNS = _env_int("FYC_RECENT_FAILURE_RUNS", 3)
@@ -0,0 +1,212 @@
+# utils/driver_pool.py
+"""
+Pool of warm WebDriver sessions.
+
+Sessions are launched up front and handed out one per scenario. When a scenario
+finishes its session is reset (frames, extra windows, cookies and storage) and
+put back, so the next scenario does not pay for a fresh browser launch. A session
+is retired and replaced in the background after `max_uses` scenarios or once its
+page memory exceeds `max_memory_mb`. If a replacement fails to launch, the next
+acquire() launches one itself instead of waiting for a session that never comes,
+and acquire() gives up after `acquire_timeout` seconds (FYC_DRIVER_ACQUIRE_TIMEOUT).
+
+Usage:
+    pool = DriverPool(create_driver, size=2)
+    driver = pool.acquire()
+    ...
+    pool.release(driver)
+    pool.close()
+"""
+
+import queue
+import threading
+import time
+from utils import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MEMORY_SCRIPT = (
+    "return (window.performance && performance.memory) ? performance.memory.usedJSHeapSize : 0;"
+)
+
+
+class DriverPool:
+    def __init__(self, factory, size=1, max_uses=20, max_memory_mb=0, on_quit=None, lazy=False):
+        """
+        :param factory: callable returning a new, fully configured WebDriver
+        :param on_quit: optional callable(driver) run after a session has quit (e.g. profile cleanup)
+        :param lazy: launch the sessions on the first acquire() instead of now
+        :param size: number of sessions kept warm
+        :param max_uses: recycle a session after this many scenarios (0 = never)
+        :param max_memory_mb: recycle a session once its JS heap exceeds this (0 = never)
+        """
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.on_quit = on_quit
+        self._idle = queue.Queue()
+        self._uses = {}
+        self._lock = threading.Lock()
+        self._warm_lock = threading.Lock()
+        self._launchers = []
+        self._pending = 0  # launches in progress
+        self._failed = 0  # launches that raised
+        self._closed = False
+        self._warmed = False
+
+        if not lazy:
+            self._warm()
+
+    def _warm(self):
+        for _ in range(self.size):
+            with self._lock:
+                self._pending += 1
+            self._launch()
+        self._warmed = True
+        logger.info(f"✅ Driver pool warmed with {self.size} session(s)")
+
+    def _launch(self, idle=True):
+        """Start a session the caller has counted in _pending; put it in the idle queue unless `idle` is False."""
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+                self._failed += 1
+            raise
+        with self._lock:
+            self._pending -= 1
+            self._uses[driver] = 0
+        if idle:
+            self._idle.put(driver)
+        return driver
+
+    def _launch_in_background(self):
+        def launch():
+            try:
+                self._launch()
+            except Exception as e:
+                logger.error(f"❌ Failed to launch replacement browser session: {e}")
+
+        with self._lock:
+            self._pending += 1
+        thread = threading.Thread(target=launch, name="driver-pool-launcher", daemon=True)
+        thread.start()
+        self._launchers.append(thread)
+
+    def _reserve_missing(self):
+        """Count a launch for a session that is neither alive nor launching (a launch failed)."""
+        with self._lock:
+            if len(self._uses) + self._pending >= self.size:
+                return False
+            self._pending += 1
+            return True
+
+    def acquire(self, timeout=None):
+        """
+        Return a warm session, waiting for a release or a background launch if
+        none is idle. When a session is missing because its launch failed, one
+        is launched here (a failure raises). Raises TimeoutError after `timeout`
+        seconds (default FYC_DRIVER_ACQUIRE_TIMEOUT).
+        """
+        if not self._warmed:
+            with self._warm_lock:
+                if not self._warmed:
+                    self._warm()
+        timeout = config.DRIVER_ACQUIRE_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                driver = self._idle.get(timeout=max(0.0, min(1.0, deadline - time.monotonic())))
+                break
+            except queue.Empty:
+                pass
+            if self._reserve_missing():
+                logger.warning(f"⚠️ No browser session launching ({self._failed} launch(es) failed), launching one now")
+                driver = self._launch(idle=False)
+                break
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"No browser session became available within {timeout:.0f}s")
+        with self._lock:
+            self._uses[driver] += 1
+        return driver
+
+    def release(self, driver):
+        """Reset a session and return it to the pool, or retire it if it is worn out."""
+        if self._closed:
+            self._quit(driver)
+            return
+        if self._should_recycle(driver) or not self.reset(driver):
+            # Count the replacement before the retired session stops counting
+            self._launch_in_background()
+            self._retire(driver)
+            return
+        self._idle.put(driver)
+
+    def _should_recycle(self, driver):
+        uses = self._uses.get(driver, 0)
+        if self.max_uses and uses >= self.max_uses:
+            logger.info(f"Recycling browser session after {uses} use(s)")
+            return True
+        if self.max_memory_mb:
+            try:
+                used_mb = (driver.execute_script(MEMORY_SCRIPT) or 0) / (1024 * 1024)
+            except Exception:
+                return True
+            if used_mb >= self.max_memory_mb:
+                logger.info(f"Recycling browser session using {used_mb:.0f} MB of JS heap")
+                return True
+        return False
+
+    @staticmethod
+    def reset(driver):
+        """
+        Bring a session back to a clean state: leave any iframe, close extra
+        windows, clear cookies, localStorage and sessionStorage, and load a blank page.
+        The site's cookie consent goes with them: every scenario after the
+        first on a session starts as a new visitor and accepts the banner again.
+        """
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.switch_to.default_content()
+            driver.delete_all_cookies()
+            driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+            )
+            driver.get("about:blank")
+            logger.info("✅ Browser session reset for reuse")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to reset browser session, it will be replaced: {e}")
+            return False
+
+    def _retire(self, driver):
+        with self._lock:
+            self._uses.pop(driver, None)
+        self._quit(driver)
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.error(f"Error closing browser: {e}")
+        if self.on_quit:
+            self.on_quit(driver)
+
+    def close(self):
+        """Quit every session owned by the pool."""
+        self._closed = True
+        for thread in self._launchers:
+            thread.join()
+        with self._lock:
+            drivers = list(self._uses)
+            self._uses.clear()
+        for driver in drivers:
+            self._quit(driver)
+        logger.info(f"Driver pool closed ({len(drivers)} session(s) quit)")
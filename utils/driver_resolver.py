@@ -0,0 +1,238 @@
+# utils/driver_resolver.py
+"""
+Offline chromedriver resolution.
+
+Drivers are kept in a content-addressed on-disk cache:
+
+    <cache>/blobs/<sha256>/chromedriver     the driver binary
+    <cache>/index.json                      {"<chrome major>": {"sha256": ..., "version": ...}}
+
+`resolve_driver_path()` matches the installed Chrome major version against the
+index and returns the cached binary without touching the network. On a cache
+miss it downloads the driver once through webdriver-manager and imports it
+into the cache, unless the run is offline (FYC_DRIVER_OFFLINE=1 or
+download=False), in which case a miss is an error.
+
+Parallel workers may share the cache: binaries are copied to a temporary file
+and renamed into place, and index updates are merged under a lock file.
+
+Seed the cache on an air-gapped runner:
+    python -m utils.driver_resolver --import /path/to/chromedriver
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from utils import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DRIVER_NAME = "chromedriver.exe" if sys.platform.startswith("win") else "chromedriver"
+
+CHROME_COMMANDS = [
+    "google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+VERSION_PATTERN = re.compile(r"(\d+)\.(\d+)\.(\d+)\.(\d+)")
+
+_resolved_path = None
+
+
+def _read_version(command):
+    try:
+        output = subprocess.run(
+            [command, "--version"], capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_PATTERN.search(output)
+    return match.group(0) if match else None
+
+
+def detect_chrome_version():
+    """Return the installed Chrome version string (e.g. '129.0.6668.58') or None."""
+    candidates = [os.environ["CHROME_BINARY"]] if os.environ.get("CHROME_BINARY") else CHROME_COMMANDS
+    for command in candidates:
+        version = _read_version(command)
+        if version:
+            return version
+    return None
+
+
+def _major(version):
+    return version.split(".")[0] if version else None
+
+
+def _index_path(cache_dir):
+    return os.path.join(cache_dir, "index.json")
+
+
+def load_index(cache_dir=None):
+    cache_dir = cache_dir or config.DRIVER_CACHE_DIR
+    try:
+        with open(_index_path(cache_dir), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+@contextmanager
+def _index_lock(cache_dir):
+    """Hold an exclusive lock on the cache index across processes."""
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, "index.lock"), "a+b") as f:
+        if sys.platform.startswith("win"):
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if sys.platform.startswith("win"):
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _update_index(cache_dir, major, entry):
+    """Merge one entry into the index, re-reading it under the lock so concurrent imports are kept."""
+    with _index_lock(cache_dir):
+        index = load_index(cache_dir)
+        index[major] = entry
+        fd, tmp_path = tempfile.mkstemp(prefix="index.", suffix=".tmp", dir=cache_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(index, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, _index_path(cache_dir))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _blob_path(cache_dir, sha256):
+    return os.path.join(cache_dir, "blobs", sha256, DRIVER_NAME)
+
+
+def import_driver(driver_path, cache_dir=None):
+    """
+    Copy a chromedriver binary into the cache and index it under its own major version.
+    Returns the cached path.
+    """
+    cache_dir = cache_dir or config.DRIVER_CACHE_DIR
+    version = _read_version(driver_path)
+    if not version:
+        raise RuntimeError(f"Could not read chromedriver version from {driver_path}")
+
+    sha256 = _sha256(driver_path)
+    blob = _blob_path(cache_dir, sha256)
+    if not os.path.exists(blob):
+        # Copy next to the blob and rename, so other workers never see a partial binary
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{DRIVER_NAME}.", dir=os.path.dirname(blob))
+        os.close(fd)
+        try:
+            shutil.copy2(driver_path, tmp_path)
+            os.chmod(tmp_path, os.stat(tmp_path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+            os.replace(tmp_path, blob)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    _update_index(cache_dir, _major(version), {"sha256": sha256, "version": version})
+    logger.info(f"✅ Cached chromedriver {version} as {sha256[:12]}")
+    return blob
+
+
+def _lookup(major, cache_dir):
+    entry = load_index(cache_dir).get(major)
+    if not entry:
+        return None
+    blob = _blob_path(cache_dir, entry["sha256"])
+    return blob if os.path.exists(blob) else None
+
+
+def _download():
+    # Imported lazily so offline runs never load webdriver-manager
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def resolve_driver_path(download=None, cache_dir=None):
+    """
+    Return a chromedriver path for the installed Chrome.
+
+    Resolution order: CHROMEDRIVER_PATH env var, then the on-disk cache for the
+    installed Chrome major version, then (unless offline) a download that is
+    imported into the cache. The result is memoised for the rest of the process.
+    """
+    global _resolved_path
+    if _resolved_path:
+        return _resolved_path
+
+    cache_dir = cache_dir or config.DRIVER_CACHE_DIR
+    download = not config.DRIVER_OFFLINE if download is None else download
+    start = time.perf_counter()
+
+    if os.environ.get("CHROMEDRIVER_PATH"):
+        path, source = os.environ["CHROMEDRIVER_PATH"], "CHROMEDRIVER_PATH"
+    else:
+        chrome_version = detect_chrome_version()
+        major = _major(chrome_version)
+        path, source = (_lookup(major, cache_dir), "cache") if major else (None, None)
+        if not path:
+            if not download:
+                raise RuntimeError(
+                    f"No cached chromedriver for Chrome {chrome_version or '(not found)'} in {cache_dir}. "
+                    "Seed it with 'python -m utils.driver_resolver --import <path>' "
+                    "or unset FYC_DRIVER_OFFLINE to download it."
+                )
+            logger.info(f"Downloading chromedriver for Chrome {chrome_version}...")
+            path, source = import_driver(_download(), cache_dir), "download"
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info(f"✅ Resolved chromedriver from {source} in {elapsed_ms:.0f} ms: {path}")
+    _resolved_path = path
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the offline chromedriver cache.")
+    parser.add_argument("--import", dest="import_path", help="Add an existing chromedriver binary to the cache")
+    parser.add_argument("--offline", action="store_true", help="Fail instead of downloading if the cache has no match")
+    parser.add_argument("--list", action="store_true", help="Print the cache index")
+    args = parser.parse_args(argv)
+
+    if args.import_path:
+        print(import_driver(args.import_path))
+    elif args.list:
+        print(json.dumps(load_index(), indent=2, sort_keys=True))
+    else:
+        print(resolve_driver_path(download=False if args.offline else None))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
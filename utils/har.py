@@ -0,0 +1,159 @@
+# utils/har.py
+"""
+Per-scenario HAR capture from Chrome's performance log.
+
+The driver is created with goog:loggingPrefs {"performance": "ALL"} when
+FYC_HAR is on, so Chrome logs the DevTools Network.* events. start() drops
+the events logged before the scenario; write() turns the rest into a HAR 1.2
+file in reports/har/.
+
+HAR files contain request headers and cookies (including session tokens), so
+they stay in the local reports directory and are not attached to Allure.
+
+Usage:
+    recorder = HarRecorder(driver)
+    recorder.start()
+    ...
+    recorder.write("Complete video playback automation")
+"""
+
+import json
+import os
+import re
+from datetime import datetime, timezone
+from utils import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _headers(headers):
+    return [{"name": name, "value": str(value)} for name, value in (headers or {}).items()]
+
+
+def _iso(wall_time):
+    # Fixed precision, so entries sort by time as strings
+    return datetime.fromtimestamp(wall_time, tz=timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _timings(response):
+    """HAR timings (ms) from a DevTools ResourceTiming; -1 where not applicable."""
+    timing = response.get("timing")
+    if not timing:
+        return {"blocked": -1, "dns": -1, "connect": -1, "ssl": -1, "send": 0, "wait": 0, "receive": 0}
+
+    def span(start, end):
+        return round(timing[end] - timing[start], 3) if timing.get(start, -1) >= 0 else -1
+
+    return {
+        "blocked": -1,
+        "dns": span("dnsStart", "dnsEnd"),
+        "connect": span("connectStart", "connectEnd"),
+        "ssl": span("sslStart", "sslEnd"),
+        "send": max(0, span("sendStart", "sendEnd")),
+        "wait": max(0, round(timing.get("receiveHeadersEnd", 0) - timing.get("sendEnd", 0), 3)),
+        "receive": 0,
+    }
+
+
+def build_har(events):
+    """Build a HAR 1.2 document from DevTools Network.* events, in request order."""
+    entries = {}
+    finished = []
+
+    def close(request_id, end_timestamp=None):
+        entry = entries.pop(request_id, None)
+        if entry is None:
+            return
+        end = end_timestamp if end_timestamp is not None else entry["_start"]
+        entry["time"] = round((end - entry["_start"]) * 1000, 3)
+        receive = entry["time"] - sum(v for v in entry["timings"].values() if v > 0)
+        entry["timings"]["receive"] = round(max(0, receive), 3)
+        del entry["_start"]
+        finished.append(entry)
+
+    def apply_response(entry, response):
+        entry["response"].update({
+            "status": response.get("status", 0),
+            "statusText": response.get("statusText", ""),
+            "httpVersion": response.get("protocol", ""),
+            "headers": _headers(response.get("headers")),
+        })
+        entry["response"]["content"]["mimeType"] = response.get("mimeType", "")
+        entry["timings"] = _timings(response)
+        entry["serverIPAddress"] = response.get("remoteIPAddress", "")
+
+    for method, params in events:
+        request_id = params.get("requestId")
+        if method == "Network.requestWillBeSent":
+            if params.get("redirectResponse") and request_id in entries:
+                apply_response(entries[request_id], params["redirectResponse"])
+                close(request_id, params["timestamp"])
+            request = params["request"]
+            entries[request_id] = {
+                "_start": params["timestamp"],
+                "startedDateTime": _iso(params.get("wallTime", 0)),
+                "time": 0,
+                "request": {
+                    "method": request.get("method", "GET"), "url": request.get("url", ""),
+                    "httpVersion": "", "headers": _headers(request.get("headers")),
+                    "queryString": [], "cookies": [], "headersSize": -1, "bodySize": -1,
+                },
+                "response": {
+                    "status": 0, "statusText": "", "httpVersion": "", "headers": [], "cookies": [],
+                    "content": {"size": 0, "mimeType": ""}, "redirectURL": "",
+                    "headersSize": -1, "bodySize": -1,
+                },
+                "cache": {},
+                "timings": _timings({}),
+            }
+        elif method == "Network.responseReceived" and request_id in entries:
+            apply_response(entries[request_id], params["response"])
+        elif method == "Network.loadingFinished" and request_id in entries:
+            entry = entries[request_id]
+            entry["response"]["bodySize"] = params.get("encodedDataLength", -1)
+            entry["response"]["content"]["size"] = params.get("encodedDataLength", 0)
+            close(request_id, params["timestamp"])
+        elif method == "Network.loadingFailed" and request_id in entries:
+            entries[request_id]["response"]["_error"] = params.get("errorText", "")
+            close(request_id, params["timestamp"])
+
+    # Requests still in flight at the end of the scenario
+    for request_id in list(entries):
+        close(request_id)
+    finished.sort(key=lambda entry: entry["startedDateTime"])
+    return {"log": {
+        "version": "1.2",
+        "creator": {"name": "fyc-automation", "version": "1.0"},
+        "pages": [],
+        "entries": finished,
+    }}
+
+
+class HarRecorder:
+    def __init__(self, driver, directory=None):
+        self.driver = driver
+        self.directory = directory or config.HAR_DIR
+
+    def _events(self):
+        events = []
+        for record in self.driver.get_log("performance"):
+            message = json.loads(record["message"])["message"]
+            if message["method"].startswith("Network."):
+                events.append((message["method"], message.get("params", {})))
+        return events
+
+    def start(self):
+        """Drop the network events logged before the scenario."""
+        self.driver.get_log("performance")
+
+    def write(self, name):
+        """Write the events logged since start() as <HAR_DIR>/<name>.har; returns the path."""
+        har = build_har(self._events())
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_")
+        path = os.path.join(self.directory, f"{slug}_worker{config.WORKER_ID}.har")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(har, f)
+        logger.info(f"HAR with {len(har['log']['entries'])} request(s) written to {path}")
+        return path
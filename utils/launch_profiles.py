@@ -0,0 +1,130 @@
+# utils/launch_profiles.py
+"""
+Named Chrome launch profiles.
+
+    faithful    the browser as a viewer would run it: every request goes
+                through and Chrome keeps its background features. Use it
+                for performance runs.
+    fast        for functional runs: extensions, background networking,
+                component updates, sync and similar features are disabled,
+                and analytics, web fonts, cookie-consent and monitoring
+                scripts are blocked (Network.setBlockedURLs) because no
+                test asserts on them.
+
+Blocked patterns use the DevTools '*' wildcard and can be replaced with
+FYC_BLOCK_URLS. A pattern that would match the site's own bundles (anything on
+FYC_BASE_URL) or media segments/manifests is dropped, so playback and the app
+itself always load.
+
+Usage:
+    options = build_options("fast")
+    driver = webdriver.Chrome(options=options)
+    apply_request_blocking(driver, "fast")
+"""
+
+from fnmatch import fnmatchcase
+from selenium.webdriver.chrome.options import Options
+from utils import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Arguments every profile uses (headless CI runners)
+BASE_ARGUMENTS = [
+    "--start-maximized",
+    "--headless=new",  # for Chrome 109+ use --headless=new
+    "--window-size=1920,1080",
+    "--no-sandbox",  # required for many CI environments
+    "--disable-dev-shm-usage",  # avoid /dev/shm issues
+    "--disable-gpu",  # for headless stability
+    "--force-device-scale-factor=1",  # sets page zoom to 100%
+]
+
+FAST_ARGUMENTS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-domain-reliability",
+    "--disable-client-side-phishing-detection",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--metrics-recording-only",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,InterestFeedContentSuggestions",
+]
+
+DEFAULT_BLOCKED_URLS = [
+    # analytics and tag managers
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*hotjar.com*", "*segment.io*", "*segment.com/analytics*",
+    # web fonts
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*", "*.woff", "*.woff2",
+    # cookie-consent platforms
+    "*cookielaw.org*", "*onetrust.com*", "*cookiebot.com*",
+    # monitoring / RUM beacons
+    "*sentry.io*", "*nr-data.net*", "*newrelic.com*",
+]
+
+MEDIA_EXTENSIONS = (".m3u8", ".mpd", ".mp4", ".m4s", ".ts", ".webm", ".vtt")
+# Stands for "any host": a pattern matching this media URL blocks media by type, wherever it is served from
+ANY_MEDIA_HOST = "https://media.invalid"
+
+PROFILES = {
+    "faithful": {"arguments": [], "block_urls": False},
+    "fast": {"arguments": FAST_ARGUMENTS, "block_urls": True},
+}
+
+
+def _profile(name):
+    name = config.LAUNCH_PROFILE if name is None else name
+    if name not in PROFILES:
+        raise ValueError(f"Unknown launch profile '{name}' (known: {', '.join(PROFILES)})")
+    return PROFILES[name]
+
+
+def build_options(profile=None):
+    """Return Chrome options for a launch profile (default: FYC_LAUNCH_PROFILE)."""
+    options = Options()
+    for argument in BASE_ARGUMENTS + _profile(profile)["arguments"]:
+        options.add_argument(argument)
+    return options
+
+
+def protected_urls():
+    """Sample URLs of the app, the player and their media that must never be blocked."""
+    urls = []
+    for origin in [config.BASE_URL] + config.PLAYER_ORIGINS:
+        urls += [f"{origin}/", f"{origin}/index.html"]
+        urls += [f"{origin}/media/segment{ext}" for ext in MEDIA_EXTENSIONS]
+    urls += [f"{ANY_MEDIA_HOST}/segment{ext}" for ext in MEDIA_EXTENSIONS]
+    return urls
+
+
+def blocked_url_patterns(patterns=None):
+    """
+    The patterns to block, minus any that would hit the app or player origins
+    (BASE_URL, FYC_PLAYER_ORIGINS) or media manifests/segments on any host.
+    """
+    if patterns is None:
+        patterns = config.BLOCKED_URLS or DEFAULT_BLOCKED_URLS
+    protected = protected_urls()
+    allowed = []
+    for pattern in patterns:
+        if any(fnmatchcase(url, pattern) for url in protected):
+            logger.warning(f"⚠️ Not blocking '{pattern}': it would block the app or its media")
+            continue
+        allowed.append(pattern)
+    return allowed
+
+
+def apply_request_blocking(driver, profile=None):
+    """Block the non-essential URL patterns on `driver` if the profile asks for it."""
+    if not _profile(profile)["block_urls"]:
+        return []
+    patterns = blocked_url_patterns()
+    if patterns:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        logger.info(f"Blocking {len(patterns)} non-essential URL pattern(s)")
+    return patterns
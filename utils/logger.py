@@ -4,54 +4,178 @@ Logger utility for the automation framework.
 
 Usage:
     from utils.logger import get_logger
-    logger = get_logger()
+    logger = get_logger(__name__)
     logger.info("message")
+
+Records are handed to a background listener through a queue, so the test thread
+never waits on file or console I/O. Every module gets a child of
+FYC_Automation_Logger, which allows per-module levels, e.g.
+
+    FYC_LOG_LEVELS="pages.automation_page=DEBUG,utils.waits=WARNING"
+
+Set FYC_LOG_FORMAT=json to write JSON lines carrying worker, scenario and step ids.
+Importing the module only logs to the console. The runners (run_tests.py, the
+behave before_all hook, the benchmarks) call start_file_logging() to add the
+rotating file under logs/, so importing modules, e.g. from the unit tests,
+never writes to disk. Worker processes started by run_tests.py (FYC_WORKER_ID
+set) each write their own file, logs/automation_log_worker<id>.log: a rotating
+file shared between processes loses records when one of them rolls it over.
+Prefer lazy arguments on hot paths (logger.debug("value %s", value)) so disabled
+debug messages are not even formatted.
 """
 
+import atexit
+import contextvars
+import json
 import logging
 import logging.handlers
 import os
+import queue
 from datetime import datetime
+from utils import config
 
-# Create logs directory if not present
 LOG_DIR = os.path.join(os.getcwd(), "logs")
-os.makedirs(LOG_DIR, exist_ok=True)
 
-# Build a log filename with timestamp to avoid collisions
-LOG_FILENAME = os.path.join(LOG_DIR, "automation_log.log")
+# One file per worker process; the runner and standalone behave runs use the main file
+_worker = os.environ.get("FYC_WORKER_ID")
+LOG_FILENAME = os.path.join(LOG_DIR, f"automation_log_worker{_worker}.log" if _worker else "automation_log.log")
 
-def _configure_logger():
-    """
-    Configure and return a logger instance.
-    - Writes to a rotating file (5 files, 5MB each).
-    - Also logs to console (stderr).
-    - Uses a clear format with timestamps and levels.
-    """
-    logger = logging.getLogger("FYC_Automation_Logger")
+ROOT_LOGGER_NAME = "FYC_Automation_Logger"
+
+# Scenario/step the current thread (or asyncio task) is executing, set from the behave hooks.
+# New threads start without one, so pool launchers and load-mode viewers never log under another's.
+_log_context = contextvars.ContextVar("log_context", default=(None, None))
+
+_listener = None
+_file_handler = None
+
+
+def set_log_context(scenario=None, step=None):
+    """Record the scenario and step that subsequent log records of this thread belong to."""
+    _log_context.set((scenario, step))
 
-    # If already configured (e.g., multiple imports), return existing logger
-    if logger.handlers:
-        return logger
 
-    logger.setLevel(logging.INFO)
+class ContextFilter(logging.Filter):
+    """Attach worker, scenario and step ids to every record."""
 
+    def filter(self, record):
+        record.worker = config.WORKER_ID
+        record.scenario, record.step = _log_context.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.utcfromtimestamp(record.created).isoformat(timespec="milliseconds") + "Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "worker": getattr(record, "worker", None),
+            "scenario": getattr(record, "scenario", None),
+            "step": getattr(record, "step", None),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _build_file_handler():
     # File handler with rotation
     file_handler = logging.handlers.RotatingFileHandler(
         LOG_FILENAME, maxBytes=5 * 1024 * 1024, backupCount=5, encoding="utf-8"
     )
-    file_formatter = logging.Formatter(
-        "%(asctime)s - %(levelname)s - %(name)s - %(message)s", "%Y-%m-%d %H:%M:%S"
-    )
+    if config.LOG_FORMAT == "json":
+        file_formatter = JsonFormatter()
+    else:
+        file_formatter = logging.Formatter(
+            "%(asctime)s - %(levelname)s - %(name)s - %(message)s", "%Y-%m-%d %H:%M:%S"
+        )
     file_handler.setFormatter(file_formatter)
-    file_handler.setLevel(logging.INFO)
-    logger.addHandler(file_handler)
+    file_handler.setLevel(logging.DEBUG)
+    return file_handler
 
-    # Console handler
+
+def _build_console_handler():
     console_handler = logging.StreamHandler()
     console_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s", "%H:%M:%S")
     console_handler.setFormatter(console_formatter)
     console_handler.setLevel(logging.INFO)
-    logger.addHandler(console_handler)
+    return console_handler
+
+
+def _apply_module_levels():
+    """Apply FYC_LOG_LEVELS ('module=LEVEL,...') to the per-module child loggers."""
+    for item in filter(None, (part.strip() for part in config.LOG_LEVELS.split(","))):
+        module, _, level = item.partition("=")
+        logging.getLogger(f"{ROOT_LOGGER_NAME}.{module.strip()}").setLevel(level.strip().upper())
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _configure_logger():
+    """
+    Configure and return the framework's root logger, logging to the console (stderr).
+    With FYC_LOG_QUEUE enabled (default) handlers run on a background listener thread.
+    """
+    global _listener
+    logger = logging.getLogger(ROOT_LOGGER_NAME)
+
+    # If already configured (e.g., multiple imports), return existing logger
+    if logger.handlers:
+        return logger
+
+    logger.setLevel(config.LOG_LEVEL)
+    console_handler = _build_console_handler()
+
+    if config.LOG_QUEUE:
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(ContextFilter())
+        logger.addHandler(queue_handler)
+        _listener = logging.handlers.QueueListener(log_queue, console_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_stop_listener)
+    else:
+        console_handler.addFilter(ContextFilter())
+        logger.addHandler(console_handler)
+
+    _apply_module_levels()
+
+    # Prevent logging from propagating to root logger multiple times
+    logger.propagate = False
+
+    return logger
+
+
+def start_file_logging():
+    """
+    Also write the log to a rotating file under logs/ (5 files, 5MB each) for
+    the rest of the process. Called once by the runners; later calls are no-ops.
+    Returns the log file path.
+    """
+    global _file_handler
+    if _file_handler is not None:
+        return LOG_FILENAME
+    logger = _configure_logger()
+    os.makedirs(LOG_DIR, exist_ok=True)
+    _file_handler = _build_file_handler()
+
+    if _listener is not None:
+        # The listener's handlers are fixed while it runs: restart it with the file added
+        _listener.stop()
+        _listener.handlers = _listener.handlers + (_file_handler,)
+        _listener.start()
+    else:
+        _file_handler.addFilter(ContextFilter())
+        logger.addHandler(_file_handler)
 
     # Optional: also create a "latest" copy for quick access
     try:
@@ -61,17 +185,16 @@ def _configure_logger():
     except Exception:
         # Don't fail the whole framework if creating this file fails
         pass
+    return LOG_FILENAME
 
-    # Prevent logging from propagating to root logger multiple times
-    logger.propagate = False
-
-    return logger
 
-def get_logger():
+def get_logger(name=None):
     """
     Return a configured logger instance.
     Call this at the top of any module to log messages:
-        logger = get_logger()
+        logger = get_logger(__name__)
         logger.info("Starting step")
+    Without a name the shared framework logger is returned.
     """
-    return _configure_logger()
+    root = _configure_logger()
+    return root.getChild(name) if name else root
@@ -0,0 +1,177 @@
+# utils/network_emulation.py
+"""
+Network condition emulation through the Chrome DevTools protocol.
+
+A profile sets latency and throughput with Network.emulateNetworkConditions
+and can add short offline blips on a timer. Everything runs inside the local
+browser, so profiles work on a disconnected runner against stand_in.server.
+
+    none        no emulation
+    4g          40 ms, 9 Mbit/s down, 1.5 Mbit/s up
+    fast-3g     150 ms, 1.6 Mbit/s down, 750 kbit/s up
+    slow-3g     400 ms, 400 kbit/s down and up
+    flaky       150 ms, 1.5 Mbit/s, offline for 2 s every 20 s
+
+Emulation applies to the page target; out-of-process (cross-origin) iframes
+keep their own network conditions.
+
+Blips are switched from the step thread, not a timer thread: ChromeDriver runs
+one command per session at a time, so a command from another thread queues
+behind a step's blocking wait and fires late, at an arbitrary point. tick() is
+registered as the thread's wait ticker (utils/wait_budget.py), so every wait
+switches the network on schedule between its round-trips and push waits return
+in time for the next switch. Only a command that itself blocks (a page load)
+can delay a switch; the actual switch times, their lateness and any missed
+blips are recorded per scenario in reports/network_blips/.
+
+Usage:
+    emulation = NetworkEmulation(driver, "slow-3g")
+    emulation.start()
+    ...
+    emulation.stop()
+    write_record(scenario_name, emulation.summary())
+"""
+
+import json
+import os
+import time
+from utils import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _kbps(kilobits):
+    """Kilobits per second to the bytes per second DevTools expects."""
+    return kilobits * 1000 / 8
+
+
+PROFILES = {
+    "none": None,
+    "4g": {"latency": 40, "download": _kbps(9000), "upload": _kbps(1500)},
+    "fast-3g": {"latency": 150, "download": _kbps(1600), "upload": _kbps(750)},
+    "slow-3g": {"latency": 400, "download": _kbps(400), "upload": _kbps(400)},
+    "flaky": {"latency": 150, "download": _kbps(1500), "upload": _kbps(750),
+              "blip_every": 20, "blip_duration": 2},
+}
+
+
+class NetworkEmulation:
+    def __init__(self, driver, profile):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown network profile '{profile}' (known: {', '.join(PROFILES)})")
+        self.driver = driver
+        self.profile = profile
+        self.settings = PROFILES[profile]
+        self.blips = []  # {"window", "scheduled_s", "offline_at_s", "online_at_s", "late_s"}
+        self.missed = 0
+        self._started = None
+        self._offline = False
+        self._last_window = 0
+
+    def _emulate(self, offline=False):
+        self.driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+            "offline": offline,
+            "latency": self.settings["latency"],
+            "downloadThroughput": self.settings["download"],
+            "uploadThroughput": self.settings["upload"],
+        })
+
+    def start(self):
+        """Apply the profile and schedule the offline blips, if the profile has any."""
+        if self.settings is None:
+            return
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self._emulate()
+        if self.settings.get("blip_every"):
+            # Imported here so run_tests.py can read PROFILES without selenium
+            from utils.wait_budget import set_ticker
+            self._started = time.monotonic()
+            set_ticker(self.tick)
+        logger.info(f"Network profile '{self.profile}' applied: {self.settings}")
+
+    def _passed_windows(self, elapsed):
+        """Number of blip windows that have ended by `elapsed`."""
+        every, duration = self.settings["blip_every"], self.settings["blip_duration"]
+        return max(0, int((elapsed - duration) // every))
+
+    def tick(self):
+        """
+        Switch the network to the state the blip schedule calls for now, on the
+        calling (step) thread. Returns the seconds until the next switch is due.
+        """
+        if self._started is None:
+            return None
+        every, duration = self.settings["blip_every"], self.settings["blip_duration"]
+        elapsed = time.monotonic() - self._started
+        window = int(elapsed // every)
+        in_blip = window >= 1 and elapsed - window * every < duration
+        try:
+            if in_blip and not self._offline and window > self._last_window:
+                self.missed += window - self._last_window - 1
+                self._emulate(offline=True)
+                self._offline, self._last_window = True, window
+                self.blips.append({"window": window, "scheduled_s": window * every,
+                                   "offline_at_s": round(elapsed, 3), "late_s": round(elapsed - window * every, 3)})
+            elif self._offline and not in_blip:
+                self._emulate()
+                self._offline = False
+                self.blips[-1]["online_at_s"] = round(elapsed, 3)
+        except Exception as e:
+            logger.error(f"❌ Offline blip failed, no further blips in this scenario: {e}")
+            self._started = None
+            return None
+        if self._offline:
+            return max(0.0, self._last_window * every + duration - elapsed)
+        return max(0.0, (window + 1) * every - elapsed)
+
+    def summary(self):
+        """Blips of the scenario: actual switch times (s from start), lateness and missed windows."""
+        late = [blip["late_s"] for blip in self.blips]
+        return {
+            "profile": self.profile,
+            "blips": self.blips,
+            "missed": self.missed,
+            "max_late_s": max(late) if late else None,
+        }
+
+    def stop(self):
+        """Stop the blips and remove the emulation, so the session can go back to the pool."""
+        if self.settings is None:
+            return
+        if self._started is not None:
+            from utils.wait_budget import set_ticker
+            set_ticker(None)
+            self.missed += max(0, self._passed_windows(time.monotonic() - self._started) - self._last_window)
+            self._started = None
+            if self.blips or self.missed:
+                logger.info(f"Network blips: {len(self.blips)} applied, {self.missed} missed, "
+                            f"latest {self.summary()['max_late_s']}s late")
+        try:
+            self.driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+                "offline": False, "latency": 0, "downloadThroughput": -1, "uploadThroughput": -1,
+            })
+        except Exception as e:
+            logger.error(f"❌ Could not clear network emulation: {e}")
+
+
+def write_record(scenario, summary, directory=None):
+    """Append one JSON line for `scenario` to reports/network_blips/blips_worker<id>.jsonl."""
+    directory = directory or config.NETWORK_BLIPS_DIR
+    os.makedirs(directory, exist_ok=True)
+    record = dict(summary, scenario=scenario)
+    with open(os.path.join(directory, f"blips_worker{config.WORKER_ID}.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    return record
+
+
+def load_records(directory):
+    """Read every blip record written to `directory`."""
+    records = []
+    if not os.path.isdir(directory):
+        return records
+    for name in sorted(os.listdir(directory)):
+        if name.startswith("blips_worker") and name.endswith(".jsonl"):
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                records.extend(json.loads(line) for line in f if line.strip())
+    return records
@@ -0,0 +1,142 @@
+# utils/page_timing.py
+"""
+Page-load performance from the browser's Navigation and Resource Timing.
+
+collect() reads, in one async script call, the navigation entry of the
+current document and its resource entries, plus the largest contentful paint
+(from a buffered PerformanceObserver):
+
+    ttfb_ms                 responseStart of the navigation
+    dom_content_loaded_ms   domContentLoadedEventEnd
+    load_ms                 loadEventEnd (None while the load event is pending)
+    lcp_ms                  startTime of the last largest-contentful-paint entry
+    slowest_resources       the FYC_PAGE_TIMING_TOP slowest resources
+
+All times are in ms from the start of the navigation. record() compares them
+with the FYC_PAGE_BUDGET_* budgets, attaches them to Allure and appends one JSON
+line per page to reports/page_timing/page_timing_worker<id>.jsonl.
+
+Usage:
+    from utils import page_timing
+    metrics = page_timing.collect(driver)
+    page_timing.record("login", metrics)
+"""
+
+import json
+import os
+import time
+import allure
+from utils import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Buffered LCP entries are delivered asynchronously, hence the short delay
+COLLECT_SCRIPT = """
+var top = arguments[0], done = arguments[arguments.length - 1];
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource').map(function (r) {
+    return {
+        name: r.name, type: r.initiatorType, duration_ms: r.duration,
+        ttfb_ms: r.responseStart > 0 ? r.responseStart - r.startTime : null,
+        transfer_bytes: r.transferSize
+    };
+});
+resources.sort(function (a, b) { return b.duration_ms - a.duration_ms; });
+var lcp = null;
+try {
+    new PerformanceObserver(function (list) {
+        var entries = list.getEntries();
+        lcp = entries[entries.length - 1].startTime;
+    }).observe({type: 'largest-contentful-paint', buffered: true});
+} catch (e) {}
+setTimeout(function () {
+    done({
+        url: nav ? nav.name : location.href,
+        navigation_type: nav ? nav.type : null,
+        ttfb_ms: nav ? nav.responseStart : null,
+        dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : null,
+        load_ms: nav && nav.loadEventEnd > 0 ? nav.loadEventEnd : null,
+        lcp_ms: lcp,
+        transfer_bytes: nav ? nav.transferSize : null,
+        resource_count: resources.length,
+        slowest_resources: resources.slice(0, top)
+    });
+}, 50);
+"""
+
+METRICS = ("ttfb_ms", "dom_content_loaded_ms", "load_ms", "lcp_ms")
+
+
+def budgets():
+    """Current page-load budgets in ms (a budget <= 0 is disabled)."""
+    return {
+        "ttfb_ms": config.PAGE_BUDGET_TTFB_MS,
+        "dom_content_loaded_ms": config.PAGE_BUDGET_DCL_MS,
+        "load_ms": config.PAGE_BUDGET_LOAD_MS,
+        "lcp_ms": config.PAGE_BUDGET_LCP_MS,
+    }
+
+
+def collect(driver, top=None):
+    """Return the navigation/resource timing of the current document."""
+    top = config.PAGE_TIMING_TOP if top is None else top
+    metrics = driver.execute_async_script(COLLECT_SCRIPT, top) or {}
+    for name in METRICS:
+        if metrics.get(name) is not None:
+            metrics[name] = round(metrics[name], 1)
+    for resource in metrics.get("slowest_resources", []):
+        resource["duration_ms"] = round(resource["duration_ms"], 1)
+        if resource["ttfb_ms"] is not None:
+            resource["ttfb_ms"] = round(resource["ttfb_ms"], 1)
+    return metrics
+
+
+def evaluate(metrics, limits=None):
+    """Return a list of human-readable budget violations for `metrics`."""
+    limits = budgets() if limits is None else limits
+    violations = []
+    for name in METRICS:
+        limit, value = limits.get(name), metrics.get(name)
+        if limit and limit > 0 and value is not None and value > limit:
+            violations.append(f"{name} {value} > {limit}")
+    return violations
+
+
+def record(page, metrics, directory=None):
+    """Check `metrics` against the budgets, attach them to Allure and append them to the run's JSONL."""
+    violations = evaluate(metrics)
+    entry = {
+        "timestamp": time.time(),
+        "worker": config.WORKER_ID,
+        "page": page,
+        "metrics": metrics,
+        "budgets": budgets(),
+        "violations": violations,
+    }
+    directory = directory or config.PAGE_TIMING_DIR
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, f"page_timing_worker{config.WORKER_ID}.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    allure.attach(json.dumps(entry, indent=2), name=f"page timing: {page}",
+                  attachment_type=allure.attachment_type.JSON)
+
+    logger.info(
+        f"Page timing '{page}': TTFB {metrics.get('ttfb_ms')} ms, DCL {metrics.get('dom_content_loaded_ms')} ms, "
+        f"load {metrics.get('load_ms')} ms, LCP {metrics.get('lcp_ms')} ms"
+    )
+    for violation in violations:
+        logger.warning(f"⚠️ Page budget exceeded on '{page}': {violation}")
+    return entry
+
+
+def load_records(directory):
+    """Read every page timing record written to `directory`."""
+    records = []
+    if not os.path.isdir(directory):
+        return records
+    for name in sorted(os.listdir(directory)):
+        if name.startswith("page_timing_worker") and name.endswith(".jsonl"):
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                records.extend(json.loads(line) for line in f if line.strip())
+    return records
@@ -0,0 +1,177 @@
+# utils/profile_templates.py
+"""
+Pre-warmed Chrome user-data-dir templates.
+
+Instead of starting every session on an empty profile, a template profile is
+built once per site / launch profile / Chrome version (the login page loaded,
+the cookie banner accepted and the HTTP cache primed) and cloned for each
+session. Clones are removed when their session quits.
+
+    <FYC_PROFILE_DIR>/templates/<key>/      the warmed template
+    <FYC_PROFILE_DIR>/clones/<worker>_*/    one clone per live session
+
+Cloning uses copy-on-write where the filesystem supports it (cp --reflink on
+Linux, clonefile via cp -c on macOS) and falls back to a plain copy. Hard links
+are not used: Chrome rewrites its SQLite databases and cache index in place,
+which would modify the template through the link.
+
+Parallel workers may build the same template at the same time; each builds in
+its own directory and the first rename wins.
+
+Usage:
+    templates = ProfileTemplates()
+    profile_dir = templates.clone(warm_profile)   # warm_profile(dir) builds a template
+    driver = launch(profile_dir)
+    templates.register(driver, profile_dir)
+    ...
+    templates.discard(driver)                     # after driver.quit()
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from utils import config
+from utils.driver_resolver import detect_chrome_version
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Files Chrome leaves behind only while a profile is in use
+TRANSIENT_FILES = ("SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile")
+
+
+def template_key(*parts):
+    return hashlib.sha256("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:16]
+
+
+def _copy_tree(source, target):
+    """Clone `source` to `target`, copy-on-write where the platform supports it."""
+    if sys.platform == "darwin":
+        command = ["cp", "-cR"]
+    elif sys.platform.startswith("linux"):
+        command = ["cp", "-a", "--reflink=auto"]
+    else:
+        command = None
+    if command:
+        try:
+            subprocess.run(command + [source, target], check=True, capture_output=True)
+            return
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.debug(f"Copy-on-write clone failed ({e}), copying instead")
+            shutil.rmtree(target, ignore_errors=True)
+    shutil.copytree(source, target, symlinks=True)
+
+
+class ProfileTemplates:
+    def __init__(self, root=None, key=None, enabled=None, max_age_hours=None):
+        self.root = root or config.PROFILE_DIR
+        self.key = key or template_key(config.BASE_URL, config.LAUNCH_PROFILE, detect_chrome_version())
+        self.enabled = config.PROFILE_TEMPLATE if enabled is None else enabled
+        self.max_age = (config.PROFILE_TEMPLATE_MAX_AGE_HOURS if max_age_hours is None else max_age_hours) * 3600
+        self.clones_dir = os.path.join(self.root, "clones")
+        self._clones = {}
+        self._warm_clones = set()  # clones of the template (the others are empty profiles)
+        self._lock = threading.Lock()
+        self._template_failed = False
+
+    @property
+    def template_dir(self):
+        return os.path.join(self.root, "templates", self.key)
+
+    def _template_is_fresh(self):
+        try:
+            return time.time() - os.path.getmtime(self.template_dir) < self.max_age
+        except OSError:
+            return False
+
+    def ensure_template(self, builder):
+        """
+        Return the template directory, building it with builder(profile_dir) if
+        it is missing or older than FYC_PROFILE_TEMPLATE_MAX_AGE_HOURS.
+        Returns None if the template cannot be built.
+        """
+        with self._lock:
+            if self._template_is_fresh():
+                return self.template_dir
+            if self._template_failed:
+                return None
+            os.makedirs(os.path.dirname(self.template_dir), exist_ok=True)
+            build_dir = tempfile.mkdtemp(prefix=f"build_{self.key}_", dir=os.path.dirname(self.template_dir))
+            start = time.perf_counter()
+            try:
+                builder(build_dir)
+            except Exception as e:
+                shutil.rmtree(build_dir, ignore_errors=True)
+                self._template_failed = True
+                logger.error(f"❌ Could not build the profile template, using empty profiles: {e}")
+                return None
+            for name in TRANSIENT_FILES:
+                path = os.path.join(build_dir, name)
+                if os.path.lexists(path):
+                    os.remove(path)
+            try:
+                if os.path.isdir(self.template_dir) and not self._template_is_fresh():
+                    stale = f"{self.template_dir}.stale{os.getpid()}"
+                    os.rename(self.template_dir, stale)
+                    shutil.rmtree(stale, ignore_errors=True)
+                os.rename(build_dir, self.template_dir)
+                logger.info(f"✅ Profile template built in {time.perf_counter() - start:.1f}s: {self.template_dir}")
+            except OSError:
+                # Another worker renamed its template into place first
+                shutil.rmtree(build_dir, ignore_errors=True)
+            return self.template_dir if os.path.isdir(self.template_dir) else None
+
+    def clone(self, builder=None):
+        """Return a new profile directory: a clone of the template, or an empty one."""
+        os.makedirs(self.clones_dir, exist_ok=True)
+        prefix = f"fyc_worker{config.WORKER_ID}_"
+        template = self.ensure_template(builder) if self.enabled and builder else None
+        if template is None:
+            return tempfile.mkdtemp(prefix=prefix, dir=self.clones_dir)
+        target = os.path.join(self.clones_dir, f"{prefix}{os.getpid()}_{time.time_ns()}")
+        start = time.perf_counter()
+        _copy_tree(template, target)
+        logger.info(f"Cloned profile template in {(time.perf_counter() - start) * 1000:.0f} ms")
+        with self._lock:
+            self._warm_clones.add(target)
+        return target
+
+    def register(self, driver, profile_dir):
+        with self._lock:
+            self._clones[driver] = profile_dir
+
+    def is_warm(self, driver):
+        """True if the session runs on a clone of the warmed template (cookie banner accepted)."""
+        with self._lock:
+            return self._clones.get(driver) in self._warm_clones
+
+    def discard(self, driver):
+        """Remove the profile directory of a session that has quit."""
+        with self._lock:
+            profile_dir = self._clones.pop(driver, None)
+            self._warm_clones.discard(profile_dir)
+        if profile_dir:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+    def prune(self, max_age_hours=12):
+        """Remove clones left behind by crashed runs (older than `max_age_hours`)."""
+        if not os.path.isdir(self.clones_dir):
+            return 0
+        cutoff = time.time() - max_age_hours * 3600
+        removed = 0
+        for name in os.listdir(self.clones_dir):
+            path = os.path.join(self.clones_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            logger.info(f"Removed {removed} stale profile clone(s)")
+        return removed
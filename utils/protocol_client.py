@@ -0,0 +1,284 @@
+# utils/protocol_client.py
+"""
+Browser-free client for the PIN login and title catalog.
+
+Reproduces at the HTTP level what LoginPage.login and the "All Titles"
+navigation make the browser do:
+
+    GET  /login                      login page
+    POST /api/login {"pin": ...}     sets the session cookie, returns {"redirect": "/titles"}
+    GET  /titles, GET /api/titles    catalog page and its title list
+    GET  /projects/<slug>            a title's project page
+    GET  /logout                     clears the session
+
+Requests go over a pool of keep-alive HTTP/1.1 connections (asyncio streams,
+no extra dependency) shared by any number of sessions; each session only holds
+its own cookies, so thousands of them fit in one runner.
+
+The endpoints are those of stand_in/server.py, which is what this client is
+validated against.
+
+Usage (async, for load):
+    pool = ConnectionPool(config.BASE_URL)
+    session = ProtocolSession(pool)
+    await session.launch()
+    await session.login("WVMVHWBS")
+    await session.open_title("Test Automation Project")
+    await session.logout()
+    await pool.close()
+
+Usage (sync, from behave steps):
+    viewer = ProtocolViewer()
+    viewer.login("WVMVHWBS")
+    viewer.close()
+"""
+
+import asyncio
+import json
+import ssl
+from http.cookies import SimpleCookie
+from urllib.parse import urljoin, urlparse
+from utils import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MAX_REDIRECTS = 5
+USER_AGENT = "fyc-protocol-client/1.0"
+
+
+class ProtocolError(Exception):
+    """A protocol step got a response the browser flow would not have."""
+
+
+class HttpResponse:
+    def __init__(self, status, reason, headers, body, url):
+        self.status = status
+        self.reason = reason
+        self.headers = headers  # lower-case name -> list of values
+        self.body = body
+        self.url = url
+
+    def header(self, name, default=None):
+        values = self.headers.get(name.lower())
+        return values[-1] if values else default
+
+    @property
+    def text(self):
+        return self.body.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.body or b"null")
+
+
+async def _read_response(reader, method):
+    """Read one HTTP/1.1 response; returns (status, reason, headers, body, keep_alive)."""
+    status_line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+    if not status_line:
+        raise ConnectionResetError("connection closed before the response")
+    version, status, reason = (status_line.split(" ", 2) + [""])[:3]
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers.setdefault(name.strip().lower(), []).append(value.strip())
+
+    status = int(status)
+    keep_alive = version == "HTTP/1.1" and "close" not in ",".join(headers.get("connection", [])).lower()
+    if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+        return status, reason, headers, b"", keep_alive
+    if "chunked" in ",".join(headers.get("transfer-encoding", [])).lower():
+        body = bytearray()
+        while True:
+            size = int((await reader.readline()).split(b";")[0].strip(), 16)
+            if size == 0:
+                # Skip trailers up to the closing blank line
+                while (await reader.readline()).strip():
+                    pass
+                break
+            body += await reader.readexactly(size)
+            await reader.readexactly(2)
+        return status, reason, headers, bytes(body), keep_alive
+    if "content-length" in headers:
+        return status, reason, headers, await reader.readexactly(int(headers["content-length"][-1])), keep_alive
+    # No framing: the body runs to the end of the connection
+    return status, reason, headers, await reader.read(), False
+
+
+class ConnectionPool:
+    def __init__(self, base_url=None, max_connections=None, timeout=None):
+        """
+        :param base_url: site to talk to (default: FYC_BASE_URL)
+        :param max_connections: cap on open connections; requests beyond it wait
+        :param timeout: seconds per request, connect included
+        """
+        self.base_url = (base_url or config.BASE_URL).rstrip("/")
+        parsed = urlparse(self.base_url)
+        self.host = parsed.hostname
+        self.tls = parsed.scheme == "https"
+        self.port = parsed.port or (443 if self.tls else 80)
+        self.host_header = parsed.netloc
+        self.timeout = config.PROTOCOL_TIMEOUT if timeout is None else timeout
+        self._slots = asyncio.Semaphore(config.PROTOCOL_MAX_CONNECTIONS if max_connections is None else max_connections)
+        self._idle = []
+        self.opened = 0
+
+    async def _connect(self):
+        ssl_context = ssl.create_default_context() if self.tls else None
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=ssl_context)
+
+    async def _exchange(self, connection, request, method):
+        reader, writer = connection
+        writer.write(request)
+        await writer.drain()
+        return await _read_response(reader, method)
+
+    async def request(self, method, path, headers=None, body=b""):
+        """Send one request over a pooled connection and return the HttpResponse."""
+        head = [f"{method} {path} HTTP/1.1", f"Host: {self.host_header}", f"User-Agent: {USER_AGENT}",
+                "Connection: keep-alive", f"Content-Length: {len(body)}"]
+        head += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        request = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+        async with self._slots:
+            reused = bool(self._idle)
+            connection = self._idle.pop() if reused else await asyncio.wait_for(self._connect(), self.timeout)
+            try:
+                result = await asyncio.wait_for(self._exchange(connection, request, method), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                connection[1].close()
+                if not reused:
+                    raise
+                # The server closed an idle keep-alive connection; retry once on a new one
+                logger.debug(f"Idle connection dropped ({e!r}), reconnecting")
+                connection = await asyncio.wait_for(self._connect(), self.timeout)
+                try:
+                    result = await asyncio.wait_for(self._exchange(connection, request, method), self.timeout)
+                except BaseException:
+                    connection[1].close()
+                    raise
+            except BaseException:
+                connection[1].close()
+                raise
+            status, reason, response_headers, response_body, keep_alive = result
+            if keep_alive:
+                self._idle.append(connection)
+            else:
+                connection[1].close()
+        return HttpResponse(status, reason, response_headers, response_body, self.base_url + path)
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        for _, writer in idle:
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+
+
+class ProtocolSession:
+    """One virtual viewer: its own cookies over a shared ConnectionPool."""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.cookies = {}
+        self.titles = []
+
+    def _store_cookies(self, response):
+        for header in response.headers.get("set-cookie", []):
+            for name, morsel in SimpleCookie(header).items():
+                if morsel["max-age"] == "0" or not morsel.value:
+                    self.cookies.pop(name, None)
+                else:
+                    self.cookies[name] = morsel.value
+
+    async def request(self, method, path, payload=None, follow_redirects=True):
+        """Send a request with this session's cookies, following redirects like the browser."""
+        for _ in range(MAX_REDIRECTS + 1):
+            headers = {"Accept": "application/json, text/html"}
+            body = b""
+            if payload is not None:
+                body = json.dumps(payload).encode("utf-8")
+                headers["Content-Type"] = "application/json"
+            if self.cookies:
+                headers["Cookie"] = "; ".join(f"{name}={value}" for name, value in self.cookies.items())
+            response = await self.pool.request(method, path, headers, body)
+            self._store_cookies(response)
+            location = response.header("location")
+            if not (follow_redirects and response.status in (301, 302, 303, 307, 308) and location):
+                return response
+            path = urlparse(urljoin(self.pool.base_url + path, location))._replace(scheme="", netloc="").geturl()
+            if response.status in (301, 302, 303):
+                method, payload = "GET", None
+        raise ProtocolError(f"Too many redirects from {method} {path}")
+
+    async def _expect(self, method, path, payload=None, status=200):
+        response = await self.request(method, path, payload)
+        if response.status != status:
+            raise ProtocolError(f"{method} {path}: expected {status}, got {response.status} {response.reason}")
+        return response
+
+    async def launch(self):
+        """Load the login page."""
+        await self._expect("GET", "/login")
+        return True
+
+    async def login(self, pin):
+        """Sign in with the PIN and load the 'All Titles' catalog; returns the titles."""
+        response = await self.request("POST", "/api/login", {"pin": pin})
+        if response.status != 200:
+            raise ProtocolError(f"Login with PIN failed: {response.status} {response.reason}")
+        await self._expect("GET", response.json().get("redirect", "/titles"))
+        self.titles = (await self._expect("GET", "/api/titles")).json().get("titles", [])
+        logger.debug(f"Signed in over HTTP, catalog lists {len(self.titles)} title(s)")
+        return self.titles
+
+    async def open_title(self, name):
+        """Open a title's project page from the catalog."""
+        title = next((t for t in self.titles if t["name"].lower() == name.lower()), None)
+        if title is None:
+            raise ProtocolError(f"'{name}' is not in the catalog")
+        response = await self._expect("GET", f"/projects/{title['slug']}")
+        if urlparse(response.url).path == "/login":
+            raise ProtocolError(f"Opening '{name}' sent the session back to the login page")
+        return True
+
+    async def logout(self):
+        """Sign out; the session cookie is cleared."""
+        await self._expect("GET", "/logout")
+        return True
+
+
+class ProtocolViewer:
+    """Synchronous ProtocolSession on its own event loop, for behave steps."""
+
+    def __init__(self, base_url=None):
+        self.loop = asyncio.new_event_loop()
+        self.pool = ConnectionPool(base_url)
+        self.session = ProtocolSession(self.pool)
+
+    def _run(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def launch(self):
+        return self._run(self.session.launch())
+
+    def login(self, pin):
+        return self._run(self.session.login(pin))
+
+    def open_title(self, name):
+        return self._run(self.session.open_title(name))
+
+    def logout(self):
+        return self._run(self.session.logout())
+
+    def close(self):
+        try:
+            self._run(self.pool.close())
+        finally:
+            self.loop.close()
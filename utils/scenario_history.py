@@ -0,0 +1,150 @@
+# utils/scenario_history.py
+"""
+Local history of scenario outcomes and durations, used by run_tests.py to
+schedule the next run.
+
+After every run the Allure results are folded into a small JSON file
+(FYC_SCENARIO_HISTORY, default reports/scenario_history.json) keeping the last
+few outcomes and durations per scenario, keyed '<feature>: <scenario>'.
+
+From it:
+
+    order()     recently failed scenarios first (latest failure first), then
+                longest first
+    pack()      splits scenarios across workers: recent failures are spread
+                over the workers first, then the rest is packed longest-first
+                onto the least loaded worker, so workers finish together
+    fast()      the fast-feedback selection: @smoke scenarios plus recent failures
+
+behave runs the scenarios of one feature file in file order, so the order
+applies between feature files; within a worker the files holding recent
+failures run first.
+
+Usage:
+    history = ScenarioHistory()
+    shards = pack(scenarios, workers=4, history=history)
+    ...
+    history.record_results("reports/allure-results")
+    history.save()
+"""
+
+import glob
+import json
+import os
+import re
+import statistics
+from utils import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FAILED = ("failed", "broken")
+# Scenario Outline rows are reported as '<name> -- @1.1 <examples>'
+OUTLINE_SUFFIX = re.compile(r" -- @\d+\.\d+.*$")
+
+
+def scenario_key(feature, name):
+    return f"{feature}: {OUTLINE_SUFFIX.sub('', name)}"
+
+
+class ScenarioHistory:
+    def __init__(self, path=None, keep=10, failure_window=None):
+        """
+        :param path: history file (default: FYC_SCENARIO_HISTORY)
+        :param keep: outcomes kept per scenario
+        :param failure_window: a failure within this many latest runs counts as recent
+        """
+        self.path = path or config.SCENARIO_HISTORY
+        self.keep = keep
+        self.failure_window = config.RECENT_FAILURE_RUNS if failure_window is None else failure_window
+        self.scenarios = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.scenarios = json.load(f)
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            logger.error(f"❌ Ignoring unreadable scenario history {self.path}: {e}")
+
+    def record_results(self, results_dir):
+        """Fold the *-result.json files of an Allure results directory into the history."""
+        recorded = 0
+        for path in glob.glob(os.path.join(results_dir, "*-result.json")):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    result = json.load(f)
+            except (OSError, ValueError):
+                continue
+            labels = {label.get("name"): label.get("value") for label in result.get("labels", [])}
+            if result.get("status") == "skipped" or "feature" not in labels:
+                continue
+            runs = self.scenarios.setdefault(scenario_key(labels["feature"], result.get("name", "")), [])
+            if any(run["uuid"] == result.get("uuid") for run in runs):
+                continue
+            runs.append({
+                "uuid": result.get("uuid"),
+                "status": result.get("status"),
+                "duration_s": round((result.get("stop", 0) - result.get("start", 0)) / 1000, 1),
+                "at": result.get("stop", 0),
+            })
+            runs.sort(key=lambda run: run["at"])
+            del runs[:-self.keep]
+            recorded += 1
+        logger.info(f"Recorded {recorded} scenario outcome(s) in {self.path}")
+        return recorded
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.scenarios, f, indent=2)
+
+    def last_failure(self, key):
+        """Time (ms epoch) of the scenario's latest failure within the recent runs, else None."""
+        recent = self.scenarios.get(key, [])[-self.failure_window:]
+        failures = [run["at"] for run in recent if run["status"] in FAILED]
+        return max(failures) if failures else None
+
+    def duration(self, key):
+        """Median duration (s) of the scenario's recorded runs, or None if it never ran."""
+        durations = [run["duration_s"] for run in self.scenarios.get(key, [])]
+        return statistics.median(durations) if durations else None
+
+    def estimates(self, scenarios):
+        """Expected duration of each scenario; ones without history get the median of the others."""
+        known = {s["key"]: self.duration(s["key"]) for s in scenarios}
+        values = [d for d in known.values() if d is not None]
+        default = statistics.median(values) if values else 1.0
+        return {key: default if d is None else d for key, d in known.items()}
+
+
+def order(scenarios, history):
+    """Recent failures first (latest first), then longest first."""
+    estimates = history.estimates(scenarios)
+    return sorted(scenarios, key=lambda s: (-(history.last_failure(s["key"]) or 0), -estimates[s["key"]]))
+
+
+def pack(scenarios, workers, history):
+    """
+    Split scenarios into at most `workers` shards of locations: recent failures
+    spread round-robin first, then longest-first onto the least loaded shard.
+    """
+    estimates = history.estimates(scenarios)
+    shards = [[] for _ in range(max(1, workers))]
+    loads = [0.0] * len(shards)
+    ordered = order(scenarios, history)
+    failures = [s for s in ordered if history.last_failure(s["key"])]
+    for i, scenario in enumerate(failures):
+        shard = i % len(shards)
+        shards[shard].append(scenario["location"])
+        loads[shard] += estimates[scenario["key"]]
+    for scenario in ordered[len(failures):]:
+        shard = loads.index(min(loads))
+        shards[shard].append(scenario["location"])
+        loads[shard] += estimates[scenario["key"]]
+    logger.info("Estimated shard durations: " + ", ".join(f"{load:.0f}s" for load, s in zip(loads, shards) if s))
+    return [s for s in shards if s]
+
+
+def fast(scenarios, history, tag="smoke"):
+    """The fast-feedback selection: scenarios tagged `tag` plus recent failures."""
+    return [s for s in scenarios if tag in s["tags"] or history.last_failure(s["key"])]
@@ -0,0 +1,202 @@
+# utils/screenshot_store.py
+"""
+Content-addressed screenshot store with per-run manifests and retention.
+
+Layout under the screenshots directory:
+
+    objects/<sha256[:2]>/<sha256>.<ext>      every distinct frame, stored once
+    runs/<run_id>/<seq>_<name>.<ext>         hard links to the objects, in capture order
+    runs/<run_id>/manifest.json              name, hash, size and time of every capture
+
+Identical frames share one object (hard links, falling back to a copy where the
+filesystem does not support them). `prune()` removes whole runs by age, count
+and total size, then deletes objects no remaining run refers to. Nothing outside
+objects/ and runs/ is ever deleted: loose files in the screenshots directory
+(including the ones tracked in git) are only reported.
+
+Usage:
+    store = ScreenshotStore()
+    store.put("login", data, "jpg")
+    store.close()
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime
+from utils import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+# Never collect objects younger than this, so concurrent workers are not raced
+GC_GRACE_SECONDS = 60
+
+
+def new_run_id():
+    """Unique, sortable run id: timestamp, worker and a random suffix."""
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+    return f"{stamp}_w{config.WORKER_ID}_{uuid.uuid4().hex[:6]}"
+
+
+class ScreenshotStore:
+    def __init__(self, root=None, run_id=None):
+        self.root = root or os.path.join(os.getcwd(), "screenshots")
+        self.run_id = run_id or new_run_id()
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.run_dir = os.path.join(self.root, "runs", self.run_id)
+        self.entries = []
+        self._lock = threading.Lock()
+
+    def _object_path(self, digest, extension):
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.{extension}")
+
+    def put(self, name, data, extension):
+        """Store a frame and record it in this run's manifest. Returns the run-local path."""
+        digest = hashlib.sha256(data).hexdigest()
+        object_path = self._object_path(digest, extension)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            tmp_path = f"{object_path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, object_path)
+
+        with self._lock:
+            seq = len(self.entries) + 1
+            link_path = os.path.join(self.run_dir, f"{seq:04d}_{name}.{extension}")
+            os.makedirs(self.run_dir, exist_ok=True)
+            try:
+                os.link(object_path, link_path)
+            except OSError:
+                shutil.copy2(object_path, link_path)
+            self.entries.append({
+                "seq": seq,
+                "name": name,
+                "sha256": digest,
+                "bytes": len(data),
+                "file": os.path.basename(link_path),
+                "object": os.path.relpath(object_path, self.root),
+                "captured_at": datetime.utcnow().isoformat() + "Z",
+            })
+            self._write_manifest()
+        return link_path
+
+    def _write_manifest(self):
+        manifest = {"run_id": self.run_id, "worker": config.WORKER_ID, "screenshots": self.entries}
+        tmp_path = os.path.join(self.run_dir, MANIFEST_NAME + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.run_dir, MANIFEST_NAME))
+
+    # ------------------------------------------------------------ retention
+    def _runs(self):
+        """Return (run_dir, mtime) for every stored run, oldest first."""
+        runs_root = os.path.join(self.root, "runs")
+        if not os.path.isdir(runs_root):
+            return []
+        runs = []
+        for name in os.listdir(runs_root):
+            path = os.path.join(runs_root, name)
+            if os.path.isdir(path):
+                runs.append((path, os.path.getmtime(path)))
+        return sorted(runs, key=lambda run: run[1])
+
+    @staticmethod
+    def _referenced_objects(run_dir):
+        try:
+            with open(os.path.join(run_dir, MANIFEST_NAME), encoding="utf-8") as f:
+                return {entry["object"] for entry in json.load(f).get("screenshots", [])}
+        except (OSError, ValueError):
+            return set()
+
+    def _object_files(self):
+        files = []
+        for root, _, names in os.walk(self.objects_dir):
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    files.append((path, os.path.getsize(path)))
+                except OSError:
+                    pass
+        return files
+
+    def _legacy_files(self):
+        """Loose screenshots written before the store existed (e.g. login_1760735664.png); never deleted."""
+        if not os.path.isdir(self.root):
+            return []
+        return [os.path.join(self.root, name) for name in os.listdir(self.root)
+                if os.path.isfile(os.path.join(self.root, name))]
+
+    def _remove_run(self, run_dir):
+        shutil.rmtree(run_dir, ignore_errors=True)
+        logger.info(f"Pruned screenshot run {os.path.basename(run_dir)}")
+
+    def _collect_garbage(self, runs):
+        referenced = set()
+        for run_dir, _ in runs:
+            referenced |= self._referenced_objects(run_dir)
+        total = 0
+        now = time.time()
+        for path, size in self._object_files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            # Objects still hard-linked from a run, or just written by another
+            # worker that has not updated its manifest yet, are kept
+            in_use = stat.st_nlink > 1 or now - stat.st_mtime < GC_GRACE_SECONDS
+            if os.path.relpath(path, self.root) in referenced or in_use:
+                total += size
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return total
+
+    def prune(self, max_age_days=None, max_runs=None, max_bytes=None):
+        """
+        Apply the retention policy. Runs are removed oldest first when they are older
+        than `max_age_days`, beyond the newest `max_runs`, or while the object store
+        exceeds `max_bytes`. The current run is never removed. 0 disables a limit.
+        """
+        max_age_days = config.SCREENSHOT_RETENTION_DAYS if max_age_days is None else max_age_days
+        max_runs = config.SCREENSHOT_RETENTION_RUNS if max_runs is None else max_runs
+        max_bytes = config.SCREENSHOT_RETENTION_BYTES if max_bytes is None else max_bytes
+        now = time.time()
+
+        legacy = self._legacy_files()
+        if legacy:
+            logger.info(f"Leaving {len(legacy)} loose screenshot(s) in {self.root} alone (outside the store)")
+
+        runs = [run for run in self._runs() if run[0] != self.run_dir]
+        keep = []
+        for index, (run_dir, mtime) in enumerate(runs):
+            too_old = max_age_days and now - mtime > max_age_days * 86400
+            too_many = max_runs and len(runs) - index >= max_runs
+            if too_old or too_many:
+                self._remove_run(run_dir)
+            else:
+                keep.append((run_dir, mtime))
+
+        current = [(self.run_dir, now)] if os.path.isdir(self.run_dir) else []
+        total = self._collect_garbage(keep + current)
+        while max_bytes and total > max_bytes and keep:
+            self._remove_run(keep.pop(0)[0])
+            total = self._collect_garbage(keep + current)
+        logger.info(f"Screenshot store holds {total / (1024 * 1024):.1f} MB after pruning")
+        return total
+
+    def close(self):
+        try:
+            self.prune()
+        except Exception as e:
+            logger.error(f"❌ Failed to prune screenshot store: {e}")
@@ -0,0 +1,128 @@
+# utils/screenshots.py
+"""
+Screenshot service used by the step hooks.
+
+Screenshots are captured as compressed JPEG/WebP through the Chrome DevTools
+protocol (optionally clipped to a region), attached to Allure straight from
+memory, and written to the content-addressed ScreenshotStore by a background
+thread so the step does not wait for file I/O. Identical frames are stored once.
+
+Modes (FYC_SCREENSHOT_MODE):
+    always      capture after every step
+    on-failure  capture only when a step fails
+    sampled     capture failures plus a random FYC_SCREENSHOT_SAMPLE_RATE share of passing steps
+
+Usage:
+    service = ScreenshotService()
+    service.capture_step(driver, step)
+    service.close()
+"""
+
+import base64
+import queue
+import random
+import re
+import threading
+import allure
+from utils import config
+from utils.screenshot_store import ScreenshotStore
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MODES = ("always", "on-failure", "sampled")
+
+ATTACHMENT_TYPES = {
+    "jpeg": (allure.attachment_type.JPG, None),
+    "png": (allure.attachment_type.PNG, None),
+    "webp": ("image/webp", "webp"),
+}
+
+FILE_EXTENSIONS = {"jpeg": "jpg", "png": "png", "webp": "webp"}
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")[:60] or "step"
+
+
+class ScreenshotService:
+    def __init__(self, mode=None, image_format=None, quality=None, clip=None,
+                 sample_rate=None, store=None):
+        self.mode = mode or config.SCREENSHOT_MODE
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown screenshot mode '{self.mode}', expected one of {MODES}")
+        self.image_format = image_format or config.SCREENSHOT_FORMAT
+        self.quality = config.SCREENSHOT_QUALITY if quality is None else quality
+        self.clip = clip if clip is not None else config.SCREENSHOT_CLIP
+        self.sample_rate = config.SCREENSHOT_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.store = store or ScreenshotStore()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="screenshot-writer", daemon=True)
+        self._writer.start()
+
+    def should_capture(self, failed):
+        if failed or self.mode == "always":
+            return True
+        if self.mode == "sampled":
+            return random.random() < self.sample_rate
+        return False
+
+    def grab(self, driver):
+        """
+        Return (bytes, format) for the current page. Uses DevTools for compressed,
+        optionally clipped captures and falls back to WebDriver's PNG screenshot.
+        """
+        params = {"format": self.image_format}
+        if self.image_format != "png":
+            params["quality"] = self.quality
+        if self.clip:
+            x, y, width, height = self.clip
+            params["clip"] = {"x": x, "y": y, "width": width, "height": height,
+                              "scale": config.SCREENSHOT_SCALE}
+        try:
+            result = driver.execute_cdp_cmd("Page.captureScreenshot", params)
+            return base64.b64decode(result["data"]), self.image_format
+        except Exception as e:
+            logger.info(f"ℹ️ DevTools screenshot unavailable, using WebDriver PNG: {e}")
+            return driver.get_screenshot_as_png(), "png"
+
+    def capture(self, driver, name):
+        """Capture, attach to Allure from memory and queue the disk write."""
+        data, image_format = self.grab(driver)
+        attachment_type, extension = ATTACHMENT_TYPES[image_format]
+        allure.attach(data, name=name, attachment_type=attachment_type, extension=extension)
+        self._queue.put((name, data, image_format))
+        logger.info(f"✅ Screenshot captured for step: {name}")
+        return data
+
+    def capture_step(self, driver, step):
+        """Step hook: capture according to the configured mode."""
+        failed = step.status == "failed"
+        if driver is None or not self.should_capture(failed):
+            return None
+        try:
+            return self.capture(driver, _slug(step.name))
+        except Exception as e:
+            logger.error(f"❌ Failed to capture screenshot for step '{step.name}': {e}")
+            return None
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except Exception as e:
+                logger.error(f"❌ Failed to write screenshot: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, name, data, image_format):
+        self.store.put(name, data, FILE_EXTENSIONS[image_format])
+
+    def close(self):
+        """Flush pending writes, stop the writer thread and apply the retention policy."""
+        self._queue.put(None)
+        self._writer.join()
+        self.store.close()
@@ -0,0 +1,145 @@
+# utils/session_snapshot.py
+"""
+Snapshot and restore of an authenticated browser session.
+
+After one full PIN login the cookies, localStorage and sessionStorage of the
+site are captured and kept for the rest of the worker (in memory, and on disk
+with a TTL so other processes of the same run can reuse it). Later scenarios
+restore that state instead of going through the login form.
+
+Usage:
+    snapshot = SessionSnapshot.capture(driver, key=pin)
+    snapshot.save()
+    ...
+    snapshot = SessionSnapshot.load(key=pin)
+    if snapshot:
+        snapshot.restore(driver)
+"""
+
+import hashlib
+import json
+import os
+import time
+from urllib.parse import urlparse
+from utils import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Same-origin page that is cheap to load, used to set cookies and storage
+BOOTSTRAP_PATH = "/favicon.ico"
+
+STORAGE_DUMP_SCRIPT = """
+function dump(storage) {
+    var result = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        result[key] = storage.getItem(key);
+    }
+    return result;
+}
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+STORAGE_LOAD_SCRIPT = """
+var local = arguments[0], session = arguments[1];
+Object.keys(local).forEach(function (key) { window.localStorage.setItem(key, local[key]); });
+Object.keys(session).forEach(function (key) { window.sessionStorage.setItem(key, session[key]); });
+"""
+
+_memory = {}
+
+
+def _snapshot_path(key):
+    digest = hashlib.sha256(f"{config.BASE_URL}|{key}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(config.SESSION_SNAPSHOT_DIR, f"session_{digest}.json")
+
+
+class SessionSnapshot:
+    def __init__(self, key, url, cookies, local_storage, session_storage, created_at=None):
+        self.key = key
+        self.url = url
+        self.cookies = cookies
+        self.local_storage = local_storage
+        self.session_storage = session_storage
+        self.created_at = created_at or time.time()
+
+    @property
+    def origin(self):
+        parsed = urlparse(self.url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def is_fresh(self, ttl=None):
+        ttl = config.SESSION_SNAPSHOT_TTL if ttl is None else ttl
+        return time.time() - self.created_at < ttl
+
+    @classmethod
+    def capture(cls, driver, key):
+        """Capture the current authenticated state of the top-level page."""
+        driver.switch_to.default_content()
+        storage = driver.execute_script(STORAGE_DUMP_SCRIPT) or {}
+        snapshot = cls(key, driver.current_url, driver.get_cookies(),
+                       storage.get("local", {}), storage.get("session", {}))
+        _memory[key] = snapshot
+        logger.info(f"✅ Captured session snapshot ({len(snapshot.cookies)} cookie(s))")
+        return snapshot
+
+    def restore(self, driver):
+        """
+        Load the snapshot into the browser and open the page it was taken on.
+        Validity of the restored session is checked by the caller.
+        """
+        host = urlparse(self.url).hostname or ""
+        driver.get(self.origin + BOOTSTRAP_PATH)
+        driver.delete_all_cookies()
+        restored = 0
+        for cookie in self.cookies:
+            domain = (cookie.get("domain") or host).lstrip(".")
+            if not (host == domain or host.endswith("." + domain)):
+                continue
+            if cookie.get("expiry") and cookie["expiry"] <= time.time():
+                continue
+            driver.add_cookie(cookie)
+            restored += 1
+        driver.execute_script(STORAGE_LOAD_SCRIPT, self.local_storage, self.session_storage)
+        driver.get(self.url)
+        logger.info(f"Restored session snapshot ({restored} cookie(s)) at {self.url}")
+
+    def save(self):
+        """Persist the snapshot (owner-only permissions) so other workers can reuse it."""
+        os.makedirs(config.SESSION_SNAPSHOT_DIR, exist_ok=True)
+        path = _snapshot_path(self.key)
+        payload = {"url": self.url, "cookies": self.cookies, "local_storage": self.local_storage,
+                   "session_storage": self.session_storage, "created_at": self.created_at}
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, key):
+        """Return a fresh snapshot for `key` from memory or disk, or None."""
+        snapshot = _memory.get(key)
+        if snapshot is None:
+            try:
+                with open(_snapshot_path(key), encoding="utf-8") as f:
+                    data = json.load(f)
+                snapshot = cls(key, data["url"], data["cookies"], data["local_storage"],
+                               data["session_storage"], data["created_at"])
+            except (OSError, ValueError, KeyError):
+                return None
+        if not snapshot.is_fresh():
+            discard(key)
+            return None
+        _memory[key] = snapshot
+        return snapshot
+
+
+def discard(key):
+    """Forget a snapshot that turned out to be invalid."""
+    _memory.pop(key, None)
+    try:
+        os.remove(_snapshot_path(key))
+    except OSError:
+        pass
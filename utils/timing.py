@@ -0,0 +1,257 @@
+# utils/timing.py
+"""
+Latency instrumentation for steps and page objects.
+
+`install()` wraps every public method of the given page classes, every
+WebDriver command, every WebDriverWait.until/until_not call and time.sleep,
+when timing is enabled (FYC_TIMING); importing the module patches nothing.
+`uninstall()` puts the originals back at the end of the run. Each step and page method is split into the time spent in
+
+    webdriver   WebDriver HTTP round-trips (other than script execution)
+    script      execute_script / execute_async_script round-trips
+    wait        explicit WebDriverWait polling (including the round-trips it makes)
+    sleep       time.sleep
+    other       everything else (Python code, logging, ...)
+
+`write_summary()` exports p50/p95/max per operation as JSON and CSV.
+
+Usage:
+    from utils import timing
+    timing.install([AutomationPage, LoginPage, HomePage, BasePage])
+    with timing.measure("step", "I launch the FYC application"):
+        ...
+    timing.write_summary("reports/timings")
+    timing.uninstall()
+"""
+
+import csv
+import functools
+import itertools
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from utils import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CATEGORIES = ("webdriver", "script", "wait", "sleep")
+
+_samples = defaultdict(list)
+_samples_lock = threading.Lock()
+_local = threading.local()
+_installed = False
+_real_sleep = time.sleep
+# (owner, attribute, original) of everything install() replaced, in patch order
+_patched = []
+
+
+def _frames():
+    if not hasattr(_local, "frames"):
+        _local.frames = []
+        _local.primitive = False
+    return _local.frames
+
+
+def _record(operation, kind, duration, breakdown=None):
+    with _samples_lock:
+        _samples[(kind, operation)].append((duration, breakdown))
+
+
+@contextmanager
+def measure(kind, operation):
+    """Time a step or page method and collect the primitives it spends time in."""
+    frames = _frames()
+    frame = {"breakdown": dict.fromkeys(CATEGORIES, 0.0)}
+    frames.append(frame)
+    start = time.perf_counter()
+    try:
+        yield frame
+    finally:
+        duration = time.perf_counter() - start
+        frames.pop()
+        _record(operation, kind, duration, frame["breakdown"])
+
+
+@contextmanager
+def _primitive(category, operation):
+    """
+    Time a WebDriver call, wait, sleep or script. Nested primitives (e.g. the
+    round-trips made while a wait polls) are attributed to the outermost one.
+    """
+    frames = _frames()
+    if _local.primitive:
+        yield
+        return
+    _local.primitive = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        _local.primitive = False
+        for frame in frames:
+            frame["breakdown"][category] += duration
+        _record(operation, category, duration)
+
+
+# ------------------------------------------------------------------ patching
+def _patch(owner, name, replacement):
+    _patched.append((owner, name, getattr(owner, name)))
+    setattr(owner, name, replacement)
+
+
+def _wrap_method(cls, name, method):
+    operation = f"{cls.__name__}.{name}"
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with measure("page", operation):
+            return method(*args, **kwargs)
+
+    wrapper.__timed__ = True
+    return wrapper
+
+
+def instrument_class(cls):
+    """Wrap every public method defined on `cls`."""
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not callable(method) or getattr(method, "__timed__", False):
+            continue
+        _patch(cls, name, _wrap_method(cls, name, method))
+    return cls
+
+
+def _condition_name(condition):
+    qualname = getattr(condition, "__qualname__", None) or type(condition).__name__
+    return qualname.split(".<locals>")[0]
+
+
+def _patch_webdriver():
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.support.wait import WebDriverWait
+    from utils.wait_budget import BudgetedWait
+
+    execute = WebDriver.execute
+
+    @functools.wraps(execute)
+    def timed_execute(self, driver_command, params=None):
+        lowered = driver_command.lower()
+        category = "script" if "executescript" in lowered or "executeasyncscript" in lowered else "webdriver"
+        with _primitive(category, f"{category}:{driver_command}"):
+            return execute(self, driver_command, params)
+
+    _patch(WebDriver, "execute", timed_execute)
+
+    # BudgetedWait overrides until/until_not, so it is patched separately
+    for cls, name in itertools.product((WebDriverWait, BudgetedWait), ("until", "until_not")):
+        original = getattr(cls, name)
+
+        def make(original, name):
+            @functools.wraps(original)
+            def timed(self, method, message=""):
+                with _primitive("wait", f"wait:{name}:{_condition_name(method)}"):
+                    return original(self, method, message)
+            return timed
+
+        _patch(cls, name, make(original, name))
+
+
+def _timed_sleep(seconds):
+    with _primitive("sleep", "sleep"):
+        _real_sleep(seconds)
+
+
+def install(page_classes=()):
+    """
+    Instrument the given page classes and patch WebDriver, waits and time.sleep once.
+    Does nothing (and returns False) when timing is disabled.
+    """
+    global _installed
+    if not config.TIMING_ENABLED:
+        return False
+    for cls in page_classes:
+        instrument_class(cls)
+    if _installed:
+        return True
+    _patch_webdriver()
+    _patch(time, "sleep", _timed_sleep)
+    _installed = True
+    logger.info("✅ Latency instrumentation installed")
+    return True
+
+
+def uninstall():
+    """Restore everything install() patched: page methods, WebDriver, waits and time.sleep."""
+    global _installed
+    while _patched:
+        owner, name, original = _patched.pop()
+        setattr(owner, name, original)
+    _installed = False
+
+
+# ------------------------------------------------------------------ reporting
+def _percentile(values, pct):
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def mark():
+    """Return a marker so a later summarize(since=...) only covers newer samples."""
+    with _samples_lock:
+        return {key: len(samples) for key, samples in _samples.items()}
+
+
+def summarize(since=None):
+    """Return one row per operation with count, p50, p95, max, total and the time split."""
+    since = since or {}
+    with _samples_lock:
+        items = [(key, samples[since.get(key, 0):]) for key, samples in _samples.items()]
+
+    rows = []
+    for (kind, operation), samples in items:
+        if not samples:
+            continue
+        durations = [duration for duration, _ in samples]
+        row = {
+            "kind": kind,
+            "operation": operation,
+            "count": len(durations),
+            "p50_ms": round(_percentile(durations, 50) * 1000, 1),
+            "p95_ms": round(_percentile(durations, 95) * 1000, 1),
+            "max_ms": round(max(durations) * 1000, 1),
+            "total_ms": round(sum(durations) * 1000, 1),
+        }
+        if samples[0][1] is not None:
+            split = {category: sum(b[category] for _, b in samples) for category in CATEGORIES}
+            for category in CATEGORIES:
+                row[f"{category}_ms"] = round(split[category] * 1000, 1)
+            row["other_ms"] = round(max(0.0, sum(durations) - sum(split.values())) * 1000, 1)
+        rows.append(row)
+    return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+
+def write_summary(directory=None, rows=None):
+    """Write the summary as JSON and CSV. Returns (json_path, csv_path)."""
+    directory = directory or config.TIMINGS_DIR
+    rows = summarize() if rows is None else rows
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, f"timings_worker{config.WORKER_ID}")
+
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump(rows, f, indent=2)
+
+    fields = ["kind", "operation", "count", "p50_ms", "p95_ms", "max_ms", "total_ms",
+              *(f"{category}_ms" for category in CATEGORIES), "other_ms"]
+    with open(base + ".csv", "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+
+    logger.info(f"✅ Timing summary written to {base}.json / .csv")
+    return base + ".json", base + ".csv"
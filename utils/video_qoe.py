@@ -0,0 +1,362 @@
+# utils/video_qoe.py
+"""
+Video quality-of-experience (QoE) metrics for the player under test.
+
+A small collector is attached to the <video> element inside the video_player
+iframe. It listens to media events in the page, so no polling is needed, and
+records:
+
+    ttff_ms             time to first frame, from the play action recorded with
+                        mark_play() (the play click or play() call) to the first
+                        rendered frame. If the collector was attached after the
+                        first frame, that frame is back-dated by the media time
+                        played since and ttff_estimated is set
+    stall_count         rebuffer events after the first frame ('waiting'),
+                        except those during an armed rendition switch, which
+                        are reported with the switch
+    stall_ms            total rebuffer time, longest_stall_ms the longest one
+    dropped_frames      from getVideoPlaybackQuality(), with decoded_frames
+                        and dropped_pct
+    playback_rate       media seconds advanced per wall-clock second while the
+                        video was meant to be playing (stalls included)
+
+Rendition switches are measured with arm_switch() before the rendition click
+and await_switch() after it: the latency from the click until videoWidth /
+videoHeight change, and until currentTime advances again, plus any stall in
+between. They are reported as resolution_switches, one entry per transition.
+
+Page objects call attach() before and sample() after each playback action, and
+mark_play() when they issue the play; the latest sample is kept per driver, so
+the metrics survive leaving the iframe. At the end of a scenario, evaluate()
+compares them with the FYC_QOE_* thresholds and write_artifact() stores them in
+reports/qoe/qoe_worker<id>.jsonl. Times compared across documents (the play
+click in the page, the first frame in the player iframe) are epoch milliseconds
+from performance.timeOrigin + performance.now().
+
+Usage:
+    qoe = VideoQoe.for_driver(driver)
+    qoe.mark_play(click_result["at"])
+    qoe.attach(video_element)
+    ...
+    metrics = qoe.sample(video_element)
+    violations = evaluate(metrics)
+"""
+
+import json
+import os
+import time
+import weakref
+from utils import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Idempotent: a second call on the same element keeps the existing collector
+ATTACH_SCRIPT = """
+var video = arguments[0];
+if (video.__fycQoe) { return false; }
+var q = {
+    firstFrameAt: null, ttffEstimated: false, stalls: [], stallStart: null,
+    playingMs: 0, mediaAdvanced: 0, lastWall: null, lastMedia: null
+};
+function clock() { return performance.timeOrigin + performance.now(); }
+function firstFrame() { if (q.firstFrameAt === null) { q.firstFrameAt = clock(); } }
+function endStall() {
+    if (q.stallStart !== null) { q.stalls.push(performance.now() - q.stallStart); q.stallStart = null; }
+}
+if (video.readyState >= 2 && video.currentTime > 0) {
+    // Attached after the first frame: back-date it by the media time played since
+    q.firstFrameAt = clock() - video.currentTime * 1000 / (video.playbackRate || 1);
+    q.ttffEstimated = true;
+}
+if (video.requestVideoFrameCallback) { video.requestVideoFrameCallback(firstFrame); }
+video.addEventListener('waiting', function () {
+    // A stall while a rendition switch is armed belongs to the switch record
+    if (q.firstFrameAt !== null && q.stallStart === null && !video.__fycSwitch) { q.stallStart = performance.now(); }
+});
+video.addEventListener('playing', endStall);
+video.addEventListener('pause', function () { q.lastWall = null; });
+video.addEventListener('seeking', function () { q.lastWall = null; });
+video.addEventListener('timeupdate', function () {
+    var now = performance.now(), media = video.currentTime;
+    if (media > 0) { firstFrame(); }
+    if (q.stallStart !== null && q.lastMedia !== null && media > q.lastMedia) { endStall(); }
+    if (!video.paused && !video.seeking && q.lastWall !== null && media >= q.lastMedia) {
+        q.playingMs += now - q.lastWall;
+        q.mediaAdvanced += media - q.lastMedia;
+    }
+    q.lastWall = video.paused ? null : now;
+    q.lastMedia = media;
+});
+video.__fycQoe = q;
+return true;
+"""
+
+SAMPLE_SCRIPT = """
+var video = arguments[0], q = video.__fycQoe;
+if (!q) { return null; }
+var now = performance.now();
+var stalls = q.stalls.slice();
+if (q.stallStart !== null) { stalls.push(now - q.stallStart); }
+var quality = video.getVideoPlaybackQuality ? video.getVideoPlaybackQuality() : null;
+return {
+    first_frame_at: q.firstFrameAt,
+    ttff_estimated: q.ttffEstimated,
+    stall_count: stalls.length,
+    stall_ms: stalls.reduce(function (a, b) { return a + b; }, 0),
+    longest_stall_ms: stalls.length ? Math.max.apply(null, stalls) : 0,
+    dropped_frames: quality ? quality.droppedVideoFrames : null,
+    decoded_frames: quality ? quality.totalVideoFrames : null,
+    corrupted_frames: quality && quality.corruptedVideoFrames !== undefined ? quality.corruptedVideoFrames : null,
+    media_seconds: q.mediaAdvanced,
+    playing_seconds: q.playingMs / 1000,
+    video_width: video.videoWidth,
+    video_height: video.videoHeight,
+    current_time: video.currentTime
+};
+"""
+
+# Records the click, the size change ('resize') and the first currentTime
+# advance after it on the <video>; any previous arm is replaced.
+ARM_SWITCH_SCRIPT = """
+var video = arguments[0];
+if (video.__fycSwitch) { video.__fycSwitch.cleanup(); }
+var s = {
+    armedAt: performance.now(), clickAt: null, resizeAt: null, resumedAt: null,
+    fromWidth: video.videoWidth, fromHeight: video.videoHeight, toWidth: null, toHeight: null,
+    resizeMedia: null, stalls: 0, stallStart: null, stallMs: 0, notify: null
+};
+function onClick() { if (s.clickAt === null) { s.clickAt = performance.now(); } }
+function onResize() {
+    if (s.resizeAt === null && (video.videoWidth !== s.fromWidth || video.videoHeight !== s.fromHeight)) {
+        s.resizeAt = performance.now();
+        s.toWidth = video.videoWidth;
+        s.toHeight = video.videoHeight;
+        s.resizeMedia = video.currentTime;
+    }
+}
+function onWaiting() { if (s.stallStart === null) { s.stalls += 1; s.stallStart = performance.now(); } }
+function onProgress() {
+    var now = performance.now();
+    if (s.stallStart !== null && !video.paused) { s.stallMs += now - s.stallStart; s.stallStart = null; }
+    if (s.resizeAt !== null && s.resumedAt === null && !video.paused && video.currentTime > s.resizeMedia) {
+        s.resumedAt = now;
+        if (s.notify) { s.notify(); }
+    }
+}
+document.addEventListener('click', onClick, true);
+video.addEventListener('resize', onResize);
+video.addEventListener('waiting', onWaiting);
+video.addEventListener('playing', onProgress);
+video.addEventListener('timeupdate', onProgress);
+s.cleanup = function () {
+    document.removeEventListener('click', onClick, true);
+    video.removeEventListener('resize', onResize);
+    video.removeEventListener('waiting', onWaiting);
+    video.removeEventListener('playing', onProgress);
+    video.removeEventListener('timeupdate', onProgress);
+};
+video.__fycSwitch = s;
+"""
+
+# Resolves once playback has resumed after the size change, or after timeoutMs
+AWAIT_SWITCH_SCRIPT = """
+var video = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var s = video.__fycSwitch;
+if (!s) { return done(null); }
+var timer;
+function finish(status) {
+    clearTimeout(timer);
+    s.notify = null;
+    s.cleanup();
+    video.__fycSwitch = null;
+    var start = s.clickAt === null ? s.armedAt : s.clickAt;
+    var stallMs = s.stallMs + (s.stallStart === null ? 0 : performance.now() - s.stallStart);
+    done({
+        status: status,
+        switch_ms: s.resizeAt === null ? null : s.resizeAt - start,
+        resume_ms: s.resumedAt === null ? null : s.resumedAt - start,
+        stalls: s.stalls, stall_ms: stallMs,
+        from: s.fromWidth + 'x' + s.fromHeight,
+        to: s.toWidth === null ? null : s.toWidth + 'x' + s.toHeight
+    });
+}
+if (s.resumedAt !== null) { return finish('ok'); }
+s.notify = function () { finish('ok'); };
+timer = setTimeout(function () { finish(s.resizeAt === null ? 'no-change' : 'not-resumed'); }, timeoutMs);
+"""
+
+_collectors = weakref.WeakKeyDictionary()
+
+
+def _round(value, digits=1):
+    return None if value is None else round(value, digits)
+
+
+def thresholds():
+    """Current pass/fail thresholds (a threshold <= 0 is disabled)."""
+    return {
+        "max_ttff_ms": config.QOE_MAX_TTFF_MS,
+        "max_stall_count": config.QOE_MAX_STALLS,
+        "max_stall_ms": config.QOE_MAX_STALL_MS,
+        "max_dropped_pct": config.QOE_MAX_DROPPED_PCT,
+        "min_playback_rate": config.QOE_MIN_PLAYBACK_RATE,
+        "max_switch_ms": config.QOE_MAX_SWITCH_MS,
+    }
+
+
+class VideoQoe:
+    def __init__(self, driver):
+        self.driver = driver
+        self.latest = None
+        self.switches = []
+        self.play_at = None
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Return the collector shared by every page object using `driver`."""
+        collector = _collectors.get(driver)
+        if collector is None:
+            collector = _collectors[driver] = cls(driver)
+        return collector
+
+    @classmethod
+    def pop(cls, driver):
+        """Return the latest metrics for `driver` and forget them (end of scenario)."""
+        collector = _collectors.pop(driver, None)
+        return collector.latest if collector else None
+
+    def mark_play(self, at_ms):
+        """
+        Record when playback was requested, as epoch ms in the browser (the
+        `at` of the play click, or the time of a play() call). TTFF is measured
+        from the first mark.
+        """
+        if self.play_at is None and at_ms is not None:
+            self.play_at = at_ms
+
+    def attach(self, video_element):
+        """Start collecting on `video_element` (no-op if already attached)."""
+        if self.driver.execute_script(ATTACH_SCRIPT, video_element):
+            logger.info("Attached QoE collector to the video element.")
+
+    def arm_switch(self, video_element):
+        """Start watching `video_element` for a rendition switch; call right before the click."""
+        self.driver.execute_script(ARM_SWITCH_SCRIPT, video_element)
+
+    def await_switch(self, video_element, rendition, timeout=10):
+        """
+        Wait (in one async script call) until the armed switch has changed the
+        video size and playback has resumed, record and return the transition.
+        """
+        raw = self.driver.execute_async_script(AWAIT_SWITCH_SCRIPT, video_element, int(timeout * 1000)) or {}
+        transition = {
+            "rendition": rendition,
+            "status": raw.get("status", "not-armed"),
+            "from": raw.get("from"),
+            "to": raw.get("to"),
+            "switch_ms": _round(raw.get("switch_ms")),
+            "resume_ms": _round(raw.get("resume_ms")),
+            "stalls": raw.get("stalls"),
+            "stall_ms": _round(raw.get("stall_ms")),
+        }
+        self.switches.append(transition)
+        if self.latest is not None:
+            self.latest["resolution_switches"] = list(self.switches)
+        logger.info(
+            f"Rendition switch to {rendition}: {transition['from']} -> {transition['to']} "
+            f"in {transition['switch_ms']} ms, resumed after {transition['resume_ms']} ms ({transition['status']})"
+        )
+        return transition
+
+    def sample(self, video_element):
+        """Read the collector and keep the result as the latest metrics."""
+        raw = self.driver.execute_script(SAMPLE_SCRIPT, video_element)
+        if not raw:
+            return self.latest
+        decoded = raw.get("decoded_frames")
+        dropped = raw.get("dropped_frames")
+        playing = raw.get("playing_seconds") or 0
+        first_frame = raw.get("first_frame_at")
+        ttff = None if first_frame is None or self.play_at is None else max(0.0, first_frame - self.play_at)
+        self.latest = {
+            "ttff_ms": _round(ttff),
+            "ttff_estimated": raw.get("ttff_estimated"),
+            "stall_count": raw.get("stall_count"),
+            "stall_ms": _round(raw.get("stall_ms")),
+            "longest_stall_ms": _round(raw.get("longest_stall_ms")),
+            "dropped_frames": dropped,
+            "decoded_frames": decoded,
+            "corrupted_frames": raw.get("corrupted_frames"),
+            "dropped_pct": _round(dropped / decoded * 100, 2) if decoded else None,
+            "playback_rate": _round(raw.get("media_seconds", 0) / playing, 3) if playing else None,
+            "media_seconds": _round(raw.get("media_seconds"), 2),
+            "playing_seconds": _round(playing, 2),
+            "video_width": raw.get("video_width"),
+            "video_height": raw.get("video_height"),
+            "sampled_at": time.time(),
+            "resolution_switches": list(self.switches),
+        }
+        return self.latest
+
+
+def evaluate(metrics, limits=None):
+    """Return a list of human-readable threshold violations for `metrics`."""
+    limits = thresholds() if limits is None else limits
+    violations = []
+
+    def above(name, key):
+        limit, value = limits.get(key), metrics.get(name)
+        if limit and limit > 0 and value is not None and value > limit:
+            violations.append(f"{name} {value} > {limit}")
+
+    above("ttff_ms", "max_ttff_ms")
+    above("stall_count", "max_stall_count")
+    above("stall_ms", "max_stall_ms")
+    above("dropped_pct", "max_dropped_pct")
+    minimum, rate = limits.get("min_playback_rate"), metrics.get("playback_rate")
+    if minimum and minimum > 0 and rate is not None and rate < minimum:
+        violations.append(f"playback_rate {rate} < {minimum}")
+    violations.extend(switch_violations(metrics.get("resolution_switches", []), limits.get("max_switch_ms")))
+    return violations
+
+
+def switch_violations(transitions, max_switch_ms=None):
+    """Return the rendition switches that did not complete, or resumed later than `max_switch_ms`."""
+    max_switch_ms = config.QOE_MAX_SWITCH_MS if max_switch_ms is None else max_switch_ms
+    violations = []
+    for switch in transitions:
+        if switch["status"] != "ok":
+            violations.append(f"switch to {switch['rendition']}: {switch['status']}")
+        elif max_switch_ms and max_switch_ms > 0 and switch["resume_ms"] > max_switch_ms:
+            violations.append(f"switch to {switch['rendition']} resumed after {switch['resume_ms']} ms > {max_switch_ms}")
+    return violations
+
+
+def load_records(directory):
+    """Read every QoE record written to `directory`."""
+    records = []
+    if not os.path.isdir(directory):
+        return records
+    for name in sorted(os.listdir(directory)):
+        if name.startswith("qoe_worker") and name.endswith(".jsonl"):
+            with open(os.path.join(directory, name), encoding="utf-8") as f:
+                records.extend(json.loads(line) for line in f if line.strip())
+    return records
+
+
+def write_artifact(scenario, metrics, violations, directory=None):
+    """Append one JSON line for `scenario` to reports/qoe/qoe_worker<id>.jsonl."""
+    directory = directory or config.QOE_DIR
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"qoe_worker{config.WORKER_ID}.jsonl")
+    record = {
+        "scenario": scenario,
+        "metrics": metrics,
+        "thresholds": thresholds(),
+        "violations": violations,
+        "passed": not violations,
+    }
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    return record
@@ -0,0 +1,194 @@
+# utils/wait_budget.py
+"""
+Step-wide deadline budget and adaptive polling for explicit waits.
+
+Every step gets one time budget (FYC_STEP_BUDGET seconds) that all the waits
+inside it share: a wait asking for 20s when only 4s of the step budget remain
+is granted 4s, so nested waits can no longer add up to minutes on a failing
+path. Polling starts fast (FYC_POLL_MIN) and backs off by FYC_POLL_BACKOFF up
+to the wait's poll_frequency, so passing waits return almost as soon as their
+condition holds. Each wait records how much of the budget it used.
+
+A thread may register a ticker (set_ticker) for work that has to happen on a
+schedule while the step thread waits, such as network blips: waits run it
+between round-trips and never sleep past its next due time.
+
+Implicit waits must stay disabled (the driver is created with
+implicitly_wait(0)); otherwise every find inside a condition can block on its
+own timeout and the budget is meaningless.
+
+Usage:
+    from utils.wait_budget import BudgetedWait, step_budget
+    with step_budget(30, "I log in") as budget:
+        BudgetedWait(driver, 20).until(EC.element_to_be_clickable(locator))
+    budget.report()
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.support.wait import WebDriverWait
+from utils import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_local = threading.local()
+
+
+def poll_intervals(max_interval=None):
+    """Yield poll intervals: FYC_POLL_MIN, growing by FYC_POLL_BACKOFF up to max_interval."""
+    max_interval = config.POLL_FREQUENCY if max_interval is None else max_interval
+    interval = min(config.POLL_MIN, max_interval)
+    while True:
+        yield interval
+        interval = min(interval * config.POLL_BACKOFF, max_interval)
+
+
+class WaitBudget:
+    def __init__(self, seconds, label="", parent=None):
+        self.label = label
+        self.started = time.monotonic()
+        # A nested budget can never outlive the one it was opened in
+        self.seconds = seconds if parent is None else min(seconds, parent.remaining())
+        self.waits = []
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def remaining(self):
+        return max(0.0, self.seconds - self.elapsed)
+
+    def grant(self, timeout):
+        """Return the part of `timeout` that still fits into the budget."""
+        return min(timeout, self.remaining())
+
+    def record(self, label, requested, granted, used, outcome):
+        self.waits.append({
+            "wait": label,
+            "requested_s": round(requested, 3),
+            "granted_s": round(granted, 3),
+            "used_s": round(used, 3),
+            "budget_pct": round(used / self.seconds * 100, 1) if self.seconds else 0.0,
+            "outcome": outcome,
+        })
+
+    def report(self):
+        """Return the budget usage of this step and of each wait in it."""
+        used = sum(wait["used_s"] for wait in self.waits)
+        return {
+            "step": self.label,
+            "budget_s": round(self.seconds, 3),
+            "elapsed_s": round(self.elapsed, 3),
+            "waited_s": round(used, 3),
+            "waited_pct": round(used / self.seconds * 100, 1) if self.seconds else 0.0,
+            "waits": list(self.waits),
+        }
+
+
+def set_ticker(ticker):
+    """
+    Register ticker() for this thread (None to remove it). It is run between
+    wait round-trips and returns the seconds until it is due again, or None.
+    """
+    _local.ticker = ticker
+
+
+def tick():
+    """Run this thread's ticker; returns the seconds until it is due again, or None."""
+    ticker = getattr(_local, "ticker", None)
+    return ticker() if ticker else None
+
+
+def pause(seconds):
+    """Sleep between two polls, running the ticker first and waking up when it is next due."""
+    due = tick()
+    time.sleep(seconds if due is None else max(0.0, min(seconds, due)))
+
+
+def current_budget():
+    """Return the budget of the step running on this thread, or None."""
+    return getattr(_local, "budget", None)
+
+
+@contextmanager
+def step_budget(seconds=None, label=""):
+    """Open a budget shared by every BudgetedWait started on this thread inside the block."""
+    parent = current_budget()
+    budget = WaitBudget(config.STEP_BUDGET if seconds is None else seconds, label, parent)
+    _local.budget = budget
+    try:
+        yield budget
+    finally:
+        _local.budget = parent
+        logger.debug(f"Wait budget '{label}': {budget.report()}")
+
+
+class BudgetedWait(WebDriverWait):
+    """
+    WebDriverWait whose timeout is clamped to the step budget current when the
+    wait starts, and whose polling backs off from FYC_POLL_MIN up to poll_frequency.
+
+    It keeps its own driver, timeout, poll frequency and ignored exceptions
+    rather than reading WebDriverWait's private attributes, which change
+    between Selenium releases.
+    """
+
+    def __init__(self, driver, timeout, poll_frequency=None, ignored_exceptions=None):
+        poll_frequency = config.POLL_FREQUENCY if poll_frequency is None else poll_frequency
+        super().__init__(driver, timeout, poll_frequency=poll_frequency, ignored_exceptions=ignored_exceptions)
+        self.driver = driver
+        self.timeout = float(timeout)
+        self.poll_frequency = poll_frequency or config.POLL_FREQUENCY
+        # Like WebDriverWait: NoSuchElementException plus one exception class or an iterable of them
+        ignored = [NoSuchElementException]
+        if isinstance(ignored_exceptions, type):
+            ignored.append(ignored_exceptions)
+        elif ignored_exceptions:
+            ignored.extend(ignored_exceptions)
+        self.ignored_exceptions = tuple(ignored)
+
+    def until(self, method, message=""):
+        return self._poll_until(method, message, expected=True)
+
+    def until_not(self, method, message=""):
+        return self._poll_until(method, message, expected=False)
+
+    def _poll_until(self, method, message, expected):
+        label = getattr(method, "__qualname__", None) or type(method).__name__
+        label = label.split(".<locals>")[0]
+        budget = current_budget()
+        timeout = self.timeout if budget is None else budget.grant(self.timeout)
+        start = time.monotonic()
+        end = start + timeout
+        screen = stacktrace = None
+        outcome = "timeout"
+        try:
+            for interval in poll_intervals(self.poll_frequency):
+                try:
+                    value = method(self.driver)
+                    if bool(value) == expected:
+                        outcome = "ok"
+                        return value
+                except self.ignored_exceptions as exc:
+                    if not expected:
+                        outcome = "ok"
+                        return True
+                    screen = getattr(exc, "screen", None)
+                    stacktrace = getattr(exc, "stacktrace", None)
+                now = time.monotonic()
+                if now >= end:
+                    break
+                pause(min(interval, end - now))
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            if budget is not None:
+                budget.record(label, self.timeout, timeout, time.monotonic() - start, outcome)
+
+        if timeout < self.timeout:
+            message = f"{message} (step budget of {budget.seconds:.1f}s exhausted)".strip()
+        raise TimeoutException(message, screen, stacktrace)
@@ -0,0 +1,107 @@
+# utils/waits.py
+"""
+Playback-aware wait helpers.
+
+Each wait polls a real browser/media condition and returns as soon as it holds,
+instead of sleeping for a fixed amount of time. A wait that does not succeed
+before its deadline raises selenium's TimeoutException, which the page objects
+already handle. A stale element is not retried here; it propagates so callers
+using the element cache can locate the element again.
+
+Usage:
+    from utils.waits import PlaybackWaits
+    waits = PlaybackWaits(driver)
+    waits.until_playing_for(video_element, seconds=10)
+"""
+
+import time
+from utils.wait_budget import BudgetedWait
+from utils import config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# HTMLMediaElement.readyState once the next frames are buffered
+HAVE_FUTURE_DATA = 3
+
+
+class PlaybackWaits:
+    def __init__(self, driver, timeout=None, poll_frequency=None):
+        self.driver = driver
+        self.timeout = config.WAIT_TIMEOUT if timeout is None else timeout
+        self.poll_frequency = config.POLL_FREQUENCY if poll_frequency is None else poll_frequency
+
+    def _wait(self, timeout):
+        return BudgetedWait(
+            self.driver,
+            self.timeout if timeout is None else timeout,
+            poll_frequency=self.poll_frequency,
+        )
+
+    def _media_property(self, video_element, name):
+        return self.driver.execute_script(f"return arguments[0].{name};", video_element)
+
+    def until_ready(self, video_element, ready_state=HAVE_FUTURE_DATA, timeout=None):
+        """Wait until the video has buffered enough data (readyState >= ready_state)."""
+        logger.info(f"Waiting for video readyState >= {ready_state}...")
+        self._wait(timeout).until(
+            lambda d: (self._media_property(video_element, "readyState") or 0) >= ready_state,
+            message=f"video readyState did not reach {ready_state}",
+        )
+        return True
+
+    def until_playing_for(self, video_element, seconds, timeout=None):
+        """
+        Wait until currentTime has advanced by `seconds` from its current value.
+        The deadline defaults to the playback length plus the wait timeout.
+        """
+        start = self._media_property(video_element, "currentTime") or 0
+        target = start + seconds
+        if timeout is None:
+            timeout = seconds + self.timeout
+        logger.info(f"Waiting for video to play from {start:.1f}s to {target:.1f}s...")
+        self._wait(timeout).until(
+            lambda d: (self._media_property(video_element, "currentTime") or 0) >= target,
+            message=f"video currentTime did not advance by {seconds}s",
+        )
+        return True
+
+    def until_paused(self, video_element, timeout=None):
+        """Wait until video.paused === true."""
+        logger.info("Waiting for video to report paused...")
+        self._wait(timeout).until(
+            lambda d: self._media_property(video_element, "paused") is True,
+            message="video did not pause",
+        )
+        return True
+
+    def until_volume(self, video_element, volume, tolerance=0.01, timeout=None):
+        """Wait until video.volume is applied (within `tolerance`)."""
+        logger.info(f"Waiting for video volume to become {volume}...")
+        self._wait(timeout).until(
+            lambda d: abs((self._media_property(video_element, "volume") or 0) - volume) <= tolerance,
+            message=f"video volume did not become {volume}",
+        )
+        return True
+
+    def until_dom_settled(self, quiet_period=None, timeout=None):
+        """
+        Wait until the page has finished rendering a section: the document is
+        loaded and the number of DOM nodes has not changed for `quiet_period` seconds.
+        """
+        quiet_period = config.DOM_QUIET_PERIOD if quiet_period is None else quiet_period
+        state = {"count": None, "since": time.monotonic()}
+
+        def settled(d):
+            if d.execute_script("return document.readyState") != "complete":
+                return False
+            count = d.execute_script("return document.getElementsByTagName('*').length")
+            now = time.monotonic()
+            if count != state["count"]:
+                state["count"], state["since"] = count, now
+                return False
+            return now - state["since"] >= quiet_period
+
+        logger.info("Waiting for section content to finish rendering...")
+        self._wait(timeout).until(settled, message="section content did not settle")
+        return True